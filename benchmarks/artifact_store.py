@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import shutil
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import REPO_ROOT, generate_corpus  # noqa: E402
+from run import run_build  # noqa: E402
+from sitegen.artifacts import LocalStore  # noqa: E402
+
+ADDRESS_RE = re.compile(r"^/([0-9a-f]{64})$")
+WORK_DIR = REPO_ROOT / "benchmarks" / ".work"
+
+
+class StoreHandler(BaseHTTPRequestHandler):
+    # Stand-in for a shared cache service: GET/PUT /<sha256> backed by a directory.
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle on, each keep-alive response waits for a delayed ACK.
+    disable_nagle_algorithm = True
+    store: LocalStore
+    token = ""
+    counts: dict[str, int]
+
+    def authorized(self) -> bool:
+        if self.token and self.headers.get("Authorization") != f"Bearer {self.token}":
+            self.send_error(401)
+            return False
+        return True
+
+    def address(self) -> str:
+        match = ADDRESS_RE.match(self.path)
+        if match is None:
+            self.send_error(400, "Expected /<sha256>")
+            return ""
+        return match.group(1)
+
+    def do_GET(self) -> None:
+        address = self.authorized() and self.address()
+        if not address:
+            return
+        data = self.store.get(address)
+        self.counts["get"] += 1
+        if data is None:
+            self.send_error(404)
+            return
+        self.counts["hit"] += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_PUT(self) -> None:
+        address = self.authorized() and self.address()
+        if not address:
+            return
+        self.store.put(address, self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        self.counts["put"] += 1
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_server(directory: Path, host: str = "127.0.0.1", port: int = 0, token: str = "") -> ThreadingHTTPServer:
+    handler = type(
+        "Handler", (StoreHandler,), {"store": LocalStore(directory), "token": token, "counts": {"get": 0, "hit": 0, "put": 0}}
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def tree_digest(root: Path) -> dict[str, str]:
+    return {
+        path.relative_to(root).as_posix(): hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+def fresh_runner(corpus: Path) -> None:
+    # What a new CI runner starts from: the sources, but no output, lock or local cache.
+    for path in (corpus / "dist", corpus / ".sitegen-cache"):
+        shutil.rmtree(path, ignore_errors=True)
+    (corpus / "build.lock.json").unlink(missing_ok=True)
+
+
+def bench(count: int, seed: int) -> None:
+    corpus = WORK_DIR / f"corpus-{count}"
+    generate_corpus(corpus, count, seed)
+    store_dir = WORK_DIR / "artifact-store"
+    shutil.rmtree(store_dir, ignore_errors=True)
+    server = start_server(store_dir)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    counts = server.RequestHandlerClass.counts
+    try:
+        fresh_runner(corpus)
+        baseline = run_build(corpus, [])
+        expected = tree_digest(corpus / "dist")
+        fresh_runner(corpus)
+        push = run_build(corpus, ["--artifact-store", url])
+        pushed = counts["put"]
+        fresh_runner(corpus)
+        pull = run_build(corpus, ["--artifact-store", url])
+        pulled = counts["hit"]
+        identical = tree_digest(corpus / "dist") == expected
+    finally:
+        server.shutdown()
+        shutil.rmtree(corpus, ignore_errors=True)
+    print(f"{count} posts, fresh runner each time")
+    print(f"  no store:          {baseline['wall_s']:6.2f}s  cpu {baseline['cpu_s'] or 0:6.2f}s")
+    print(f"  empty store:       {push['wall_s']:6.2f}s  cpu {push['cpu_s'] or 0:6.2f}s  ({pushed} artifacts pushed)")
+    print(f"  warm store:        {pull['wall_s']:6.2f}s  cpu {pull['cpu_s'] or 0:6.2f}s  ({pulled} artifacts pulled)")
+    print(f"  output identical:  {identical}")
+    if not identical:
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shared artifact store: stand-in server and fresh-runner benchmark.")
+    subparsers = parser.add_subparsers(dest="command")
+    serve = subparsers.add_parser("serve", help="Run the stand-in store (GET/PUT /<sha256>) over a directory.")
+    serve.add_argument("directory", type=Path)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--token", default="", help="Require this bearer token.")
+    run = subparsers.add_parser("bench", help="Compare fresh-runner builds without, into and from the store.")
+    run.add_argument("--count", type=int, default=1000)
+    run.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = start_server(args.directory, args.host, args.port, args.token)
+        print(f"Serving {args.directory} at http://{args.host}:{server.server_address[1]}/ (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        bench(getattr(args, "count", 1000), getattr(args, "seed", 42))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import random
+import shutil
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+EPOCH = dt.datetime(2015, 1, 1, 8, 0)
+SOURCE_DATE_EPOCH = 1767225600  # 2026-01-01T00:00:00Z
+
+WORDS = (
+    "the kernel maps each page into the address space before the scheduler hands control to user mode "
+    "while the allocator keeps a free list per size class so small objects never touch the global lock "
+    "we measure latency under load and compare it against the baseline to see where the time goes "
+    "a ring buffer lets the producer and consumer run without blocking as long as the indices stay apart "
+    "parsing is cheap compared with highlighting which walks every token through a regular expression "
+    "cache lines interrupts syscalls traps registers vectors queues sockets handles buffers descriptors "
+    "compile link load execute profile benchmark refactor document review deploy rollback monitor"
+).split()
+CJK = (
+    "内核在切换到用户态之前会为每个进程建立页表并设置陷入向量"
+    "我们先用最简单的实现跑通流程再逐步替换成更高效的数据结构"
+    "调度器按照时间片轮转每次时钟中断都会检查当前任务是否需要让出处理器"
+    "缓冲区满的时候生产者需要等待消费者读取数据否则会覆盖尚未处理的内容"
+    "这篇笔记记录了调试过程中遇到的问题以及最终的解决办法"
+)
+CATEGORIES = (
+    "Rust", "Kernel", "Notes", "Tools", "Database", "Networking", "Compilers", "Frontend",
+    "Math", "Devlog", "RISC-V", "C/C++", "操作系统", "读书笔记", "Algorithms", "Security",
+)
+LANGUAGES = ("python", "c", "rust", "javascript", "bash", "go", "cpp", "toml")
+CODE_LINES = {
+    "python": ("def handle_{n}(request):", "    value = request.get('key', {n})", "    return value * 2"),
+    "c": ("static int handle_{n}(struct req *r) {{", "    r->count += {n};", "    return r->count;", "}}"),
+    "rust": ("fn handle_{n}(req: &mut Req) -> u64 {{", "    req.count += {n};", "    req.count", "}}"),
+    "javascript": ("function handle{n}(req) {{", "  const value = req.items[{n}] ?? 0;", "  return value * 2;", "}}"),
+    "bash": ("for i in $(seq 1 {n}); do", "  echo \"step $i\"", "done"),
+    "go": ("func handle{n}(r *Req) int {{", "\tr.Count += {n}", "\treturn r.Count", "}}"),
+    "cpp": ("template <typename T> T handle{n}(T value) {{", "    return value + {n};", "}}"),
+    "toml": ("[section_{n}]", "enabled = true", "limit = {n}"),
+}
+SNIPPETS = {"c": "c", "py": "python", "rs": "rust"}
+
+
+def sentence(rng: random.Random, cjk: bool) -> str:
+    if cjk and rng.random() < 0.7:
+        start = rng.randrange(len(CJK) - 40)
+        return CJK[start : start + rng.randint(15, 40)] + "。"
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 22))]
+    if rng.random() < 0.2:
+        words[rng.randrange(len(words))] = f"`{rng.choice(WORDS)}_{rng.randint(1, 99)}`"
+    if rng.random() < 0.15:
+        index = rng.randrange(len(words))
+        words[index] = f"**{words[index]}**"
+    return " ".join(words).capitalize() + "."
+
+
+def code_block(rng: random.Random) -> str:
+    lang = rng.choice(LANGUAGES)
+    lines = []
+    for _ in range(rng.randint(2, 15)):
+        lines.extend(line.format(n=rng.randint(1, 999)) for line in CODE_LINES[lang])
+    return f"```{lang}\n" + "\n".join(lines) + "\n```"
+
+
+def mermaid_block(rng: random.Random) -> str:
+    nodes = [f"N{index}[Step {index}]" for index in range(rng.randint(3, 8))]
+    edges = [f"    {nodes[index].split('[')[0]} --> {nodes[index + 1].split('[')[0]}" for index in range(len(nodes) - 1)]
+    return "```mermaid\ngraph TD\n    " + "\n    ".join(nodes) + "\n" + "\n".join(edges) + "\n```"
+
+
+def post_body(rng: random.Random, index: int, cjk: bool, snippets: list[str], images: int) -> str:
+    blocks = []
+    for section in range(rng.randint(2, 7)):
+        heading = f"{section + 1}. {sentence(rng, cjk).rstrip('.。')[:40]}"
+        blocks.append(f"## {heading}")
+        for _ in range(rng.randint(1, 4)):
+            roll = rng.random()
+            if roll < 0.18:
+                blocks.append(code_block(rng))
+            elif roll < 0.23:
+                blocks.append("\n".join(f"- {sentence(rng, cjk)}" for _ in range(rng.randint(2, 6))))
+            elif roll < 0.26:
+                rows = [f"| {rng.choice(WORDS)} | {rng.randint(1, 1000)} | {rng.choice(WORDS)} |" for _ in range(4)]
+                blocks.append("| name | value | note |\n| --- | --- | --- |\n" + "\n".join(rows))
+            elif roll < 0.29 and images:
+                blocks.append(f"![figure {index}](images/bench-{rng.randrange(images)}.svg)")
+            elif roll < 0.32 and snippets:
+                path = rng.choice(snippets)
+                blocks.append(f"See [the implementation](code:/{path}#L{rng.randint(1, 40)}) for details.")
+            else:
+                blocks.append(" ".join(sentence(rng, cjk) for _ in range(rng.randint(2, 7))))
+        if section == 1 and rng.random() < 0.08:
+            blocks.append(mermaid_block(rng))
+        if section == 0 and rng.random() < 0.3:
+            blocks.append("### " + sentence(rng, cjk).rstrip(".。")[:30])
+    return "\n\n".join(blocks) + "\n"
+
+
+def post_path(rng: random.Random, index: int, category: str) -> Path:
+    topic = "".join(char for char in category.lower() if char.isalnum()) or "misc"
+    depth = rng.random()
+    if depth < 0.1:
+        return Path(f"post-{index:05d}.md")
+    if depth < 0.6:
+        return Path(topic) / f"post-{index:05d}.md"
+    return Path(topic) / f"part-{index % 7}" / f"post-{index:05d}.md"
+
+
+def write_snippets(root: Path, rng: random.Random) -> list[str]:
+    paths = []
+    for number in range(12):
+        ext = ("c", "py", "rs")[number % 3]
+        lang = SNIPPETS[ext]
+        lines = []
+        while len(lines) < 80:
+            lines.extend(line.format(n=rng.randint(1, 999)) for line in CODE_LINES[lang])
+        path = root / "code_snippets" / "bench" / f"snippet_{number}.{ext}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        paths.append(path.relative_to(root).as_posix())
+    return paths
+
+
+def write_images(root: Path, count: int) -> None:
+    images = root / "static" / "images"
+    images.mkdir(parents=True, exist_ok=True)
+    for number in range(count):
+        hue = number * 37 % 360
+        (images / f"bench-{number}.svg").write_text(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="320" height="120">'
+            f'<rect width="320" height="120" fill="hsl({hue},60%,70%)"/>'
+            f'<text x="20" y="70" font-size="32">figure {number}</text></svg>\n',
+            encoding="utf-8",
+        )
+
+
+def write_config(root: Path) -> None:
+    (root / "site.toml").write_text(
+        "\n".join(
+            [
+                'site_name = "Benchmark Blog"',
+                'site_description = "Synthetic corpus for build benchmarks."',
+                'site_url = "https://bench.example.com"',
+                'output = "dist"',
+                "clean = false",
+                "incremental = true",
+                'lock_file = "build.lock.json"',
+                'change_detection = "content"',
+                'cache_dir = ".sitegen-cache"',
+                "build_workers = 0",
+                "posts_per_page = 10",
+                'toc_depth = "2-4"',
+                "feed_limit = 20",
+                "enable_indexnow = false",
+                "stale_days = 365",
+                "",
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+
+def generate_corpus(root: Path, count: int, seed: int = 42) -> Path:
+    rng = random.Random(f"{seed}:{count}")
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+    shutil.copytree(REPO_ROOT / "templates", root / "templates")
+    shutil.copytree(REPO_ROOT / "static", root / "static")
+    (root / "pages").mkdir()
+    (root / "pages" / "about.md").write_text("# About\n\nA synthetic benchmark site.\n", encoding="utf-8")
+    write_config(root)
+    snippets = write_snippets(root, rng)
+    images = 24
+    write_images(root, images)
+
+    extra = [f"Topic {number}" for number in range(max(0, int(count ** 0.5) - len(CATEGORIES)))]
+    categories = list(CATEGORIES) + extra
+    # Zipf-like weights: a few big categories and a long tail.
+    weights = [1 / (rank + 1) for rank in range(len(categories))]
+    series = [f"Series {number}" for number in range(max(1, count // 15))]
+
+    for index in range(count):
+        cjk = rng.random() < 0.3
+        chosen = []
+        for _ in range(rng.choice((1, 1, 2, 2, 3))):
+            name = rng.choices(categories, weights)[0]
+            if name not in chosen:
+                chosen.append(name)
+        date = EPOCH + dt.timedelta(hours=index * 7 + rng.randint(0, 5))
+        title = sentence(rng, cjk and rng.random() < 0.5).rstrip(".。")[:60]
+        meta = [
+            "---",
+            f"title: {title}",
+            f"date: {date:%Y-%m-%d}",
+        ]
+        if rng.random() < 0.4:
+            meta.append(f"time: {date:%H:%M}")
+        meta.append(f"updated: {(date + dt.timedelta(days=rng.randint(0, 400))):%Y-%m-%d}")
+        meta.append(f"categories: [{', '.join(chosen)}]")
+        if rng.random() < 0.3:
+            meta.append(f"archive: {rng.choice(series)}")
+        if rng.random() < 0.2:
+            meta.append(f"summary: {sentence(rng, cjk)}")
+        if rng.random() < 0.01:
+            meta.append("draft: true")
+        meta.append("---")
+        path = root / "posts" / post_path(rng, index, chosen[0])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(meta) + "\n\n" + post_body(rng, index, cjk, snippets, images), encoding="utf-8")
+    return root
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic blog corpus.")
+    parser.add_argument("count", type=int, help="Number of posts.")
+    parser.add_argument("--out", type=Path, default=None, help="Target directory (default: benchmarks/.work/corpus-N).")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    out = args.out or REPO_ROOT / "benchmarks" / ".work" / f"corpus-{args.count}"
+    generate_corpus(out, args.count, args.seed)
+    print(f"Generated {args.count} posts in {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import difflib
+import re
+import sys
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sitegen.content import prepare_post  # noqa: E402
+from sitegen.engines import ENGINES, create_engine  # noqa: E402
+
+SPACE_RE = re.compile(r"\s+")
+
+
+class Canonicalizer(HTMLParser):
+    # Flatten HTML to one token per line: sorted attributes, collapsed whitespace, no empty text.
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: list[str] = []
+        self.pre = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs_text = " ".join(f'{name}="{value or ""}"' for name, value in sorted(attrs))
+        self.lines.append(f"<{tag} {attrs_text}>" if attrs_text else f"<{tag}>")
+        if tag == "pre":
+            self.pre += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self.lines.append(f"</{tag}>")
+        if tag == "pre":
+            self.pre = max(self.pre - 1, 0)
+
+    def handle_data(self, data):
+        # Whitespace is significant inside <pre>; only trailing newlines differ between engines there.
+        text = data.rstrip("\n") if self.pre else SPACE_RE.sub(" ", data).strip()
+        if text:
+            self.lines.append(text)
+
+
+def canonical(html_text: str) -> list[str]:
+    parser = Canonicalizer()
+    parser.feed(html_text)
+    parser.close()
+    return parser.lines
+
+
+def load_posts(posts_dir: Path) -> list[tuple[Path, str]]:
+    posts = []
+    for path in sorted(posts_dir.rglob("*.md")):
+        # The same input render_body hands to the engine, so differences are the engines' own.
+        _, _, body = prepare_post(path.read_text(encoding="utf-8"))
+        posts.append((path, body))
+    return posts
+
+
+def conformance(args: argparse.Namespace, posts: list[tuple[Path, str]]) -> int:
+    project_root = Path.cwd()
+    reference = create_engine(args.reference, project_root, args.toc_depth, root="..")
+    candidate = create_engine(args.engine, project_root, args.toc_depth, root="..")
+    failed = 0
+    for path, body in posts:
+        expected = reference.render(body, path.parent)
+        actual = candidate.render(body, path.parent)
+        problems = []
+        for field in ("content", "toc"):
+            left, right = canonical(expected[field]), canonical(actual[field])
+            if left != right:
+                diff = difflib.unified_diff(left, right, f"{args.reference}:{field}", f"{args.engine}:{field}", n=1, lineterm="")
+                problems.append("\n".join(list(diff)[: args.diff_lines]))
+        if expected["words"] != actual["words"]:
+            problems.append(f"words: {expected['words']} != {actual['words']}")
+        rel = path.relative_to(args.posts).as_posix()
+        if problems:
+            failed += 1
+            print(f"FAIL {rel}")
+            if args.verbose:
+                for problem in problems:
+                    print(problem)
+        elif args.verbose:
+            print(f"ok   {rel}")
+    print(f"{len(posts) - failed}/{len(posts)} posts match {args.reference} ({args.engine}).")
+    return 1 if failed else 0
+
+
+def benchmark(args: argparse.Namespace, posts: list[tuple[Path, str]]) -> int:
+    project_root = Path.cwd()
+    size = sum(len(body.encode("utf-8")) for _, body in posts)
+    for name in ENGINES:
+        engine = create_engine(name, project_root, args.toc_depth, root="..")
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for path, body in posts:
+                engine.render(body, path.parent)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        rate = len(posts) / best if best else 0.0
+        print(f"{name:16} {best:.3f}s  {rate:8.1f} posts/s  {size / best / 1e6 if best else 0.0:6.2f} MB/s")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare and benchmark the Markdown engines on the posts corpus.")
+    parser.add_argument("mode", choices=["conformance", "bench"])
+    parser.add_argument("--posts", type=Path, default=Path("posts"))
+    parser.add_argument("--engine", default="markdown-it", choices=ENGINES)
+    parser.add_argument("--reference", default="python-markdown", choices=ENGINES)
+    parser.add_argument("--toc-depth", default="2-4")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--diff-lines", type=int, default=40)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    posts = load_posts(args.posts)
+    if not posts:
+        print(f"No posts found in {args.posts}.", file=sys.stderr)
+        sys.exit(1)
+    runner = conformance if args.mode == "conformance" else benchmark
+    sys.exit(runner(args, posts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import REPO_ROOT, generate_corpus  # noqa: E402
+from sitegen.content import (  # noqa: E402
+    count_words,
+    extract_title,
+    get_categories,
+    parse_front_matter,
+    parse_list,
+    search_terms,
+    slugify,
+)
+from sitegen.records import NameTable, Post  # noqa: E402
+
+
+def parse_info(path: Path) -> dict:
+    # The fields parse_post_data hands to the slug loop, without rendering Markdown.
+    meta, body = parse_front_matter(path.read_text(encoding="utf-8"))
+    title, body = extract_title(meta, body)
+    date_dt = dt.datetime.fromisoformat(meta["date"])
+    updated_dt = dt.datetime.fromisoformat(meta.get("updated") or meta["date"])
+    return {
+        "rel": f"{path.parent.name}/{path.name}",
+        "draft": False,
+        "title": title,
+        "date": date_dt.strftime("%Y-%m-%d"),
+        "date_dt": date_dt,
+        "updated": updated_dt.strftime("%Y-%m-%d"),
+        "updated_dt": updated_dt,
+        "categories": get_categories(meta),
+        "archives": parse_list(str(meta.get("archive") or "")),
+        "explicit_slug": "",
+        "candidate_slug": slugify(path.stem),
+        "first_seen": "",
+        "summary": meta.get("summary") or body[:160],
+        "words": count_words(body),
+        "terms": search_terms(body),
+        "content": "",
+        "toc": "",
+    }
+
+
+def dict_records(paths: list[Path]) -> tuple[list[dict], list[dict]]:
+    # Previous layout: the parse results stay alive next to a second dict per post.
+    infos = [parse_info(path) for path in paths]
+    posts = []
+    for info in infos:
+        post = {
+            "title": info["title"],
+            "date": info["date"],
+            "date_dt": info["date_dt"],
+            "updated": info["updated"],
+            "updated_dt": info["updated_dt"],
+            "categories": info["categories"],
+            "slug": info["candidate_slug"],
+            "summary": info["summary"],
+            "archives": info["archives"],
+            "words": info["words"],
+            "terms": info["terms"],
+            "weight": 0,
+            "source": info["rel"],
+            "hash": "0" * 64,
+        }
+        post["content"] = info["content"]
+        post["toc"] = info["toc"]
+        posts.append(post)
+    return infos, posts
+
+
+def slotted_records(paths: list[Path]) -> list[Post]:
+    infos = [parse_info(path) for path in paths]
+    names = NameTable()
+    posts = [
+        Post(
+            source=info["rel"],
+            hash="0" * 64,
+            slug=info["candidate_slug"],
+            title=info["title"],
+            date=info["date"],
+            date_dt=info["date_dt"],
+            updated=info["updated"],
+            updated_dt=info["updated_dt"],
+            categories=names.get(info["categories"]),
+            archives=names.get(info["archives"]),
+            summary=info["summary"],
+            words=info["words"],
+            terms=info["terms"],
+            content=info["content"],
+            toc=info["toc"],
+        )
+        for info in infos
+    ]
+    del infos
+    return posts
+
+
+def retained(build, paths: list[Path]) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(paths)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def touch_dicts(posts: list[dict]) -> int:
+    total = 0
+    for post in posts:
+        total += len(post["slug"]) + len(post["title"]) + len(post["date"]) + post.get("words", 0)
+        total += len(post["categories"])
+    return total
+
+
+def touch_records(posts: list[Post]) -> int:
+    total = 0
+    for post in posts:
+        total += len(post.slug) + len(post.title) + len(post.date) + post.words
+        total += len(post.categories)
+    return total
+
+
+def best_of(func, posts: list, rounds: int = 7) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(posts)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-post memory and field access for dict and slotted post records.")
+    parser.add_argument("--count", type=int, default=50000, help="Posts in the synthetic corpus.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = REPO_ROOT / "benchmarks" / ".work" / f"corpus-{args.count}"
+    if not (corpus / "posts").exists():
+        generate_corpus(corpus, args.count, args.seed)
+    paths = sorted((corpus / "posts").rglob("*.md"))
+    count = len(paths)
+
+    (_, dict_posts), dict_bytes = retained(dict_records, paths)
+    slot_posts, slot_bytes = retained(slotted_records, paths)
+    print(f"{count} posts")
+    print(f"  dict records:    {dict_bytes / count:8.0f} bytes/post retained")
+    print(f"  slotted records: {slot_bytes / count:8.0f} bytes/post retained ({1 - slot_bytes / dict_bytes:.0%} less)")
+
+    # Five field reads per post, the mix a card or archive row does.
+    accesses = count * 5
+    dict_time = best_of(touch_dicts, dict_posts)
+    slot_time = best_of(touch_records, slot_posts)
+    print(f"  dict access:     {dict_time / accesses * 1e9:8.1f} ns/field")
+    print(f"  slotted access:  {slot_time / accesses * 1e9:8.1f} ns/field")
+    dict_sort = best_of(lambda posts: sorted(posts, key=lambda post: post["date_dt"]), dict_posts)
+    slot_sort = best_of(lambda posts: sorted(posts, key=lambda post: post.date_dt), slot_posts)
+    print(f"  sort by date:    {dict_sort * 1000:8.1f} ms dict, {slot_sort * 1000:.1f} ms slotted")
+
+
+if __name__ == "__main__":
+    main()
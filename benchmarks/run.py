@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from corpus import REPO_ROOT, SOURCE_DATE_EPOCH, generate_corpus
+
+SCENARIOS = ("cold", "noop", "edit", "category", "static")
+METRICS = ("wall_s", "cpu_s", "max_rss_mb", "bytes_written")
+CATEGORY_RE = re.compile(r"^categories: .*$", re.MULTILINE)
+WORK_DIR = REPO_ROOT / "benchmarks" / ".work"
+
+
+def output_state(corpus: Path) -> dict[str, tuple[int, int]]:
+    state = {}
+    for root in (corpus / "dist", corpus / ".sitegen-cache", corpus / "build.lock.json"):
+        paths = [root] if root.is_file() else (path for path in root.rglob("*") if path.is_file())
+        for path in paths:
+            stat = path.stat()
+            state[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def run_build(corpus: Path, build_args: list[str]) -> dict:
+    before = output_state(corpus)
+    env = dict(os.environ, SOURCE_DATE_EPOCH=str(SOURCE_DATE_EPOCH))
+    with tempfile.TemporaryFile() as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, str(REPO_ROOT / "build.py"), *build_args], cwd=corpus, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+        if hasattr(os, "wait4"):
+            # wait4 reports the child's own CPU time and peak RSS, not this process's.
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            cpu = usage.ru_utime + usage.ru_stime
+            # ru_maxrss is in KiB on Linux and bytes on macOS.
+            rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        else:
+            process.wait()
+            cpu = rss = None
+        wall = time.perf_counter() - start
+        if process.returncode != 0:
+            log.seek(0)
+            print(log.read().decode("utf-8", "replace"), file=sys.stderr)
+            print(f"Build failed in {corpus} (exit {process.returncode})", file=sys.stderr)
+            sys.exit(1)
+    after = output_state(corpus)
+    written = [path for path, stamp in after.items() if before.get(path) != stamp]
+    return {
+        "wall_s": round(wall, 3),
+        "cpu_s": round(cpu, 3) if cpu is not None else None,
+        "max_rss_mb": round(rss, 1) if rss is not None else None,
+        "bytes_written": sum(after[path][1] for path in written),
+        "files_written": len(written),
+    }
+
+
+def target_post(corpus: Path, fraction: float) -> Path:
+    posts = sorted((corpus / "posts").rglob("*.md"))
+    start = int(len(posts) * fraction)
+    # Drafts are not published, so editing one would measure nothing.
+    return next(path for path in posts[start:] + posts[:start] if "\ndraft: true\n" not in path.read_text(encoding="utf-8"))
+
+
+def prepare(corpus: Path, scenario: str, round_index: int) -> None:
+    if scenario == "cold":
+        for path in (corpus / "dist", corpus / ".sitegen-cache"):
+            shutil.rmtree(path, ignore_errors=True)
+        (corpus / "build.lock.json").unlink(missing_ok=True)
+    elif scenario == "edit":
+        path = target_post(corpus, 0.5)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(f"\nBenchmark edit {round_index}: one more paragraph for the incremental path.\n")
+    elif scenario == "category":
+        path = target_post(corpus, 0.33)
+        text = path.read_text(encoding="utf-8")
+        current = CATEGORY_RE.search(text).group(0)
+        line = next(line for line in ("categories: [Notes]", "categories: [Tools]") if line != current)
+        path.write_text(text.replace(current, line, 1), encoding="utf-8")
+    elif scenario == "static":
+        path = sorted((corpus / "static" / "css").glob("*.css"))[0]
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(f"/* benchmark edit {round_index} */\n")
+
+
+def bench_size(size: int, repeat: int, seed: int, build_args: list[str]) -> list[dict]:
+    corpus = WORK_DIR / f"corpus-{size}"
+    start = time.perf_counter()
+    generate_corpus(corpus, size, seed)
+    print(f"[{size}] corpus generated in {time.perf_counter() - start:.1f}s")
+    samples: dict[str, list[dict]] = {scenario: [] for scenario in SCENARIOS}
+    for round_index in range(repeat):
+        for scenario in SCENARIOS:
+            prepare(corpus, scenario, round_index)
+            samples[scenario].append(run_build(corpus, build_args))
+    rows = []
+    for scenario in SCENARIOS:
+        row = {"size": size, "scenario": scenario, "runs": len(samples[scenario])}
+        for key in (*METRICS, "files_written"):
+            values = [sample[key] for sample in samples[scenario] if sample[key] is not None]
+            row[key] = statistics.median(values) if values else None
+        rows.append(row)
+        print(
+            f"[{size}] {scenario:<9} wall {row['wall_s']:7.2f}s  cpu {row['cpu_s'] or 0:7.2f}s  "
+            f"rss {row['max_rss_mb'] or 0:7.1f} MB  wrote {row['files_written']:>6} files / {row['bytes_written']:>11} bytes"
+        )
+    return rows
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(current: dict, baseline: dict, thresholds: dict) -> list[str]:
+    previous = {(row["size"], row["scenario"]): row for row in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        old = previous.get((row["size"], row["scenario"]))
+        if old is None:
+            continue
+        for metric, limit in thresholds.items():
+            new_value, old_value = row.get(metric), old.get(metric)
+            if new_value is None or old_value is None:
+                continue
+            # The floor keeps tiny absolute changes (a few ms on a no-op build) from tripping the ratio.
+            if new_value > old_value * limit["ratio"] and new_value - old_value > limit["floor"]:
+                regressions.append(
+                    f"{row['size']} posts / {row['scenario']}: {metric} {old_value} -> {new_value} "
+                    f"(limit x{limit['ratio']})"
+                )
+    return regressions
+
+
+def parse_sizes(value: str) -> list[int]:
+    try:
+        return [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size list: {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cold, no-op and incremental builds on synthetic corpora.")
+    parser.add_argument("--sizes", type=parse_sizes, default=[100, 1000], help="Comma-separated post counts (e.g. 100,1000,10000,50000).")
+    parser.add_argument("--repeat", type=int, default=1, help="Rounds per size; medians are reported.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=WORK_DIR / "results.json", help="Where to write JSON results.")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline results JSON to check for regressions.")
+    parser.add_argument(
+        "--thresholds",
+        type=Path,
+        default=Path(__file__).resolve().parent / "thresholds.json",
+        help="Per-metric ratio and absolute floor for --compare.",
+    )
+    parser.add_argument(
+        "--build-arg",
+        action="append",
+        default=[],
+        help="Extra build.py argument, repeatable (e.g. --build-arg=--low-memory).",
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep generated corpora under benchmarks/.work.")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        results.extend(bench_size(size, max(1, args.repeat), args.seed, args.build_arg))
+        if not args.keep:
+            shutil.rmtree(WORK_DIR / f"corpus-{size}", ignore_errors=True)
+    report = {
+        "meta": {
+            "created": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "build_args": args.build_arg,
+        },
+        "results": results,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        thresholds = json.loads(args.thresholds.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, thresholds)
+        if regressions:
+            print("Regressions:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
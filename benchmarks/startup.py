@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+WORK_DIR = REPO_ROOT / "benchmarks" / ".work" / "startup"
+DECISION = "No changes detected."
+
+
+def build_command(extra: list[str]) -> list[str]:
+    return [
+        sys.executable,
+        str(REPO_ROOT / "build.py"),
+        "--output",
+        str(WORK_DIR / "dist"),
+        "--lock-file",
+        str(WORK_DIR / "build.lock.json"),
+        "--cache-dir",
+        str(WORK_DIR / "cache"),
+        "--no-enable-indexnow",
+        *extra,
+    ]
+
+
+def build_env() -> dict[str, str]:
+    # Measure what users get: bytecode cached, output unbuffered so the decision line is seen when printed.
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def timed_noop(extra: list[str]) -> tuple[float, float]:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        build_command(extra), cwd=REPO_ROOT, env=build_env(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    decision = None
+    for line in process.stdout:
+        if decision is None and line.startswith(DECISION):
+            decision = time.perf_counter() - start
+    process.wait()
+    if decision is None:
+        print("The build did not take the no-op path; is the tree changing between runs?", file=sys.stderr)
+        sys.exit(1)
+    return decision, time.perf_counter() - start
+
+
+def import_times(command: list[str]) -> dict[str, tuple[int, int]]:
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]], cwd=REPO_ROOT, env=build_env(), capture_output=True, text=True
+    )
+    modules: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure CLI startup and time to the no-op decision.")
+    parser.add_argument("--runs", type=int, default=20, help="No-op runs; the median is reported.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules (self time) to list.")
+    parser.add_argument("build_args", nargs="*", help="Extra build.py arguments (after --).")
+    args = parser.parse_args()
+
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+    WORK_DIR.mkdir(parents=True)
+    subprocess.run(build_command(args.build_args), cwd=REPO_ROOT, env=build_env(), stdout=subprocess.DEVNULL, check=True)
+    timed_noop(args.build_args)
+
+    samples = [timed_noop(args.build_args) for _ in range(max(1, args.runs))]
+    decision_ms = statistics.median(sample[0] for sample in samples) * 1000
+    exit_ms = statistics.median(sample[1] for sample in samples) * 1000
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=build_env(), check=True)
+    bare_ms = (time.perf_counter() - start) * 1000
+
+    baseline = import_times([sys.executable, "-c", "pass"])
+    modules = import_times(build_command(args.build_args))
+    added = {name: times for name, times in modules.items() if name not in baseline}
+    total_ms = sum(self_us for self_us, _ in added.values()) / 1000
+    third_party = sorted(
+        {name.split(".")[0] for name in added}
+        - set(sys.stdlib_module_names)
+        - {"sitegen"}
+    )
+
+    print(f"no-op decision: {decision_ms:6.1f} ms (median of {len(samples)}), process exit {exit_ms:.1f} ms")
+    print(f"bare interpreter: {bare_ms:6.1f} ms")
+    print(f"imports: {len(added)} modules, {total_ms:.1f} ms")
+    for name, (self_us, _) in sorted(added.items(), key=lambda item: item[1][0], reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:6.1f} ms  {name}")
+    if third_party:
+        print(f"Non-stdlib modules imported on the no-op path: {', '.join(third_party)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
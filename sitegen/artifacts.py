@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+
+# Stores map an address (a hex digest of everything that produced the artifact) to bytes, so a hit is always valid.
+class LocalStore:
+    def __init__(self, directory: Path, push: bool = True) -> None:
+        self.directory = directory
+        self.push = push
+
+    def path(self, address: str) -> Path:
+        return self.directory / address[:2] / address
+
+    def get(self, address: str) -> Optional[bytes]:
+        try:
+            return self.path(address).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, address: str, data: bytes) -> None:
+        if not self.push:
+            return
+        path = self.path(address)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+class HttpStore:
+    # GET/PUT {url}/{address}; 404 is a miss. Any other failure switches the store off for the rest of the build,
+    # so an unreachable cache costs one timeout instead of one per post.
+    def __init__(self, url: str, token: str = "", push: bool = True, timeout: float = 10.0) -> None:
+        self.url = url.rstrip("/")
+        self.token = token
+        self.push = push
+        self.timeout = timeout
+        self.enabled = True
+        self.stats = {"hits": 0, "misses": 0, "uploads": 0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def connection(self):
+        import http.client
+        import urllib.parse
+
+        # One keep-alive connection per worker thread; a new connection per artifact costs more than the transfer.
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            parts = urllib.parse.urlsplit(self.url)
+            factory = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            connection = factory(parts.netloc, timeout=self.timeout)
+            self._local.connection = connection
+            self._local.prefix = parts.path
+        return connection
+
+    def request(self, method: str, address: str, data: Optional[bytes] = None) -> Optional[bytes]:
+        import http.client
+
+        if not self.enabled:
+            return None
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        if data is not None:
+            headers["Content-Type"] = "application/octet-stream"
+        for attempt in range(2):
+            connection = self.connection()
+            try:
+                connection.request(method, f"{self._local.prefix}/{address}", body=data, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                connection.close()
+                self._local.connection = None
+                # The server may have dropped an idle connection; retry once on a fresh one.
+                if attempt:
+                    self.disable(f"{method} failed: {exc}")
+                continue
+            if response.status == 404:
+                return None
+            if 200 <= response.status < 300:
+                return body
+            self.disable(f"{method} returned HTTP {response.status}")
+            return None
+        return None
+
+    def disable(self, reason: str) -> None:
+        with self._lock:
+            if not self.enabled:
+                return
+            self.enabled = False
+        print(f"Artifact store {self.url}: {reason}; continuing without it.", file=sys.stderr)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, address: str) -> Optional[bytes]:
+        data = self.request("GET", address)
+        if self.enabled:
+            self.count("misses" if data is None else "hits")
+        return data
+
+    def put(self, address: str, data: bytes) -> None:
+        if self.push and self.enabled:
+            self.request("PUT", address, data)
+            if self.enabled:
+                self.count("uploads")
+
+    def report(self) -> None:
+        if any(self.stats.values()):
+            print(
+                f"Artifact store: {self.stats['hits']} pulled, {self.stats['misses']} missing, "
+                f"{self.stats['uploads']} pushed."
+            )
+
+
+ArtifactStore = Union[LocalStore, HttpStore]
+
+
+def open_store(location: str, token: str = "", push: bool = True) -> Optional[ArtifactStore]:
+    location = (location or "").strip()
+    if not location:
+        return None
+    if location.startswith(("http://", "https://")):
+        return HttpStore(location, token, push)
+    # A shared directory (network mount, restored CI cache) works the same way without a server.
+    return LocalStore(Path(location), push)
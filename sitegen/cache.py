@@ -2,14 +2,26 @@ from __future__ import annotations
 
 import hashlib
 import json
+import mmap
+import os
+import shutil
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+from .artifacts import ArtifactStore, LocalStore
+from .render import write_text
+
+MMAP_THRESHOLD = 1 << 20
+# Namespaces live under their own subdirectory, so pruning never touches anything else in cache_dir.
+NAMESPACES_DIR = "fragments"
 
 
 def list_files(root: Path) -> list[Path]:
     if not root.exists():
         return []
-    return [path for path in root.rglob("*") if path.is_file()]
+    return [Path(parent) / name for parent, _, names in os.walk(root) for name in names]
 
 
 def hash_bytes(data: bytes) -> str:
@@ -21,7 +33,13 @@ def hash_text(text: str) -> str:
 
 
 def hash_file(path: Path) -> str:
-    return hash_bytes(path.read_bytes())
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return hash_bytes(handle.read())
+        # Large assets (images, fonts) are hashed straight from the page cache; hashlib drops the GIL meanwhile.
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return hashlib.sha256(view).hexdigest()
 
 
 def hash_text_file_variants(path: Path) -> tuple[str, str]:
@@ -32,7 +50,7 @@ def hash_text_file_variants(path: Path) -> tuple[str, str]:
     return canonical, crlf
 
 
-def hash_paths(paths: list[Path], base: Optional[Path] = None) -> str:
+def hash_paths(paths: list[Path], base: Optional[Path] = None, digests: Optional[dict[Path, str]] = None) -> str:
     digest = hashlib.sha256()
     for path in sorted(paths, key=lambda p: p.as_posix()):
         rel = path
@@ -41,9 +59,10 @@ def hash_paths(paths: list[Path], base: Optional[Path] = None) -> str:
                 rel = path.relative_to(base)
             except ValueError:
                 rel = path
+        file_digest = digests.get(path) if digests else None
         digest.update(rel.as_posix().encode("utf-8"))
         digest.update(b"\0")
-        digest.update(path.read_bytes())
+        digest.update((file_digest or hash_file(path)).encode("ascii"))
         digest.update(b"\0")
     return digest.hexdigest()
 
@@ -58,5 +77,118 @@ def load_lock(path: Path) -> dict:
 
 
 def write_lock(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=True), encoding="utf-8")
+    write_text(path, json.dumps(data, indent=2, ensure_ascii=True))
+
+
+def fragment_key(*parts: object) -> str:
+    return hash_text("\0".join(str(part) for part in parts))
+
+
+class FragmentCache:
+    def __init__(
+        self,
+        directory: Optional[Path],
+        namespace: str = "",
+        resident: bool = True,
+        remote: Optional[ArtifactStore] = None,
+    ) -> None:
+        self.root = directory / NAMESPACES_DIR if directory is not None else None
+        self.namespace = namespace[:16]
+        self.directory = self.root / self.namespace if self.root and self.namespace else self.root
+        self.local = LocalStore(self.directory) if self.directory is not None else None
+        self.remote = remote
+        # Non-resident caches keep nothing in memory: every hit is read back from disk.
+        self.resident = resident or (directory is None and remote is None)
+        self._memory: dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def address(self, kind: str, key: str) -> str:
+        return fragment_key(self.namespace, kind, key)
+
+    def get(self, kind: str, key: str) -> Optional[str]:
+        with self._lock:
+            cached = self._memory.get((kind, key))
+        if cached is not None:
+            return cached
+        address = self.address(kind, key)
+        data = self.local.get(address) if self.local is not None else None
+        if data is not None:
+            # Entries age by last use, so prune() only drops what no recent build has read or written.
+            try:
+                os.utime(self.local.path(address))
+            except OSError:
+                pass
+        if data is None and self.remote is not None:
+            data = self.remote.get(address)
+            if data is not None and self.local is not None:
+                self.local.put(address, data)
+        if data is None:
+            return None
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+        if self.resident:
+            with self._lock:
+                self._memory[(kind, key)] = text
+        return text
+
+    def put(self, kind: str, key: str, text: str) -> None:
+        if self.resident:
+            with self._lock:
+                self._memory[(kind, key)] = text
+        address = self.address(kind, key)
+        data = text.encode("utf-8")
+        if self.local is not None:
+            self.local.put(address, data)
+        if self.remote is not None:
+            self.remote.put(address, data)
+
+    def get_or_render(self, kind: str, key: str, render: Callable[[], str]) -> str:
+        text = self.get(kind, key)
+        if text is None:
+            text = render()
+            self.put(kind, key, text)
+        return text
+
+    def prune(self, max_age: float, now: Optional[float] = None) -> int:
+        # Drops other namespaces (older generator or config versions) and entries unused for max_age seconds.
+        if self.root is None or not self.namespace or not self.root.exists():
+            return 0
+        for entry in self.root.iterdir():
+            if entry.is_dir() and entry.name != self.namespace:
+                shutil.rmtree(entry, ignore_errors=True)
+        if max_age <= 0:
+            return 0
+        cutoff = (time.time() if now is None else now) - max_age
+        removed = 0
+        for path in list_files(self.directory):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+class StatCache:
+    # Remembers a value per file keyed by (mtime_ns, size), so a resident session only rereads edited files.
+    def __init__(self) -> None:
+        self._entries: dict[tuple[Path, str], tuple[tuple[int, int], object]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, kind: str, compute: Callable[[Path], object]) -> object:
+        try:
+            stat = path.stat()
+        except OSError:
+            return compute(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get((path, kind))
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        value = compute(path)
+        with self._lock:
+            self._entries[(path, kind)] = (stamp, value)
+        return value
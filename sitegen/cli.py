@@ -2,15 +2,20 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import json
 import os
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Optional
 
-import markdown
-
+from .artifacts import HttpStore, open_store
 from .cache import (
+    FragmentCache,
+    StatCache,
+    fragment_key,
     hash_file,
     hash_paths,
     hash_text,
@@ -19,50 +24,82 @@ from .cache import (
     load_lock,
     write_lock,
 )
-from .code_linker import CodeLinkerExtension
 from .config import load_config, resolve_about_html, resolve_analytics, resolve_widget_html
 from .content import (
-    count_words,
-    extract_title,
     get_categories,
-    normalize_list_spacing,
     parse_list,
     parse_date,
     parse_updated,
-    parse_front_matter,
+    prepare_post,
+    read_front_matter,
     slugify,
 )
-from .mermaid import MermaidExtension
+from .engines import ENGINES, create_engine
 from .pages import (
     build_404,
     build_about,
     build_archive,
-    build_atom,
+    build_archive_map,
+    build_archive_sidebar,
     build_categories,
+    build_feeds,
     build_index,
     build_posts,
-    build_rss,
     build_search,
     build_search_index,
+    build_sidebar_data,
     build_sitemap,
-    notify_indexnow,
-    write_indexnow_key,
+    iter_sitemap_urls,
+    paginate_posts,
+    post_is_stale,
+    sidebar_mode,
+    slug_collisions,
 )
+from .gitmeta import blob_hash, scan_git
+from .indexnow import INDEXNOW_ENDPOINTS, notify_indexnow, write_indexnow_key
 from .render import (
     copy_static,
-    add_img_loading,
-    fix_relative_img_src,
     read_template,
     remove_stale_static,
-    strip_tags,
     write_text,
 )
-from .utils import clean_output_dir, join_url, parse_bool, parse_int, write_nojekyll, write_robots_txt
+from .records import NameTable, Post
+from .scheduler import TaskGraph
+from .shards import load_shards, parse_shard, shard_of, write_shard
+from .trace import enable as enable_trace, print_summary, record as record_span, span
+from .utils import (
+    build_time,
+    clean_output_dir,
+    join_url,
+    parse_bool,
+    parse_int,
+    timestamp_datetime,
+    write_nojekyll,
+    write_robots_txt,
+)
+from .watch import Watcher
 
 DATE_FMT = "%Y-%m-%d"
 DATETIME_FMT = "%Y-%m-%d %H:%M"
 FEED_LIMIT = 20
 LOCK_VERSION = 1
+# Inputs modified this close to the build are hashed again next time: a later write could keep mtime and size.
+STAT_RACE_NS = 2_000_000_000
+CATALOG_FIELDS = (
+    "draft",
+    "title",
+    "date",
+    "updated",
+    "categories",
+    "archives",
+    "explicit_slug",
+    "candidate_slug",
+    "first_seen",
+    "summary",
+    "words",
+    "terms",
+    "links",
+)
 
 
 def normalize_category_weights(value: object) -> dict[str, int]:
@@ -102,7 +139,7 @@ def category_weight(categories: list[str], weights: dict[str, int]) -> int:
     return weight if initialized else 0
 
 
-def build_site(args: argparse.Namespace) -> bool:
+def build_site(args: argparse.Namespace, session: Optional[dict] = None) -> bool:
     posts_dir = Path(args.posts)
     static_dir = Path(args.static)
     output_dir = Path(args.output)
@@ -115,14 +152,51 @@ def build_site(args: argparse.Namespace) -> bool:
     lock_path = Path(args.lock_file)
     if not lock_path.is_absolute():
         lock_path = config_path.parent / lock_path
+    indexnow_queue = Path(args.indexnow_queue)
+    if not indexnow_queue.is_absolute():
+        indexnow_queue = config_path.parent / indexnow_queue
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+    if cache_dir is not None and not cache_dir.is_absolute():
+        cache_dir = config_path.parent / cache_dir
+    low_memory = parse_bool(getattr(args, "low_memory", False))
+    if low_memory and cache_dir is None:
+        print("low_memory needs cache_dir to spill rendered posts; keeping them in memory.", file=sys.stderr)
+        low_memory = False
+    shard = getattr(args, "shard", None)
+    if shard is not None:
+        # A shard hands its rendered bodies to the merge step, so there is nothing to spill.
+        low_memory = False
+    shard_dir = Path(getattr(args, "shard_dir", "") or "shards")
+    if not shard_dir.is_absolute():
+        shard_dir = config_path.parent / shard_dir
+    artifact_store = open_store(
+        getattr(args, "artifact_store", ""),
+        getattr(args, "artifact_store_token", ""),
+        parse_bool(getattr(args, "artifact_push", True)),
+    )
 
     incremental = parse_bool(getattr(args, "incremental", True))
     stale_days = max(0, int(getattr(args, "stale_days", 0) or 0))
+    # client mode lets stale-notice.js decide in the browser, so time alone never triggers a rebuild.
+    track_stale = stale_days > 0 and args.stale_mode == "build"
+    build_now = build_time()
+    build_stamp = build_now.replace(microsecond=0).isoformat()
     build_workers = int(getattr(args, "build_workers", 0) or 0)
     if build_workers <= 0:
         build_workers = os.cpu_count() or 1
     build_workers = max(1, min(build_workers, 32))
     category_weights = normalize_category_weights(getattr(args, "category_weights", {}))
+    timings: dict[str, float] = {}
+    if session is not None:
+        session["timings"] = timings
+    phase_start = time.perf_counter_ns()
+
+    def lap(name: str) -> None:
+        nonlocal phase_start
+        now = time.perf_counter_ns()
+        timings[name] = round((now - phase_start) / 1e6, 1)
+        record_span(name, "phase", phase_start, now)
+        phase_start = now
 
     if not posts_dir.exists():
         print(f"Posts directory not found: {posts_dir}", file=sys.stderr)
@@ -148,19 +222,21 @@ def build_site(args: argparse.Namespace) -> bool:
     build_script = project_root / "build.py"
     if build_script.exists():
         generator_paths.append(build_script)
-    generator_paths.extend(list_files(project_root / "sitegen"))
-    generator_hash = hash_paths(generator_paths, project_root) if generator_paths else ""
-    templates_hash = hash_paths(list_files(templates_dir), project_root)
-    config_hash = hash_file(config_path) if config_path.exists() else ""
-    snippets_hash = hash_text("\n".join([analytics_html, widget_html, about_html]))
-    static_files = list_files(static_dir) if static_dir.exists() else []
+    with span("scan inputs"):
+        # Only sources count: bytecode differs per interpreter and is rewritten without any change.
+        generator_paths.extend(
+            path
+            for path in list_files(project_root / "sitegen")
+            if "__pycache__" not in path.parts and path.suffix not in {".pyc", ".pyo"}
+        )
+        template_files = list_files(templates_dir)
+        static_files = list_files(static_dir) if static_dir.exists() else []
     static_rel_files = (
         [path.relative_to(static_dir).as_posix() for path in static_files] if static_files else []
     )
-    static_hash = hash_paths(static_files, project_root) if static_files else ""
-
     about_page = Path("pages") / "about.md"
-    about_page_hash = hash_file(about_page) if about_page.exists() else ""
+    input_files = [*generator_paths, *template_files, *static_files]
+    input_files.extend(path for path in (config_path, about_page) if path.exists())
 
     def lock_key(path: Path) -> str:
         parent = path.parent.name
@@ -178,16 +254,80 @@ def build_site(args: argparse.Namespace) -> bool:
             return f"{parent}/{path.name}"
         return path.name
 
-    post_files = sorted(posts_dir.rglob("*.md"), key=lambda p: p.as_posix())
+    if not incremental:
+        previous_state = {}
+    elif session is not None and "state" in session:
+        # Watch mode keeps the last lock state (including the post catalog) in memory.
+        previous_state = session["state"]
+    else:
+        previous_state = load_lock(lock_path)
+    stat_cache = session.setdefault("stat_cache", StatCache()) if session is not None else None
+
+    def cached_file(kind: str, compute):
+        if stat_cache is None:
+            return compute
+        return lambda path: stat_cache.get(path, kind, compute)
+
+    git_meta = None
+    if args.change_detection == "git":
+        previous_git = previous_state.get("git", {}) if isinstance(previous_state, dict) else {}
+        git_meta = scan_git(posts_dir, previous_git)
+
+    with span("scan posts"):
+        post_files = sorted(posts_dir.rglob("*.md"), key=lambda p: p.as_posix())
+    if shard is not None:
+        post_files = [path for path in post_files if shard_of(lock_key(path), shard[1]) == shard[0]]
     current_posts = {}
     current_post_hash_variants = {}
-    for md_file in post_files:
+    git_updated = {}
+
+    def post_hash_variants(md_file: Path) -> tuple[str, ...]:
+        if git_meta is None:
+            return cached_file("variants", hash_text_file_variants)(md_file)
+        # Clean files take their blob id from the index, so unchanged posts are never read.
+        name = md_file.resolve().relative_to(git_meta["root"]).as_posix()
+        blob = None if name in git_meta["dirty"] else git_meta["blobs"].get(name)
+        if blob and name in git_meta["times"]:
+            git_updated[lock_key(md_file)] = git_meta["times"][name]
+        return (blob or cached_file("blob", blob_hash)(md_file),)
+
+    previous_stats = previous_state.get("input_stats", {}) if isinstance(previous_state, dict) else {}
+    input_stats: dict[str, list] = {}
+    stats_cutoff = time.time_ns() - STAT_RACE_NS
+
+    def input_digest(path: Path) -> str:
+        # Digests carry over between runs while mtime and size match, so a no-op build reads no inputs.
+        key = path.as_posix()
+        stat = path.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        previous = previous_stats.get(key)
+        if isinstance(previous, list) and previous[:2] == stamp and len(previous) == 3:
+            digest = previous[2]
+        else:
+            digest = cached_file("sha256", hash_file)(path)
+        if stat.st_mtime_ns < stats_cutoff:
+            input_stats[key] = [*stamp, digest]
+        return digest
+
+    # Hash every input in one pool: generator, templates, static assets and posts.
+    with span("hash inputs", files=len(input_files), posts=len(post_files)), ThreadPoolExecutor(
+        max_workers=build_workers
+    ) as executor:
+        input_digests = dict(zip(input_files, executor.map(input_digest, input_files)))
+        post_variants = list(executor.map(post_hash_variants, post_files))
+    for md_file, variants in zip(post_files, post_variants):
         key = lock_key(md_file)
-        canonical_hash, crlf_hash = hash_text_file_variants(md_file)
-        current_posts[key] = {"hash": canonical_hash}
-        current_post_hash_variants[key] = {canonical_hash, crlf_hash}
+        current_posts[key] = {"hash": variants[0]}
+        current_post_hash_variants[key] = set(variants)
+    lap("inputs")
+
+    generator_hash = hash_paths(generator_paths, project_root, input_digests) if generator_paths else ""
+    templates_hash = hash_paths(template_files, project_root, input_digests)
+    config_hash = input_digests.get(config_path, "")
+    snippets_hash = hash_text("\n".join([analytics_html, widget_html, about_html]))
+    static_hash = hash_paths(static_files, project_root, input_digests) if static_files else ""
+    about_page_hash = input_digests.get(about_page, "")
 
-    previous_state = load_lock(lock_path) if incremental else {}
     previous_posts_raw = previous_state.get("posts", {}) if isinstance(previous_state, dict) else {}
     previous_posts = {}
     for key, value in previous_posts_raw.items():
@@ -201,9 +341,23 @@ def build_site(args: argparse.Namespace) -> bool:
     previous_hashes = {key: value.get("hash", "") for key, value in previous_posts.items()}
     current_hashes = {key: value.get("hash", "") for key, value in current_posts.items()}
 
+    def link_digest(name: str) -> str:
+        path = project_root / name
+        return input_digest(path) if path.is_file() else ""
+
+    def links_changed(key: str) -> bool:
+        # Files pulled in with code: links are part of the post: editing one counts as editing the post.
+        meta = previous_posts.get(key, {}).get("meta")
+        links = meta.get("links") if isinstance(meta, dict) else None
+        if not isinstance(links, dict):
+            return False
+        return any(link_digest(name) != digest for name, digest in links.items())
+
+    relinked_posts = {key for key in current_hashes if key in previous_hashes and links_changed(key)}
+
     def hashes_match(key: str) -> bool:
         prev_hash = previous_hashes.get(key)
-        if not prev_hash:
+        if not prev_hash or key in relinked_posts:
             return False
         variants = current_post_hash_variants.get(key)
         if not variants:
@@ -215,42 +369,52 @@ def build_site(args: argparse.Namespace) -> bool:
     modified_posts = {key for key in current_hashes if key in previous_hashes and not hashes_match(key)}
     posts_changed = bool(added_posts or removed_posts or modified_posts)
 
-    def stale_status_changed(state: dict) -> bool:
-        if stale_days <= 0:
-            return False
-        if not state:
-            return True
-        built_at = state.get("built_at")
-        if not built_at:
-            return True
+    def previous_stale_flags(state: dict) -> dict[str, bool]:
+        built_at_dt = None
         try:
-            built_at_dt = dt.datetime.fromisoformat(built_at)
+            built_at_dt = dt.datetime.fromisoformat(state.get("built_at") or "")
         except ValueError:
+            pass
+        threshold = dt.timedelta(days=stale_days)
+        flags = {}
+        for rel, info in state.get("posts", {}).items():
+            if "stale" in info:
+                flags[rel] = bool(info["stale"])
+                continue
+            # Locks written before per-post tracking: derive the flag from the last build time.
+            try:
+                updated_dt = dt.datetime.fromisoformat(info.get("updated") or "")
+            except ValueError:
+                continue
+            if built_at_dt is not None:
+                flags[rel] = (built_at_dt - updated_dt) > threshold
+        return flags
+
+    def stale_status_changed(state: dict, flags: dict[str, bool]) -> bool:
+        if not track_stale:
+            return False
+        if not state or not state.get("built_at"):
             return True
-        now = dt.datetime.now()
         threshold = dt.timedelta(days=stale_days)
-        for info in state.get("posts", {}).values():
+        for rel, info in state.get("posts", {}).items():
             if parse_bool(info.get("draft")):
                 continue
-            updated_value = info.get("updated")
-            if not updated_value:
-                continue
             try:
-                updated_dt = dt.datetime.fromisoformat(updated_value)
+                updated_dt = dt.datetime.fromisoformat(info.get("updated") or "")
             except ValueError:
                 continue
-            was_stale = (built_at_dt - updated_dt) > threshold
-            is_stale = (now - updated_dt) > threshold
-            if is_stale and not was_stale:
+            if (build_now - updated_dt) > threshold and not flags.get(rel, False):
                 return True
         return False
 
-    stale_changed = stale_status_changed(previous_state) if incremental else False
+    previous_stale = previous_stale_flags(previous_state) if track_stale else {}
+    stale_changed = stale_status_changed(previous_state, previous_stale) if incremental else False
 
     output_exists = output_dir.exists()
     lock_ok = previous_state.get("version") == LOCK_VERSION if previous_state else False
     no_changes = (
-        incremental
+        shard is None
+        and incremental
         and output_exists
         and lock_ok
         and generator_hash == previous_state.get("generator_hash")
@@ -263,6 +427,9 @@ def build_site(args: argparse.Namespace) -> bool:
         and not stale_changed
     )
     if no_changes:
+        if input_stats != previous_stats:
+            previous_state["input_stats"] = input_stats
+            write_lock(lock_path, previous_state)
         print("No changes detected. Build skipped.")
         return False
 
@@ -280,52 +447,204 @@ def build_site(args: argparse.Namespace) -> bool:
     aggregate_needed = full_rebuild or posts_changed or stale_changed
     about_changed = full_rebuild or posts_changed or about_page_hash != previous_state.get("about_page_hash")
 
-    if full_rebuild and args.clean:
-        clean_output_dir(output_dir, project_root)
+    # Shards and the merge must agree on everything that shapes a rendered body.
+    render_key = hash_text(f"{generator_hash}\0{config_hash}\0{args.markdown_engine}\0{args.toc_depth}")
+    merged_posts = load_shards(shard_dir, render_key) if args.command == "merge" else {}
 
-    base_template = read_template(templates_dir / "base.html")
+    if full_rebuild and args.clean and shard is None:
+        clean_output_dir(output_dir, project_root)
 
-    output_dir.mkdir(parents=True, exist_ok=True)
-    (output_dir / "posts").mkdir(parents=True, exist_ok=True)
-    (output_dir / "categories").mkdir(parents=True, exist_ok=True)
+    namespace = hash_text(f"{generator_hash}\0{config_hash}")
+    if session is not None and session.get("namespace") == namespace:
+        fragments = session["fragments"]
+        renders = session["renders"]
+        body_cache = session["bodies"]
+    else:
+        fragments = FragmentCache(cache_dir, namespace, resident=not low_memory)
+        fragments.prune(int(getattr(args, "cache_max_age", 0) or 0) * 86400)
+        # Rendered bodies are only read back on a miss, so they stay on disk (and in the shared store).
+        renders = (
+            FragmentCache(cache_dir, namespace, resident=False, remote=artifact_store)
+            if cache_dir is not None or artifact_store is not None
+            else None
+        )
+        body_cache = {}
+        if session is not None:
+            session.update({"namespace": namespace, "fragments": fragments, "renders": renders, "bodies": body_cache})
 
-    if static_changed:
-        remove_stale_static(output_dir, previous_static_files, static_rel_files)
-        if static_dir.exists():
-            copy_static(static_dir, output_dir)
+    base_template = cached_file("template", read_template)(templates_dir / "base.html")
 
     custom_domain = (args.custom_domain or "").strip()
-    if custom_domain:
-        write_text(output_dir / "CNAME", f"{custom_domain}\n")
-    if args.write_nojekyll:
-        write_nojekyll(output_dir)
     site_url = (args.site_url or "").strip()
     if not site_url and custom_domain:
         site_url = f"https://{custom_domain}"
     args.site_url = site_url
 
-    write_robots_txt(output_dir, site_url)
+    if shard is None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "posts").mkdir(parents=True, exist_ok=True)
+        (output_dir / "categories").mkdir(parents=True, exist_ok=True)
+        (output_dir / "archive").mkdir(parents=True, exist_ok=True)
+
+        if static_changed:
+            remove_stale_static(output_dir, previous_static_files, static_rel_files)
+            if static_dir.exists():
+                copy_static(static_dir, output_dir)
+
+        if custom_domain:
+            write_text(output_dir / "CNAME", f"{custom_domain}\n")
+        if args.write_nojekyll:
+            write_nojekyll(output_dir)
+        write_robots_txt(output_dir, site_url, "sitemap_index.xml" if args.enable_sitemap else "")
 
     posts = []
     current_post_state = {}
     changed_slugs = set()
+    rerender_slugs = set()
     category_hash = previous_state.get("category_hash", "")
-    archive_hash = previous_state.get("archive_hash", "")
-    if aggregate_needed or about_changed:
+    category_names_hash = previous_state.get("category_names_hash", "")
+    feed_state = previous_state.get("feeds", {}) if isinstance(previous_state.get("feeds"), dict) else {}
+    sitemap_state = previous_state.get("sitemap", {}) if isinstance(previous_state.get("sitemap"), dict) else {}
+    index_state = previous_state.get("index_pages", {}) if isinstance(previous_state.get("index_pages"), dict) else {}
+    category_state = (
+        previous_state.get("category_pages", {}) if isinstance(previous_state.get("category_pages"), dict) else {}
+    )
+    archive_state = (
+        previous_state.get("archive_pages", {}) if isinstance(previous_state.get("archive_pages"), dict) else {}
+    )
+    if aggregate_needed or about_changed or shard is not None:
+        engine = create_engine(args.markdown_engine, project_root, args.toc_depth, root="..")
+        from .code_linker import code_link_paths
+
+        def linked_files(body: str, base_path: Path) -> dict[str, str]:
+            links = {}
+            for path in code_link_paths(body, base_path, project_root):
+                try:
+                    name = path.relative_to(project_root).as_posix()
+                except ValueError:
+                    name = path.as_posix()
+                links[name] = link_digest(name)
+            return links
+
+        def artifact_key(rel: str, links: dict[str, str]) -> str:
+            # code: links embed the linked file, so its contents are part of what the body was rendered from.
+            linked = [f"{name}\0{digest}" for name, digest in sorted(links.items())]
+            return fragment_key(render_key, rel, current_posts[rel]["hash"], *linked)
+
+        def stored_render(key: str) -> Optional[dict]:
+            text = renders.get("render", key) if renders is not None else None
+            if text is None:
+                return None
+            try:
+                return json.loads(text)
+            except json.JSONDecodeError:
+                return None
+
+        # Artifact key of each post rendered in this build, so low-memory loaders read the render back directly.
+        render_keys: dict[str, str] = {}
+
+        def render_body(md_file: Path) -> dict:
+            rel = lock_key(md_file)
+            post_hash = current_posts[rel]["hash"]
+            cached = body_cache.get(rel)
+            if cached is not None and cached[0] == post_hash and rel not in relinked_posts:
+                return cached[1]
+            with span("post", "post", rel=rel):
+                meta, title, body = prepare_post(md_file.read_text(encoding="utf-8"))
+                links = linked_files(body, md_file.parent)
+                key = artifact_key(rel, links)
+                render_keys[rel] = key
+                rendered = stored_render(key)
+                if rendered is None:
+                    rendered = engine.render(body, md_file.parent)
+                    if renders is not None:
+                        renders.put("render", key, json.dumps(rendered, ensure_ascii=False))
+            rendered.update({"meta": meta, "title": title, "links": links})
+            if session is not None and not low_memory:
+                body_cache[rel] = (post_hash, rendered)
+            return rendered
+
+        def body_loader(rel: str, md_file: Path) -> Callable[[], dict]:
+            if low_memory:
+                # Nothing is kept between calls: post pages and full-content feeds each read the body back from disk.
+                def load_stored() -> dict:
+                    key = render_keys.get(rel)
+                    rendered = stored_render(key) if key is not None else None
+                    if rendered is None:
+                        # Not rendered in this build: render_body recomputes the key and finds the stored render.
+                        rendered = render_body(md_file)
+                    return {"content": rendered["content"], "toc": rendered["toc"]}
+
+                return load_stored
+            body: dict = {}
+            body_lock = threading.Lock()
+
+            def load_body() -> dict:
+                with body_lock:
+                    if not body:
+                        rendered = render_body(md_file)
+                        body.update({"content": rendered["content"], "toc": rendered["toc"]})
+                return body
+
+            return load_body
+
+        def catalog_entry(info: dict) -> dict:
+            entry = {key: info[key] for key in CATALOG_FIELDS if key in info}
+            entry["date_dt"] = info["date_dt"].isoformat()
+            entry["updated_dt"] = info["updated_dt"].isoformat()
+            return entry
+
+        def from_catalog(rel: str, md_file: Path, entry: dict) -> Optional[dict]:
+            try:
+                result = {key: entry[key] for key in CATALOG_FIELDS}
+                result["date_dt"] = dt.datetime.fromisoformat(entry["date_dt"])
+                result["updated_dt"] = dt.datetime.fromisoformat(entry["updated_dt"])
+            except (KeyError, TypeError, ValueError):
+                return None
+            result["rel"] = rel
+            result["load_body"] = body_loader(rel, md_file)
+            return result
+
         def parse_post_data(md_file: Path) -> dict:
             rel = lock_key(md_file)
-            raw_text = md_file.read_text(encoding="utf-8")
-            meta, body = parse_front_matter(raw_text)
+            shared = merged_posts.get(rel)
+            if shared and shared.get("hash") == current_posts[rel]["hash"]:
+                # Rendered by a shard: take its metadata and body; only the slug loop below still needs every post.
+                # The shard files are already in memory, so low-memory merges keep the body too.
+                restored = from_catalog(rel, md_file, shared.get("meta") or {})
+                if restored is not None:
+                    restored.pop("load_body")
+                    restored.update({"content": shared.get("content", ""), "toc": shared.get("toc", "")})
+                    return restored
+            cached = previous_posts.get(rel, {}).get("meta")
+            if cached and not full_rebuild and hashes_match(rel):
+                # Unchanged post: aggregates come from the catalog, the body is rendered only if needed.
+                restored = from_catalog(rel, md_file, cached)
+                if restored is not None:
+                    return restored
+            # Drafts only need their header; everything else is rendered once here.
+            meta = read_front_matter(md_file)
             is_draft = parse_bool(meta.get("draft"))
-            title, body = extract_title(meta, body)
-            body = normalize_list_spacing(body)
-            date_dt, time_used = parse_date(meta, md_file)
+            rendered = {} if is_draft else render_body(md_file)
+            meta = rendered.get("meta", meta)
+            title = rendered.get("title") or meta.get("title") or "Untitled"
+            first_seen = ""
+            if not (meta.get("date") or "").strip():
+                # Undated posts keep the date of the build that first saw them.
+                first_seen = previous_posts.get(rel, {}).get("first_seen") or build_stamp
+            try:
+                date_fallback = dt.datetime.fromisoformat(first_seen) if first_seen else build_now
+            except ValueError:
+                date_fallback = build_now
+            date_dt, time_used = parse_date(meta, md_file, date_fallback)
             date_fmt = DATETIME_FMT if time_used else DATE_FMT
             date_str = date_dt.strftime(date_fmt)
             updated_dt = None
             updated_time_used = False
             explicit_updated = (meta.get("updated") or meta.get("update") or "").strip()
-            if not explicit_updated:
+            if not explicit_updated and rel in git_updated:
+                updated_dt = timestamp_datetime(git_updated[rel])
+            elif not explicit_updated:
                 prev_info = previous_posts.get(rel, {})
                 prev_hash = prev_info.get("hash")
                 prev_updated = prev_info.get("updated")
@@ -360,51 +679,56 @@ def build_site(args: argparse.Namespace) -> bool:
                 "archives": archive_labels,
                 "explicit_slug": explicit_slug,
                 "candidate_slug": candidate_slug,
+                "first_seen": first_seen,
             }
             if is_draft:
                 return result
-            md = markdown.Markdown(
-                extensions=[
-                    "fenced_code",
-                    "tables",
-                    "toc",
-                    "codehilite",
-                    MermaidExtension(),
-                    CodeLinkerExtension(base_path=md_file.parent, project_root=project_root),
-                ],
-                extension_configs={
-                    "toc": {"toc_depth": args.toc_depth},
-                    "codehilite": {"guess_lang": False},
-                },
-            )
-            html_content = md.convert(body)
-            toc_html = md.toc
-            md.reset()
-            html_content = fix_relative_img_src(html_content, "..")
-            html_content = add_img_loading(html_content)
-            summary = meta.get("summary") or meta.get("description")
-            if not summary:
-                summary = strip_tags(html_content).strip().replace("\n", " ")
-                summary = summary[:200] + ("..." if len(summary) > 200 else "")
-            word_count = count_words(strip_tags(html_content))
             result.update(
                 {
-                    "summary": summary,
-                    "content": html_content,
-                    "toc": toc_html,
-                    "words": word_count,
+                    "summary": meta.get("summary") or meta.get("description") or rendered["summary"],
+                    "words": rendered["words"],
+                    "terms": rendered["terms"],
+                    "links": rendered["links"],
                 }
             )
+            if low_memory:
+                # Streamed builds keep only metadata; the stored render is read back for post pages and full feeds.
+                result["load_body"] = body_loader(rel, md_file)
+            else:
+                result.update({"content": rendered["content"], "toc": rendered["toc"]})
             return result
 
+        def traced_parse(md_file: Path) -> dict:
+            with span("parse", "post", path=md_file):
+                return parse_post_data(md_file)
+
         parse_workers = min(build_workers, len(post_files)) if post_files else 1
         if parse_workers > 1:
             with ThreadPoolExecutor(max_workers=parse_workers) as executor:
-                parsed_posts = list(executor.map(parse_post_data, post_files))
+                parsed_posts = list(executor.map(traced_parse, post_files))
         else:
-            parsed_posts = [parse_post_data(path) for path in post_files]
+            parsed_posts = [traced_parse(path) for path in post_files]
+
+        if shard is not None:
+            # Unchanged posts are left out: the merge restores them from its own lock catalog.
+            rendered_posts = {
+                info["rel"]: {
+                    "hash": current_posts[info["rel"]]["hash"],
+                    "meta": catalog_entry(info),
+                    "content": info["content"],
+                    "toc": info["toc"],
+                }
+                for info in parsed_posts
+                if "content" in info
+            }
+            path = write_shard(shard_dir, shard, render_key, rendered_posts)
+            print(f"Shard {shard[0]}/{shard[1]}: rendered {len(rendered_posts)} of {len(post_files)} posts into {path}")
+            if isinstance(artifact_store, HttpStore):
+                artifact_store.report()
+            return True
 
         used_slugs = set()
+        names = NameTable()
         for info in parsed_posts:
             rel = info["rel"]
             explicit_slug = info["explicit_slug"]
@@ -435,28 +759,37 @@ def build_site(args: argparse.Namespace) -> bool:
             current_posts[rel]["slug"] = slug
             current_posts[rel]["draft"] = info["draft"]
             current_posts[rel]["updated"] = info["updated_dt"].replace(microsecond=0).isoformat()
+            if info["first_seen"]:
+                current_posts[rel]["first_seen"] = info["first_seen"]
             if info["draft"]:
                 continue
+            current_posts[rel]["meta"] = catalog_entry(info)
             posts.append(
-                {
-                    "title": info["title"],
-                    "date": info["date"],
-                    "date_dt": info["date_dt"],
-                    "updated": info["updated"],
-                    "updated_dt": info["updated_dt"],
-                    "categories": info["categories"],
-                    "slug": slug,
-                    "summary": info["summary"],
-                    "content": info["content"],
-                    "toc": info["toc"],
-                    "archives": info["archives"],
-                    "words": info["words"],
-                    "weight": category_weight(info["categories"], category_weights),
-                    "source": rel,
-                }
+                Post(
+                    source=rel,
+                    hash=current_posts[rel]["hash"],
+                    slug=slug,
+                    title=info["title"],
+                    date=info["date"],
+                    date_dt=info["date_dt"],
+                    updated=info["updated"],
+                    updated_dt=info["updated_dt"],
+                    categories=names.get(info["categories"]),
+                    archives=names.get(info["archives"]),
+                    summary=info["summary"],
+                    words=info["words"],
+                    terms=info["terms"],
+                    links=fragment_key(*sorted(info["links"].items())) if info["links"] else "",
+                    weight=category_weight(info["categories"], category_weights),
+                    content=info.get("content"),
+                    toc=info.get("toc", ""),
+                    load_body=info.get("load_body"),
+                )
             )
+        # The records hold everything builders need; drop the parse results instead of keeping both.
+        del parsed_posts
         changed_paths = added_posts | modified_posts
-        changed_slugs = {post["slug"] for post in posts if post["source"] in changed_paths}
+        changed_slugs = {post.slug for post in posts if post.source in changed_paths}
         current_post_state = {
             key: {
                 "hash": current_posts[key]["hash"],
@@ -466,195 +799,246 @@ def build_site(args: argparse.Namespace) -> bool:
             }
             for key in current_posts
         }
+        for key, info in current_posts.items():
+            for field in ("first_seen", "meta"):
+                if info.get(field):
+                    current_post_state[key][field] = info[field]
     else:
         current_post_state = previous_posts
 
-    posts.sort(key=lambda p: p["date_dt"], reverse=True)
+    lap("posts")
+    posts.sort(key=lambda p: p.date_dt, reverse=True)
 
     category_map = {}
     for post in posts:
-        for category in post["categories"]:
+        for category in post.categories:
             category_map.setdefault(category, []).append(post)
+    collisions = [
+        (kind, slug, group)
+        for kind, names in (
+            ("Categories", category_map),
+            ("Archive series", {label for post in posts for label in post.archives}),
+        )
+        for slug, group in slug_collisions(names)
+    ]
+    if collisions:
+        for kind, slug, group in collisions:
+            names = ", ".join(repr(name) for name in group)
+            print(f"{kind} {names} share the slug '{slug}' and would overwrite each other's pages and feeds.", file=sys.stderr)
+        print("Rename one of them in the posts' front matter.", file=sys.stderr)
+        sys.exit(1)
 
     if aggregate_needed or about_changed:
         category_parts = [
             f"{name}:{len(items)}" for name, items in sorted(category_map.items(), key=lambda x: x[0].lower())
         ]
         category_hash = hash_text("|".join(category_parts))
-        archive_groups = {}
+        category_names_hash = hash_text("\0".join(sorted(category_map)))
+        # Post pages embed a window of their archive series; re-render only posts whose window changed.
+        archive_map = build_archive_map(posts)
         for post in posts:
-            for label in post.get("archives", []):
-                archive_groups.setdefault(label, []).append(post["slug"])
-        archive_parts = []
-        for label in sorted(archive_groups):
-            archive_parts.append(f"{label}:{','.join(sorted(archive_groups[label]))}")
-        archive_hash = hash_text("|".join(archive_parts))
+            series_html, _ = build_archive_sidebar(post, archive_map, "..", args.series_window)
+            series_hash = hash_text(series_html)
+            current_post_state[post.source]["series"] = series_hash
+            if previous_posts.get(post.source, {}).get("series") != series_hash:
+                rerender_slugs.add(post.slug)
+        if track_stale:
+            for post in posts:
+                stale = post_is_stale(post, stale_days, build_now)
+                current_post_state[post.source]["stale"] = stale
+                if previous_stale.get(post.source) != stale:
+                    rerender_slugs.add(post.slug)
 
+    # Builders only read posts and category_map and each owns its output files, so independent
+    # ones run concurrently; inputs/outputs name the resources that order the rest.
+    graph = TaskGraph()
+    page_context = (analytics_html, about_html, widget_html, theme_toggle, theme_default)
     if aggregate_needed:
         index_posts = sorted(
             posts,
-            key=lambda post: (post.get("weight", 0), post["date_dt"]),
+            key=lambda post: (post.weight, post.date_dt),
             reverse=True,
         )
-        total_pages = build_index(
-            base_template,
-            output_dir,
-            index_posts,
-            category_map,
-            args,
-            analytics_html,
-            about_html,
-            widget_html,
-            theme_toggle,
-            theme_default,
-        )
-        rebuild_all_posts = (
-            full_rebuild
-            or stale_changed
-            or category_hash != previous_state.get("category_hash")
-            or archive_hash != previous_state.get("archive_hash")
-        )
-        if rebuild_all_posts:
-            build_posts(
+        graph.add(
+            "index",
+            lambda: build_index(
                 base_template,
                 output_dir,
-                posts,
+                index_posts,
                 category_map,
                 args,
-                analytics_html,
-                about_html,
-                widget_html,
-                theme_toggle,
-                theme_default,
-                workers=build_workers,
+                *page_context,
+                previous_pages=index_state,
+                force=full_rebuild,
+                fragments=fragments,
+            ),
+            inputs=("posts", "category_map", "fragments"),
+            outputs=("index.html", "page-*.html", "state:index_pages"),
+        )
+
+        def write_sidebar_data() -> None:
+            if sidebar_mode(args) == "include":
+                build_sidebar_data(output_dir, category_map)
+            else:
+                (output_dir / "sidebar.json").unlink(missing_ok=True)
+
+        graph.add("sidebar_data", write_sidebar_data, inputs=("category_map",), outputs=("sidebar.json",))
+
+        def remove_post_pages() -> None:
+            removed_slugs = set()
+            for rel in removed_posts:
+                slug = previous_posts.get(rel, {}).get("slug")
+                if slug:
+                    removed_slugs.add(slug)
+            for rel, data in current_post_state.items():
+                prev = previous_posts.get(rel, {})
+                prev_slug = prev.get("slug")
+                prev_draft = parse_bool(prev.get("draft"))
+                if prev_slug and prev_draft is False and data.get("draft") is True:
+                    removed_slugs.add(prev_slug)
+                if prev_slug and data.get("slug") and prev_slug != data.get("slug"):
+                    removed_slugs.add(prev_slug)
+            # A slug freed by one post may have been taken by another in this build.
+            removed_slugs -= {post.slug for post in posts}
+            for slug in removed_slugs:
+                (output_dir / "posts" / f"{slug}.html").unlink(missing_ok=True)
+
+        if output_exists:
+            graph.add("prune_posts", remove_post_pages, inputs=("posts",), outputs=("posts/*.html:removed",))
+        # Inline sidebars embed the category counts; include sidebars only list the category names.
+        rebuild_all_posts = (
+            full_rebuild
+            or (sidebar_mode(args) == "inline" and category_hash != previous_state.get("category_hash"))
+            or (
+                sidebar_mode(args) == "include"
+                and category_names_hash != previous_state.get("category_names_hash")
+            )
+        )
+        if rebuild_all_posts or changed_slugs or rerender_slugs:
+            graph.add(
+                "post_pages",
+                lambda: build_posts(
+                    base_template,
+                    output_dir,
+                    posts,
+                    category_map,
+                    args,
+                    *page_context,
+                    only_slugs=None if rebuild_all_posts else changed_slugs | rerender_slugs,
+                    workers=build_workers,
+                    now=build_now,
+                ),
+                inputs=("posts", "category_map", "posts/*.html:removed"),
+                outputs=("posts/*.html",),
             )
-        elif changed_slugs:
-            build_posts(
+        graph.add(
+            "categories",
+            lambda: build_categories(
                 base_template,
                 output_dir,
-                posts,
                 category_map,
                 args,
-                analytics_html,
-                about_html,
-                widget_html,
-                theme_toggle,
-                theme_default,
-                only_slugs=changed_slugs,
-                workers=build_workers,
-            )
-        build_categories(
-            base_template,
-            output_dir,
-            category_map,
-            args,
-            analytics_html,
-            about_html,
-            widget_html,
-            theme_toggle,
-            theme_default,
+                *page_context,
+                previous_pages=category_state,
+                force=full_rebuild,
+                fragments=fragments,
+            ),
+            inputs=("category_map", "fragments"),
+            outputs=("categories/*.html", "state:category_pages"),
         )
-        build_search(
-            base_template,
-            output_dir,
-            posts,
-            category_map,
-            args,
-            analytics_html,
-            about_html,
-            widget_html,
-            theme_toggle,
-            theme_default,
+        graph.add(
+            "search",
+            lambda: build_search(base_template, output_dir, posts, category_map, args, *page_context),
+            inputs=("posts", "category_map"),
+            outputs=("search.html",),
         )
-        build_search_index(output_dir, posts)
-        build_archive(
-            base_template,
-            output_dir,
-            posts,
-            category_map,
-            args,
-            analytics_html,
-            about_html,
-            widget_html,
-            theme_toggle,
-            theme_default,
+        graph.add(
+            "search_index",
+            lambda: build_search_index(output_dir, posts),
+            inputs=("posts",),
+            outputs=("search-index.json",),
         )
-        if args.enable_rss:
-            build_rss(
+        graph.add(
+            "archive",
+            lambda: build_archive(
+                base_template,
                 output_dir,
                 posts,
-                site_url,
+                category_map,
                 args,
-                args.feed_limit,
-                full_content=args.feed_full_content,
-            )
-        if args.enable_atom:
-            build_atom(
+                *page_context,
+                previous_pages=archive_state,
+                force=full_rebuild,
+            ),
+            inputs=("posts", "category_map"),
+            outputs=("archive.html", "archive.json", "archive/*", "state:archive_pages"),
+        )
+        graph.add(
+            "feeds",
+            lambda: build_feeds(
                 output_dir,
                 posts,
+                category_map,
                 site_url,
                 args,
-                args.feed_limit,
-                full_content=args.feed_full_content,
-            )
+                fragments,
+                feed_state,
+                force=full_rebuild,
+            ),
+            inputs=("posts", "category_map", "fragments"),
+            outputs=("rss.xml", "atom.xml", "feeds/*", "state:feeds"),
+        )
         if args.enable_sitemap:
-            build_sitemap(
-                output_dir,
-                posts,
-                category_map,
-                site_url,
-                total_pages,
-                include_about=about_page.exists(),
-                include_rss=args.enable_rss,
-                include_atom=args.enable_atom,
-                include_404=args.enable_404,
+            graph.add(
+                "sitemap",
+                lambda: build_sitemap(
+                    output_dir,
+                    lambda: iter_sitemap_urls(
+                        posts,
+                        category_map,
+                        site_url.rstrip("/"),
+                        paginate_posts(index_posts, args.posts_per_page, args.pagination_mode == "stable"),
+                        per_page=args.posts_per_page,
+                        stable=args.pagination_mode == "stable",
+                        include_about=about_page.exists(),
+                        include_rss=args.enable_rss,
+                        include_atom=args.enable_atom,
+                        include_404=args.enable_404,
+                    ),
+                    site_url,
+                    sitemap_state,
+                    max_urls=args.sitemap_max_urls,
+                    force=full_rebuild,
+                ),
+                inputs=("posts", "category_map"),
+                outputs=("sitemap_index.xml", "sitemap-*.xml", "state:sitemap"),
             )
         if args.enable_404:
-            build_404(
-                base_template,
-                output_dir,
-                category_map,
-                args,
-                analytics_html,
-                about_html,
-                widget_html,
-                theme_toggle,
-                theme_default,
+            graph.add(
+                "not_found",
+                lambda: build_404(base_template, output_dir, category_map, args, *page_context),
+                inputs=("category_map",),
+                outputs=("404.html",),
             )
     if about_changed:
-        build_about(
-            base_template,
-            output_dir,
-            category_map,
-            args,
-            analytics_html,
-            about_html,
-            widget_html,
-            theme_toggle,
-            theme_default,
+        graph.add(
+            "about",
+            lambda: build_about(base_template, output_dir, category_map, args, *page_context),
+            inputs=("category_map",),
+            outputs=("about.html",),
         )
-
-    if output_exists and aggregate_needed:
-        removed_slugs = set()
-        for rel in removed_posts:
-            slug = previous_posts.get(rel, {}).get("slug")
-            if slug:
-                removed_slugs.add(slug)
-        for rel, data in current_post_state.items():
-            prev = previous_posts.get(rel, {})
-            prev_slug = prev.get("slug")
-            prev_draft = parse_bool(prev.get("draft"))
-            if prev_slug and prev_draft is False and data.get("draft") is True:
-                removed_slugs.add(prev_slug)
-            if prev_slug and data.get("slug") and prev_slug != data.get("slug"):
-                removed_slugs.add(prev_slug)
-        for slug in removed_slugs:
-            path = output_dir / "posts" / f"{slug}.html"
-            try:
-                path.unlink()
-            except FileNotFoundError:
-                pass
-
+    results = graph.run(build_workers)
+    index_state = results.get("index", index_state)
+    category_state = results.get("categories", category_state)
+    archive_state = results.get("archive", archive_state)
+    feed_state = results.get("feeds", feed_state)
+    sitemap_state = results.get("sitemap", sitemap_state)
+    if session is not None:
+        session["tasks"] = graph.durations()
+        session["critical_path"] = graph.critical_path()
+    lap("pages")
+    if isinstance(artifact_store, HttpStore):
+        artifact_store.report()
     if args.enable_indexnow and args.indexnow_key:
         write_indexnow_key(output_dir, args.indexnow_key)
         if site_url:
@@ -671,27 +1055,131 @@ def build_site(args: argparse.Namespace) -> bool:
                 # Always include the homepage when something changed
                 urls_to_notify.insert(0, site_url if site_url.endswith("/") else site_url + "/")
             
-            notify_indexnow(site_url, args.indexnow_key, urls_to_notify)
+            notify_indexnow(
+                site_url,
+                args.indexnow_key,
+                urls_to_notify,
+                indexnow_queue,
+                endpoints=args.indexnow_endpoints,
+                async_mode=args.indexnow_async,
+            )
 
     build_state = {
         "version": LOCK_VERSION,
-        "built_at": dt.datetime.now().replace(microsecond=0).isoformat(),
+        "built_at": build_stamp,
         "generator_hash": generator_hash,
         "templates_hash": templates_hash,
         "config_hash": config_hash,
         "snippets_hash": snippets_hash,
         "static_hash": static_hash,
         "static_files": static_rel_files,
+        "input_stats": input_stats,
         "about_page_hash": about_page_hash,
         "category_hash": category_hash,
-        "archive_hash": archive_hash,
+        "category_names_hash": category_names_hash,
+        "feeds": feed_state,
+        "sitemap": sitemap_state,
+        "index_pages": index_state,
+        "category_pages": category_state,
+        "archive_pages": archive_state,
         "posts": current_post_state,
     }
+    if git_meta is not None:
+        build_state["git"] = {"head": git_meta["head"], "times": git_meta["times"]}
     write_lock(lock_path, build_state)
+    lap("finish")
+    if session is not None:
+        session["state"] = build_state
     return True
 
 
-def main() -> None:
+def watch_paths(args: argparse.Namespace) -> list[Path]:
+    paths = [Path(args.posts), Path(args.static), Path("templates"), Path("pages"), Path("code_snippets"), Path(args.config)]
+    for value in (args.analytics_file, args.widget_file, args.about_file):
+        if value:
+            paths.append(Path(value))
+    return paths
+
+
+def watch_site(args: argparse.Namespace, on_build: Optional[Callable[[dict], None]] = None) -> None:
+    if args.enable_indexnow:
+        print("Watch mode: IndexNow submission disabled.")
+        args.enable_indexnow = False
+    session: dict = {}
+
+    def report(built: bool, start: float, changed: list[str], error: str = "") -> None:
+        if on_build is None:
+            return
+        on_build(
+            {
+                "built": built,
+                "ok": not error,
+                "error": error,
+                "finished_at": dt.datetime.now().replace(microsecond=0).isoformat(),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                "timings": dict(session.get("timings", {})),
+                "tasks": dict(session.get("tasks", {})),
+                "critical_path": session.get("critical_path", ([], 0.0))[0],
+                "critical_path_ms": session.get("critical_path", ([], 0.0))[1],
+                "changed": changed,
+            }
+        )
+
+    start = time.perf_counter()
+    report(build_site(args, session), start, [])
+    print(f"Initial build completed in {time.perf_counter() - start:.2f}s.")
+    ignore = [Path(args.output), Path(args.lock_file)]
+    if args.cache_dir:
+        ignore.append(Path(args.cache_dir))
+    watcher = Watcher(watch_paths(args), ignore)
+    print(f"Watching for changes ({watcher.backend}, Ctrl+C to stop)...")
+    config_path = Path(args.config).resolve()
+    try:
+        while True:
+            changed = watcher.wait()
+            start = time.perf_counter()
+            try:
+                if any(path.resolve() == config_path for path in changed):
+                    # Config values become argparse defaults, so re-parse them; the lock state stays resident.
+                    args = parse_args()
+                    args.enable_indexnow = False
+                built = build_site(args, session)
+            except (Exception, SystemExit) as exc:
+                # Keep watching; the next build reloads state from the lock file.
+                session.pop("state", None)
+                print(f"Build failed: {exc!r}", file=sys.stderr)
+                report(False, start, sorted(path.as_posix() for path in changed), repr(exc))
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            report(built, start, sorted(path.as_posix() for path in changed))
+            names = ", ".join(sorted(path.name for path in changed)[:3])
+            more = f" (+{len(changed) - 3} more)" if len(changed) > 3 else ""
+            status = "Rebuilt" if built else "No output changes"
+            print(f"{status} in {elapsed:.0f} ms: {names}{more}")
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    finally:
+        watcher.close()
+
+
+def serve_site(args: argparse.Namespace) -> None:
+    from .serve import PreviewServer
+
+    try:
+        server = PreviewServer((args.host, args.port), Path(args.output))
+    except OSError as exc:
+        print(f"Cannot listen on {args.host}:{args.port}: {exc}", file=sys.stderr)
+        sys.exit(1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"Serving {args.output} at http://{args.host}:{server.server_address[1]}/ (build stats at /__stats)")
+    try:
+        watch_site(args, on_build=server.publish)
+    finally:
+        server.close()
+
+
+def parse_args() -> argparse.Namespace:
     pre_parser = argparse.ArgumentParser(add_help=False)
     pre_parser.add_argument(
         "--config",
@@ -721,7 +1209,21 @@ def main() -> None:
         value = config.get(key)
         return value if isinstance(value, dict) else default
 
+    def cfg_list(key: str, default: list) -> list:
+        value = config.get(key)
+        if isinstance(value, str):
+            value = parse_list(value)
+        return [str(item) for item in value] if isinstance(value, list) and value else default
+
     parser = argparse.ArgumentParser(description="Simple Markdown blog generator.")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["build", "serve", "merge"],
+        default="build",
+        help="build (default), serve: build, watch and preview with live reload, "
+        "or merge: build the site from the fragments written by build --shard.",
+    )
     parser.add_argument("--config", default=pre_args.config, help="Path to site config file (TOML/YAML/JSON).")
     parser.add_argument("--posts", default=cfg_str("posts", "posts"), help="Directory containing Markdown posts.")
     parser.add_argument("--static", default=cfg_str("static", "static"), help="Directory containing static assets.")
@@ -766,6 +1268,32 @@ def main() -> None:
         type=int,
         help="Number of posts on the home page before pagination.",
     )
+    parser.add_argument(
+        "--pagination-window",
+        default=cfg_int("pagination_window", 2),
+        type=int,
+        help="Page links shown on each side of the current page (0 = link every page).",
+    )
+    parser.add_argument(
+        "--pagination-mode",
+        choices=["classic", "stable"],
+        default=cfg_str("pagination_mode", "classic").strip().lower(),
+        help="classic numbers pages from the newest post; stable numbers them from the oldest "
+        "so existing pages keep their contents when posts are added.",
+    )
+    parser.add_argument(
+        "--sidebar-mode",
+        choices=["inline", "include"],
+        default=cfg_str("sidebar_mode", "inline").strip().lower(),
+        help="inline embeds category counts in every page; include ships them in sidebar.json "
+        "and hydrates the sidebar client-side.",
+    )
+    parser.add_argument(
+        "--series-window",
+        default=cfg_int("series_window", 3),
+        type=int,
+        help="Archive series entries shown on each side of the current post (0 = list the whole series).",
+    )
     parser.add_argument(
         "--build-workers",
         default=cfg_int("build_workers", 0),
@@ -782,6 +1310,12 @@ def main() -> None:
         default=cfg_str("toc_depth", "2-4"),
         help="Heading depth range for TOC (e.g. 2-4).",
     )
+    parser.add_argument(
+        "--markdown-engine",
+        choices=list(ENGINES),
+        default=cfg_str("markdown_engine", "python-markdown").strip().lower(),
+        help="Markdown renderer backend (markdown-it requires markdown-it-py).",
+    )
     parser.add_argument(
         "--show-updated",
         action=argparse.BooleanOptionalAction,
@@ -799,6 +1333,12 @@ def main() -> None:
         default=cfg_str("stale_notice", "This post may be outdated."),
         help="Notice text for stale posts.",
     )
+    parser.add_argument(
+        "--stale-mode",
+        choices=["build", "client"],
+        default=cfg_str("stale_mode", "build").strip().lower(),
+        help="build renders the stale notice at build time; client lets stale-notice.js show it in the browser.",
+    )
     parser.add_argument(
         "--enable-rss",
         action=argparse.BooleanOptionalAction,
@@ -811,11 +1351,29 @@ def main() -> None:
         default=cfg_bool("enable_atom", True),
         help="Generate atom.xml.",
     )
+    parser.add_argument(
+        "--enable-category-feeds",
+        action=argparse.BooleanOptionalAction,
+        default=cfg_bool("enable_category_feeds", False),
+        help="Generate RSS/Atom feeds for every category under feeds/category/.",
+    )
+    parser.add_argument(
+        "--enable-archive-feeds",
+        action=argparse.BooleanOptionalAction,
+        default=cfg_bool("enable_archive_feeds", False),
+        help="Generate RSS/Atom feeds for every archive group under feeds/archive/.",
+    )
     parser.add_argument(
         "--enable-sitemap",
         action=argparse.BooleanOptionalAction,
         default=cfg_bool("enable_sitemap", True),
-        help="Generate sitemap.xml.",
+        help="Generate sitemap_index.xml and chunked sitemap-N.xml files.",
+    )
+    parser.add_argument(
+        "--sitemap-max-urls",
+        default=cfg_int("sitemap_max_urls", 50000),
+        type=int,
+        help="Maximum URLs per sitemap-N.xml chunk (protocol limit 50000).",
     )
     parser.add_argument(
         "--enable-404",
@@ -834,6 +1392,23 @@ def main() -> None:
         default=os.environ.get("INDEXNOW_KEY") or cfg_str("indexnow_key", ""),
         help="IndexNow API key (can also be set via INDEXNOW_KEY env var).",
     )
+    parser.add_argument(
+        "--indexnow-endpoints",
+        nargs="+",
+        default=cfg_list("indexnow_endpoints", INDEXNOW_ENDPOINTS),
+        help="IndexNow endpoints to submit changed URLs to.",
+    )
+    parser.add_argument(
+        "--indexnow-queue",
+        default=cfg_str("indexnow_queue", "indexnow-queue.json"),
+        help="Path to the persistent queue of pending IndexNow URLs.",
+    )
+    parser.add_argument(
+        "--indexnow-async",
+        action=argparse.BooleanOptionalAction,
+        default=cfg_bool("indexnow_async", False),
+        help="Submit IndexNow URLs from a background process and finish the build immediately.",
+    )
     parser.add_argument(
         "--write-nojekyll",
         action=argparse.BooleanOptionalAction,
@@ -857,11 +1432,61 @@ def main() -> None:
         default=cfg_bool("incremental", True),
         help="Enable incremental build using the lock file.",
     )
+    parser.add_argument(
+        "--change-detection",
+        choices=["content", "git"],
+        default=cfg_str("change_detection", "content").strip().lower(),
+        help="content hashes every post; git reads blob ids from the index and updated dates from git log.",
+    )
     parser.add_argument(
         "--lock-file",
         default=cfg_str("lock_file", "build.lock.json"),
         help="Path to build lock JSON.",
     )
+    parser.add_argument(
+        "--cache-dir",
+        default=cfg_str("cache_dir", ".sitegen-cache"),
+        help="Directory for cached rendered fragments (empty to disable).",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=int,
+        default=cfg_int("cache_max_age", 30),
+        help="Drop cached fragments not used for this many days (0 keeps them).",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action=argparse.BooleanOptionalAction,
+        default=cfg_bool("low_memory", False),
+        help="Spill rendered posts to the cache directory instead of keeping them in memory.",
+    )
+    parser.add_argument(
+        "--artifact-store",
+        default=cfg_str("artifact_store", ""),
+        help="Shared store for rendered posts: an http(s) URL (GET/PUT by hash) or a directory.",
+    )
+    parser.add_argument(
+        "--artifact-store-token",
+        default=os.environ.get("ARTIFACT_STORE_TOKEN") or cfg_str("artifact_store_token", ""),
+        help="Bearer token for an HTTP artifact store (can also be set via ARTIFACT_STORE_TOKEN env var).",
+    )
+    parser.add_argument(
+        "--artifact-push",
+        action=argparse.BooleanOptionalAction,
+        default=cfg_bool("artifact_push", True),
+        help="Upload newly rendered posts to the artifact store (disable for read-only builds).",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        help="Render only shard I of N (e.g. 2/4) of the posts into --shard-dir; merge then writes the site.",
+    )
+    parser.add_argument(
+        "--shard-dir",
+        default=cfg_str("shard_dir", "shards"),
+        help="Directory for the fragments written by build --shard and read by merge.",
+    )
     parser.add_argument(
         "--analytics-file",
         default=cfg_str("analytics_file", ""),
@@ -897,10 +1522,53 @@ def main() -> None:
         default=cfg_str("about_file", ""),
         help="Path to file used for the sidebar About panel.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Rebuild on file changes, keeping the post catalog and rendered posts in memory.",
+    )
+    parser.add_argument(
+        "--trace",
+        default="",
+        help="Write a Chrome/Perfetto trace of the build to this JSON file.",
+    )
+    parser.add_argument(
+        "--trace-top",
+        type=int,
+        default=10,
+        help="Number of slowest posts listed after a traced build.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address for the serve command.")
+    parser.add_argument("--port", type=int, default=8000, help="Port for the serve command (0 picks a free port).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    tracer = enable_trace() if args.trace else None
+    try:
+        run(args)
+    finally:
+        if tracer is not None:
+            tracer.write(Path(args.trace))
+            print_summary(tracer, args.trace_top)
+            print(f"Trace written to: {args.trace} (open in https://ui.perfetto.dev or chrome://tracing)")
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.shard is not None and (args.command != "build" or args.watch):
+        print("--shard only applies to a one-off build; run merge afterwards to write the site.", file=sys.stderr)
+        sys.exit(1)
+    if args.command == "serve":
+        serve_site(args)
+        return
+    if args.watch:
+        watch_site(args)
+        return
     start = time.perf_counter()
-    built = build_site(args)
+    with span("build"):
+        built = build_site(args)
     elapsed = time.perf_counter() - start
     print(f"Build completed in {elapsed:.2f}s.")
-    if built:
+    if built and args.shard is None:
         print(f"Site generated in: {args.output}")
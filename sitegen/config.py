@@ -5,8 +5,6 @@ import json
 import sys
 from pathlib import Path
 
-import markdown
-
 try:
     import tomllib as toml
 except ImportError:
@@ -15,11 +13,6 @@ except ImportError:
     except ImportError:  # pragma: no cover - optional dependency
         toml = None
 
-try:
-    import yaml
-except ImportError:  # pragma: no cover - optional dependency
-    yaml = None
-
 
 def load_config(path: Path) -> dict:
     if not path.exists():
@@ -40,7 +33,9 @@ def load_config(path: Path) -> dict:
             sys.exit(1)
         return data
     if suffix in {".yml", ".yaml"}:
-        if yaml is None:
+        try:
+            import yaml
+        except ImportError:  # pragma: no cover - optional dependency
             print("YAML config requires PyYAML.", file=sys.stderr)
             sys.exit(1)
         try:
@@ -97,11 +92,10 @@ def resolve_about_html(args: object) -> str:
             if suffix in {".html", ".htm"}:
                 return text
             if suffix == ".md":
-                md = markdown.Markdown(
-                    extensions=["fenced_code", "tables", "codehilite"],
-                    extension_configs={"codehilite": {"guess_lang": False}},
-                )
-                return md.convert(text)
+                from .engines import create_engine
+
+                engine = create_engine(getattr(args, "markdown_engine", ""), path.parent)
+                return engine.render(text, path.parent)["content"]
             escaped = html.escape(text).replace("\n", "<br>")
             return f"<p>{escaped}</p>"
 
@@ -4,12 +4,19 @@ import datetime as dt
 import html as html_lib
 import re
 from pathlib import Path
+from typing import Iterable, Optional
+
+from .utils import build_time, file_mtime
 
 LIST_MARKER_RE = re.compile(r"^(?P<indent>[ \t]*)(?:[-+*]|\d+[.)])\s+")
 FENCE_RE = re.compile(r"^(?P<indent>[ \t]*)(`{3,}|~{3,})")
 DOUBLE_QUOTE_RE = re.compile(r"^(?P<indent>[ \t]*)>>(?!>)(?P<rest>.*)$")
 CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
 WORD_RE = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z0-9]+)?")
+FRONT_MATTER_LIMIT = 64 * 1024
+TERM_RE = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z0-9]+)?|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+")
+# Characters per post, not bytes: CJK terms take up to 6 bytes each once escaped in search-index.json.
+SEARCH_TERMS_LIMIT = 1200
 
 
 def slugify(text: str) -> str:
@@ -29,22 +36,9 @@ def parse_list(value: str) -> list[str]:
     return [item for item in items if item]
 
 
-def parse_front_matter(text: str) -> tuple[dict, str]:
-    clean_text = text.lstrip("\ufeff")
-    lines = clean_text.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return {}, clean_text
-
-    end = None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            end = i
-            break
-    if end is None:
-        return {}, clean_text
-
+def parse_meta_lines(lines: Iterable[str]) -> dict:
     meta = {}
-    for line in lines[1:end]:
+    for line in lines:
         line = line.strip()
         if not line or line.startswith("#") or ":" not in line:
             continue
@@ -55,8 +49,45 @@ def parse_front_matter(text: str) -> tuple[dict, str]:
             meta[key] = parse_list(value)
         else:
             meta[key] = value
-    body = "\n".join(lines[end + 1 :])
-    return meta, body
+    return meta
+
+
+def read_front_matter(path: Path) -> dict:
+    # Reads only the header, so metadata-only callers never load the post body.
+    with path.open(encoding="utf-8") as handle:
+        if handle.readline().lstrip("\ufeff").strip() != "---":
+            return {}
+        lines = []
+        size = 0
+        for line in handle:
+            if line.strip() == "---":
+                return parse_meta_lines(lines)
+            size += len(line)
+            if size > FRONT_MATTER_LIMIT:
+                break
+            lines.append(line)
+    return {}
+
+
+def parse_front_matter(text: str) -> tuple[dict, str]:
+    clean_text = text.lstrip("\ufeff")
+    lines = []
+    start = 0
+    while True:
+        end = clean_text.find("\n", start)
+        line = clean_text[start:] if end < 0 else clean_text[start:end]
+        if start == 0:
+            if line.strip() != "---":
+                return {}, clean_text
+        elif line.strip() == "---":
+            break
+        else:
+            lines.append(line)
+        if end < 0:
+            return {}, clean_text
+        start = end + 1
+    body = clean_text[end + 1 :] if end >= 0 else ""
+    return parse_meta_lines(lines), body.replace("\r\n", "\n").replace("\r", "\n")
 
 
 def extract_title(meta: dict, body: str) -> tuple[str, str]:
@@ -74,8 +105,15 @@ def extract_title(meta: dict, body: str) -> tuple[str, str]:
     return "Untitled", body
 
 
-def parse_date(meta: dict, file_path: Path) -> tuple[dt.datetime, bool]:
-    now = dt.datetime.now()
+def prepare_post(text: str) -> tuple[dict, str, str]:
+    # Everything between the file and the Markdown engine: front matter, title line, list spacing.
+    meta, body = parse_front_matter(text)
+    title, body = extract_title(meta, body)
+    return meta, title, normalize_list_spacing(body)
+
+
+def parse_date(meta: dict, file_path: Path, now: Optional[dt.datetime] = None) -> tuple[dt.datetime, bool]:
+    now = now or build_time()
     date_value = (meta.get("date") or "").strip()
     time_value = (meta.get("time") or "").strip()
     if date_value:
@@ -93,7 +131,7 @@ def parse_date(meta: dict, file_path: Path) -> tuple[dt.datetime, bool]:
                 pass
         try:
             date_part = dt.date.fromisoformat(date_value)
-            return dt.datetime.combine(date_part, now.time()), True
+            return dt.datetime.combine(date_part, dt.time.min), False
         except ValueError:
             pass
     if time_value:
@@ -104,7 +142,7 @@ def parse_date(meta: dict, file_path: Path) -> tuple[dt.datetime, bool]:
             pass
     if not time_value:
         return now, True
-    return dt.datetime.fromtimestamp(file_path.stat().st_mtime), False
+    return file_mtime(file_path), False
 
 
 def parse_updated(meta: dict, file_path: Path) -> tuple[dt.datetime, bool]:
@@ -120,7 +158,7 @@ def parse_updated(meta: dict, file_path: Path) -> tuple[dt.datetime, bool]:
             return dt.datetime.combine(date_part, dt.time.min), False
         except ValueError:
             pass
-    return dt.datetime.fromtimestamp(file_path.stat().st_mtime), False
+    return file_mtime(file_path), False
 
 
 def get_categories(meta: dict) -> list[str]:
@@ -169,6 +207,21 @@ def normalize_list_spacing(text: str) -> str:
     return "\n".join(out)
 
 
+def search_terms(text: str, limit: int = SEARCH_TERMS_LIMIT) -> str:
+    # Unique lowercase words and CJK runs in first-seen order, capped so the search index stays small.
+    terms: dict[str, None] = {}
+    size = 0
+    for match in TERM_RE.finditer(html_lib.unescape(text).lower()):
+        term = match.group(0)
+        if term in terms or (len(term) < 2 and term.isascii()):
+            continue
+        size += len(term) + 1
+        if size > limit:
+            break
+        terms[term] = None
+    return " ".join(terms)
+
+
 def count_words(text: str) -> int:
     text = html_lib.unescape(text)
     cjk_count = len(CJK_RE.findall(text))
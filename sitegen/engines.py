@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .renderers import MarkdownItEngine, PythonMarkdownEngine
+
+ENGINES = ("python-markdown", "markdown-it")
+
+
+def create_engine(
+    name: str, project_root: Path, toc_depth: Optional[str] = None, root: Optional[str] = None
+) -> PythonMarkdownEngine | MarkdownItEngine:
+    # Backends pull in Markdown and Pygments, so they are imported only when something is rendered.
+    name = (name or "python-markdown").strip().lower()
+    if name == "markdown-it":
+        from .renderers import MarkdownItEngine
+
+        try:
+            return MarkdownItEngine(project_root, toc_depth, root)
+        except ImportError:
+            print("markdown_engine = 'markdown-it' requires markdown-it-py (pip install markdown-it-py).", file=sys.stderr)
+            sys.exit(1)
+    if name != "python-markdown":
+        print(f"Unknown markdown engine: {name} (expected one of {', '.join(ENGINES)}).", file=sys.stderr)
+        sys.exit(1)
+    from .renderers import PythonMarkdownEngine
+
+    return PythonMarkdownEngine(project_root, toc_depth, root)
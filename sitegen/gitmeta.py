@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hashlib
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+GIT_TIMEOUT = 60
+
+
+def run_git(root: Path, *args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "-c", "core.quotePath=false", *args],
+            cwd=root,
+            capture_output=True,
+            timeout=GIT_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode("utf-8", errors="surrogateescape")
+
+
+def git_root(path: Path) -> Optional[Path]:
+    output = run_git(path, "rev-parse", "--show-toplevel")
+    return Path(output.strip()).resolve() if output else None
+
+
+def git_head(root: Path) -> str:
+    output = run_git(root, "rev-parse", "HEAD")
+    return output.strip() if output else ""
+
+
+def blob_hash(path: Path) -> str:
+    # Same id git gives the LF-normalized file, so dirty files compare equal once committed.
+    data = path.read_bytes().replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def index_blobs(root: Path, pathspec: str) -> dict[str, str]:
+    output = run_git(root, "ls-files", "-s", "-z", "--", pathspec)
+    blobs = {}
+    for entry in (output or "").split("\0"):
+        if not entry:
+            continue
+        info, _, name = entry.partition("\t")
+        parts = info.split()
+        if len(parts) >= 3 and parts[2] == "0":
+            blobs[name] = parts[1]
+    return blobs
+
+
+def dirty_files(root: Path, pathspec: str) -> set[str]:
+    output = run_git(root, "status", "--porcelain", "-z", "--untracked-files=all", "--", pathspec)
+    dirty = set()
+    entries = iter((output or "").split("\0"))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        dirty.add(entry[3:])
+        if entry[0] in "RC":
+            # Renames and copies are followed by the source path.
+            next(entries, None)
+    return dirty
+
+
+def commit_times(root: Path, pathspec: str, revision: str) -> dict[str, int]:
+    output = run_git(root, "log", "--format=%x1e%ct", "--name-only", revision, "--", pathspec)
+    times: dict[str, int] = {}
+    for chunk in (output or "").split("\x1e"):
+        lines = [line for line in chunk.splitlines() if line.strip()]
+        if not lines:
+            continue
+        try:
+            stamp = int(lines[0])
+        except ValueError:
+            continue
+        for name in lines[1:]:
+            # git log is newest first: the first commit seen for a path is its latest.
+            times.setdefault(name, stamp)
+    return times
+
+
+def load_commit_times(root: Path, pathspec: str, head: str, previous: dict) -> dict[str, int]:
+    previous_head = previous.get("head", "") if isinstance(previous, dict) else ""
+    previous_times = previous.get("times", {}) if isinstance(previous, dict) else {}
+    if previous_head == head and isinstance(previous_times, dict):
+        return previous_times
+    if previous_head and isinstance(previous_times, dict) and run_git(
+        root, "merge-base", "--is-ancestor", previous_head, head
+    ) is not None:
+        times = dict(previous_times)
+        times.update(commit_times(root, pathspec, f"{previous_head}..{head}"))
+        return times
+    return commit_times(root, pathspec, head)
+
+
+def scan_git(posts_dir: Path, previous: dict) -> Optional[dict]:
+    root = git_root(posts_dir)
+    if root is None:
+        print("Git change detection unavailable (not a git checkout); hashing files instead.", file=sys.stderr)
+        return None
+    try:
+        pathspec = posts_dir.resolve().relative_to(root).as_posix() or "."
+    except ValueError:
+        return None
+    head = git_head(root)
+    if run_git(root, "rev-parse", "--is-shallow-repository") == "true\n":
+        print("Shallow clone: git updated dates may be wrong; fetch full history.", file=sys.stderr)
+    blobs = index_blobs(root, pathspec)
+    dirty = dirty_files(root, pathspec)
+    times = load_commit_times(root, pathspec, head, previous) if head else {}
+    return {"root": root, "head": head, "blobs": blobs, "dirty": dirty, "times": times}
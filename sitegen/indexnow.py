@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .render import write_text
+from .utils import join_url
+
+INDEXNOW_ENDPOINTS = [
+    "https://api.indexnow.org/indexnow",
+    "https://www.bing.com/indexnow",
+    "https://search.yandex.ru/indexnow",
+]
+# The protocol accepts at most 10,000 URLs per POST.
+INDEXNOW_BATCH_LIMIT = 10000
+INDEXNOW_TIMEOUT = 10
+INDEXNOW_MAX_ATTEMPTS = 8
+INDEXNOW_BACKOFF_BASE = 60
+INDEXNOW_BACKOFF_MAX = 6 * 60 * 60
+QUEUE_VERSION = 1
+QUEUE_LOCK_TIMEOUT = 30
+QUEUE_LOCK_STALE = 300
+
+
+def write_indexnow_key(output_dir: Path, key: str) -> None:
+    if not key:
+        return
+    write_text(output_dir / f"{key}.txt", key)
+
+
+def load_queue(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": QUEUE_VERSION, "endpoints": {}}
+    if not isinstance(data, dict) or data.get("version") != QUEUE_VERSION:
+        return {"version": QUEUE_VERSION, "endpoints": {}}
+    if not isinstance(data.get("endpoints"), dict):
+        data["endpoints"] = {}
+    return data
+
+
+def write_queue(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+@contextmanager
+def queue_lock(path: Path) -> Iterator[None]:
+    lock_path = path.with_name(f"{path.name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + QUEUE_LOCK_TIMEOUT
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.close(fd)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > QUEUE_LOCK_STALE:
+                    lock_path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for IndexNow queue lock: {lock_path}")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        try:
+            lock_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def enqueue_urls(path: Path, endpoints: list[str], urls: list[str], now: Optional[float] = None) -> int:
+    now = time.time() if now is None else now
+    added = 0
+    with queue_lock(path):
+        queue = load_queue(path)
+        for endpoint in endpoints:
+            pending = queue["endpoints"].setdefault(endpoint, {})
+            for url in urls:
+                if url in pending:
+                    continue
+                pending[url] = {"attempts": 0, "next_attempt": now, "queued_at": now}
+                added += 1
+        write_queue(path, queue)
+    return added
+
+
+def submit_batch(endpoint: str, site_url: str, key: str, urls: list[str], timeout: float) -> tuple[Optional[int], str]:
+    # urllib.request (and the email package behind it) is only needed when something is submitted.
+    import urllib.error
+    import urllib.request
+
+    host = site_url.split("://")[-1].split("/")[0]
+    data = {
+        "host": host,
+        "key": key,
+        "keyLocation": join_url(site_url, f"{key}.txt"),
+        "urlList": urls,
+    }
+    req = urllib.request.Request(
+        endpoint,
+        data=json.dumps(data).encode("utf-8"),
+        headers={"Content-Type": "application/json; charset=utf-8"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.getcode(), ""
+    except urllib.error.HTTPError as exc:
+        return exc.code, str(exc.reason)
+    except Exception as exc:
+        return None, str(exc)
+
+
+def backoff_delay(attempts: int) -> float:
+    return min(INDEXNOW_BACKOFF_BASE * (2 ** max(0, attempts - 1)), INDEXNOW_BACKOFF_MAX)
+
+
+def flush_queue(
+    path: Path,
+    site_url: str,
+    key: str,
+    *,
+    timeout: float = INDEXNOW_TIMEOUT,
+    workers: int = 0,
+    now: Optional[float] = None,
+) -> dict[str, int]:
+    summary = {"sent": 0, "retry": 0, "dropped": 0}
+    if not site_url or not key:
+        return summary
+    now = time.time() if now is None else now
+    with queue_lock(path):
+        queue = load_queue(path)
+    batches: list[tuple[str, list[str]]] = []
+    for endpoint, pending in queue["endpoints"].items():
+        ready = sorted(url for url, info in pending.items() if float(info.get("next_attempt", 0)) <= now)
+        for start in range(0, len(ready), INDEXNOW_BATCH_LIMIT):
+            batches.append((endpoint, ready[start : start + INDEXNOW_BATCH_LIMIT]))
+    if not batches:
+        return summary
+
+    def submit(batch: tuple[str, list[str]]) -> tuple[str, list[str], Optional[int], str]:
+        endpoint, urls = batch
+        status, reason = submit_batch(endpoint, site_url, key, urls, timeout)
+        return endpoint, urls, status, reason
+
+    max_workers = workers if workers > 0 else len(batches)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+        results = list(executor.map(submit, batches))
+
+    with queue_lock(path):
+        queue = load_queue(path)
+        for endpoint, urls, status, reason in results:
+            pending = queue["endpoints"].setdefault(endpoint, {})
+            if status is not None and 200 <= status < 300:
+                label = "Accepted" if status == 202 else "OK"
+                print(f"IndexNow notification sent to {endpoint} successfully ({label}, {len(urls)} URLs).")
+                for url in urls:
+                    pending.pop(url, None)
+                summary["sent"] += len(urls)
+                continue
+            # 400/403/422 mean the request itself is wrong (bad key, foreign host); retrying will not help.
+            permanent = status is not None and status < 500 and status != 429
+            detail = f"status {status}" if status is not None else reason
+            if permanent:
+                print(f"IndexNow endpoint {endpoint} rejected {len(urls)} URLs ({detail}); dropping them.")
+                for url in urls:
+                    pending.pop(url, None)
+                summary["dropped"] += len(urls)
+                continue
+            retried = 0
+            for url in urls:
+                info = pending.get(url)
+                if info is None:
+                    continue
+                attempts = int(info.get("attempts", 0)) + 1
+                if attempts >= INDEXNOW_MAX_ATTEMPTS:
+                    pending.pop(url, None)
+                    summary["dropped"] += 1
+                    continue
+                info["attempts"] = attempts
+                info["next_attempt"] = now + backoff_delay(attempts)
+                retried += 1
+            summary["retry"] += retried
+            print(f"Failed to notify IndexNow endpoint {endpoint} ({detail}); {retried} URLs queued for retry.")
+        queue["endpoints"] = {endpoint: pending for endpoint, pending in queue["endpoints"].items() if pending}
+        write_queue(path, queue)
+    return summary
+
+
+def spawn_flush(path: Path, site_url: str, key: str) -> None:
+    command = [sys.executable, "-m", "sitegen.indexnow", "--queue", str(path), "--site-url", site_url]
+    env = dict(os.environ)
+    # Pass the key through the environment so it does not show up in process listings.
+    env["INDEXNOW_KEY"] = key
+    kwargs: dict = {
+        "cwd": str(Path(__file__).resolve().parent.parent),
+        "env": env,
+        "stdin": subprocess.DEVNULL,
+        "stdout": subprocess.DEVNULL,
+        "stderr": subprocess.DEVNULL,
+    }
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(command, **kwargs)
+
+
+def notify_indexnow(
+    site_url: str,
+    key: str,
+    urls: list[str],
+    queue_path: Path,
+    *,
+    endpoints: Optional[list[str]] = None,
+    async_mode: bool = False,
+) -> None:
+    if not site_url or not key:
+        return
+    endpoints = endpoints or INDEXNOW_ENDPOINTS
+    try:
+        if urls:
+            enqueue_urls(queue_path, endpoints, urls)
+        if async_mode:
+            spawn_flush(queue_path, site_url, key)
+            print(f"IndexNow: submission continues in the background (queue: {queue_path}).")
+            return
+        summary = flush_queue(queue_path, site_url, key)
+    except (OSError, TimeoutError) as exc:
+        print(f"IndexNow queue unavailable: {exc}")
+        return
+    if summary["retry"]:
+        print(f"IndexNow: {summary['retry']} URLs remain queued in {queue_path}.")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Flush the pending IndexNow queue.")
+    parser.add_argument("--queue", required=True, help="Path to the IndexNow queue JSON.")
+    parser.add_argument("--site-url", required=True, help="Public site URL.")
+    parser.add_argument("--timeout", type=float, default=INDEXNOW_TIMEOUT, help="Per-request timeout in seconds.")
+    args = parser.parse_args(argv)
+    key = os.environ.get("INDEXNOW_KEY", "")
+    if not key:
+        print("INDEXNOW_KEY is not set.", file=sys.stderr)
+        sys.exit(1)
+    flush_queue(Path(args.queue), args.site_url, key, timeout=args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,20 @@
 from __future__ import annotations
 
 import datetime as dt
+import hashlib
 import math
 import html
 import json
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
 
-import markdown
-
-from .content import extract_title, normalize_list_spacing, parse_front_matter, slugify
-import json
-import urllib.request
-from .render import add_img_loading, fix_relative_img_src, render_template, strip_tags, write_text
-from .utils import iso_date, join_url, parse_bool, rfc822_date
-
-
-def notify_indexnow(site_url: str, key: str, urls: list[str]) -> None:
-    if not site_url or not key or not urls:
-        return
-    host = site_url.split("://")[-1].split("/")[0]
-    data = {
-        "host": host,
-        "key": key,
-        "keyLocation": join_url(site_url, f"{key}.txt"),
-        "urlList": urls,
-    }
-    payload = json.dumps(data).encode("utf-8")
-    endpoints = [
-        "https://api.indexnow.org/indexnow",
-        "https://www.bing.com/indexnow",
-        "https://search.yandex.ru/indexnow",
-    ]
-    for url in endpoints:
-        try:
-            req = urllib.request.Request(
-                url,
-                data=payload,
-                headers={"Content-Type": "application/json; charset=utf-8"},
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                status = resp.getcode()
-                if status == 200:
-                    print(f"IndexNow notification sent to {url} successfully (OK).")
-                elif status == 202:
-                    print(f"IndexNow notification sent to {url} successfully (Accepted).")
-                else:
-                    print(f"IndexNow notification to {url} returned status {status}.")
-        except Exception as e:
-            print(f"Failed to notify IndexNow endpoint {url}: {e}")
-
-
-def write_indexnow_key(output_dir: Path, key: str) -> None:
-    if not key:
-        return
-    write_text(output_dir / f"{key}.txt", key)
+from .cache import FragmentCache, fragment_key, hash_text
+from .content import prepare_post, slugify
+from .engines import create_engine
+from .records import Post
+from .render import render_template, write_text
+from .utils import build_time, iso_date, join_url, parse_bool, rfc822_date
 
 
 def wrap_cdata(text: str) -> str:
@@ -71,6 +30,27 @@ def build_rss_link(root: str, args: object) -> str:
     return f'<a class="rss-link" href="{root}/rss.xml">RSS</a>'
 
 
+def build_category_feed_links(root: str, category: str, args: object) -> str:
+    if not parse_bool(getattr(args, "enable_category_feeds", False)):
+        return ""
+    if not (getattr(args, "site_url", "") or "").strip():
+        return ""
+    slug = slugify(category)
+    title = html.escape(category)
+    links = []
+    if parse_bool(getattr(args, "enable_rss", False)):
+        links.append(
+            f'<link rel="alternate" type="application/rss+xml" title="{title} RSS" '
+            f'href="{root}/feeds/category/{slug}.rss.xml">'
+        )
+    if parse_bool(getattr(args, "enable_atom", False)):
+        links.append(
+            f'<link rel="alternate" type="application/atom+xml" title="{title} Atom" '
+            f'href="{root}/feeds/category/{slug}.atom.xml">'
+        )
+    return "\n  ".join(links)
+
+
 def build_category_list(category_map: dict, root: str) -> str:
     items = []
     for name, posts in sorted(category_map.items(), key=lambda x: (-len(x[1]), x[0].lower())):
@@ -82,10 +62,51 @@ def build_category_list(category_map: dict, root: str) -> str:
     return "\n".join(items) if items else "<li>No categories yet.</li>"
 
 
+def sidebar_mode(args: object) -> str:
+    mode = str(getattr(args, "sidebar_mode", "inline") or "inline").strip().lower()
+    return mode if mode in {"inline", "include"} else "inline"
+
+
+def build_category_panel(category_map: dict, root: str, mode: str = "inline") -> str:
+    if mode != "include":
+        return f'<ul class="category-list">{build_category_list(category_map, root)}</ul>'
+    # Names only, in name order: counts live in sidebar.json, so publishing a post does not change every
+    # page that shows them. Without JavaScript the list still links every category.
+    items = [
+        f'<li data-slug="{slugify(name)}"><a href="{root}/categories/{slugify(name)}.html">{html.escape(name)}</a></li>'
+        for name in sorted(category_map, key=lambda name: (name.lower(), name))
+    ]
+    body = "".join(items) or "<li>No categories yet.</li>"
+    return f'<ul class="category-list" data-sidebar-src="{root}/sidebar.json">{body}</ul>'
+
+
+def build_sidebar_data(output_dir: Path, category_map: dict) -> str:
+    categories = [
+        [name, slugify(name), len(posts)]
+        for name, posts in sorted(category_map.items(), key=lambda x: (-len(x[1]), x[0].lower()))
+    ]
+    body = json.dumps(categories, ensure_ascii=True, separators=(",", ":"))
+    fingerprint = hash_text(body)[:16]
+    text = f'{{"version":"{fingerprint}","categories":{body}}}'
+    path = output_dir / "sidebar.json"
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return fingerprint
+    except FileNotFoundError:
+        pass
+    write_text(path, text)
+    return fingerprint
+
+
 def build_sidebar(
-    category_map: dict, root: str, about_html: str, toc_html: str = "", widget_html: str = ""
+    category_map: dict,
+    root: str,
+    about_html: str,
+    toc_html: str = "",
+    widget_html: str = "",
+    mode: str = "inline",
 ) -> str:
-    categories_html = build_category_list(category_map, root)
+    categories_html = build_category_panel(category_map, root, mode)
     panels = [
         '<div class="panel">'
         "<h3>About</h3>"
@@ -109,31 +130,83 @@ def build_sidebar(
     panels.append(
         '<div class="panel">'
         "<h3>Categories</h3>"
-        f'<ul class="category-list">{categories_html}</ul>'
+        f"{categories_html}"
         "</div>"
     )
     return "".join(panels)
 
 
-def build_archive_sidebar(post: dict, archive_map: dict, root: str) -> tuple[str, bool]:
-    labels = post.get("archives") or []
+def build_archive_map(posts: list[Post]) -> dict[str, list[Post]]:
+    archive_map: dict[str, list[Post]] = {}
+    for post in posts:
+        for label in post.archives:
+            archive_map.setdefault(label, []).append(post)
+    return archive_map
+
+
+def build_archive_sidebar(post: Post, archive_map: dict, root: str, window: int = 0) -> tuple[str, bool]:
+    labels = post.archives
     if not labels:
         return "", False
     sections = []
     for label in labels:
-        related = [item for item in archive_map.get(label, []) if item["slug"] != post["slug"]]
-        if not related:
+        series = archive_map.get(label, [])
+        if window <= 0:
+            related = [item for item in series if item.slug != post.slug]
+            if not related:
+                continue
+            rows = []
+            for item in related:
+                url = f"{root}/posts/{item.slug}.html"
+                rows.append(
+                    f'<li><a href="{url}">{html.escape(item.title)}</a>'
+                    f'<span class="archive-date">{item.date}</span></li>'
+                )
+            sections.append(
+                f'<div class="sidebar-archive-group"><h4>{html.escape(label)}</h4>'
+                f'<ul class="sidebar-archive-list">{"".join(rows)}</ul></div>'
+            )
             continue
+        if len(series) < 2:
+            continue
+        # Series lists are newest first; the position counts from the oldest entry so it stays
+        # stable as the series grows.
+        idx = next((i for i, item in enumerate(series) if item.slug == post.slug), 0)
+        position = len(series) - idx
         rows = []
-        for item in related:
-            url = f"{root}/posts/{item['slug']}.html"
-            rows.append(
-                f'<li><a href="{url}">{html.escape(item["title"])}</a>'
-                f'<span class="archive-date">{item["date"]}</span></li>'
+        for item in series[max(0, idx - window) : idx + window + 1]:
+            url = f"{root}/posts/{item.slug}.html"
+            if item.slug == post.slug:
+                rows.append(
+                    f'<li class="is-current"><span>{html.escape(item.title)}</span>'
+                    f'<span class="archive-date">{item.date}</span></li>'
+                )
+            else:
+                rows.append(
+                    f'<li><a href="{url}">{html.escape(item.title)}</a>'
+                    f'<span class="archive-date">{item.date}</span></li>'
+                )
+        nav = []
+        if idx + 1 < len(series):
+            older = series[idx + 1]
+            nav.append(f'<a rel="prev" href="{root}/posts/{older.slug}.html">&larr; Older</a>')
+        if idx > 0:
+            newer = series[idx - 1]
+            nav.append(f'<a rel="next" href="{root}/posts/{newer.slug}.html">Newer &rarr;</a>')
+        more = ""
+        if len(series) > 2 * window + 1:
+            more = (
+                '<button class="sidebar-series-more" type="button" '
+                f'data-series-src="{root}/archive/series/{slugify(label)}.json">Show all</button>'
             )
         sections.append(
-            f'<div class="sidebar-archive-group"><h4>{html.escape(label)}</h4>'
-            f'<ul class="sidebar-archive-list">{"".join(rows)}</ul></div>'
+            f'<div class="sidebar-archive-group" data-series>'
+            f'<h4>{html.escape(label)}</h4>'
+            f'<p class="sidebar-series-position">Part {position}</p>'
+            f'<ul class="sidebar-archive-list">{"".join(rows)}</ul>'
+            f'<div class="sidebar-series-nav">{"".join(nav)}</div>'
+            f"{more}"
+            "</div>"
         )
     if not sections:
         return '<p class="sidebar-empty">No other posts in this archive yet.</p>', True
@@ -167,11 +240,13 @@ def build_post_sidebar(
     root: str,
     about_html: str,
     toc_html: str,
-    post: dict,
+    post: Post,
     archive_map: dict,
     widget_html: str,
+    series_window: int = 0,
+    mode: str = "inline",
 ) -> str:
-    categories_html = build_category_list(category_map, root)
+    categories_html = build_category_panel(category_map, root, mode)
     panels = [
         '<div class="panel">'
         "<h3>About</h3>"
@@ -188,10 +263,10 @@ def build_post_sidebar(
     sections = []
     if toc_html and "<li" in toc_html:
         sections.append(("contents", "Contents", toc_html))
-    archive_html, has_archive = build_archive_sidebar(post, archive_map, root)
+    archive_html, has_archive = build_archive_sidebar(post, archive_map, root, series_window)
     if has_archive:
         sections.append(("archive", "Archive", archive_html))
-    sections.append(("categories", "Categories", f'<ul class="category-list">{categories_html}</ul>'))
+    sections.append(("categories", "Categories", categories_html))
     if len(sections) == 1:
         tab_id, label, body = sections[0]
         panels.append(
@@ -205,30 +280,49 @@ def build_post_sidebar(
     return "".join(panels)
 
 
-def build_post_cards(posts: list[dict], root: str) -> str:
+def post_body(post: Post) -> tuple[str, str]:
+    # Posts restored from the metadata catalog (or spilled in low-memory builds) carry a loader
+    # instead of their rendered body. The loader may be called from several builders at once.
+    if post.content is not None:
+        return post.content, post.toc
+    body = post.load_body()
+    return body["content"], body.get("toc", "")
+
+
+def render_post_card(post: Post, root: str) -> str:
+    title = html.escape(post.title)
+    summary = html.escape(post.summary)
+    url = f"{root}/posts/{post.slug}.html"
+    word_count = post.words
+    category_links = " ".join(
+        f'<a class="chip" href="{root}/categories/{slugify(cat)}.html">{html.escape(cat)}</a>'
+        for cat in post.categories
+    )
+    return (
+        '<div class="post-meta"><div class="post-meta-left">'
+        f'<span class="post-date">{post.date}</span>'
+        f'<span class="post-words">{word_count} words</span>'
+        "</div>"
+        f'<div class="post-tags">{category_links}</div></div>'
+        f'<h2 class="post-title"><a href="{url}">{title}</a></h2>'
+        f'<p class="post-summary">{summary}</p>'
+        f'<a class="post-more" href="{url}">Read more</a>'
+    )
+
+
+def card_key(post: Post, root: str) -> str:
+    return fragment_key("card", post.hash, post.links, post.slug, post.date, post.words, root)
+
+
+def build_post_cards(posts: list[Post], root: str, fragments: Optional[FragmentCache] = None) -> str:
     cards = []
     for idx, post in enumerate(posts):
         delay = min(idx * 0.05, 0.3)
-        title = html.escape(post["title"])
-        summary = html.escape(post["summary"])
-        url = f"{root}/posts/{post['slug']}.html"
-        word_count = post.get("words", 0)
-        category_links = " ".join(
-            f'<a class="chip" href="{root}/categories/{slugify(cat)}.html">{html.escape(cat)}</a>'
-            for cat in post["categories"]
-        )
-        cards.append(
-            f'<article class="post-card" style="animation-delay: {delay:.2f}s">'
-            '<div class="post-meta"><div class="post-meta-left">'
-            f'<span class="post-date">{post["date"]}</span>'
-            f'<span class="post-words">{word_count} words</span>'
-            "</div>"
-            f'<div class="post-tags">{category_links}</div></div>'
-            f'<h2 class="post-title"><a href="{url}">{title}</a></h2>'
-            f'<p class="post-summary">{summary}</p>'
-            f'<a class="post-more" href="{url}">Read more</a>'
-            "</article>"
-        )
+        if fragments is None:
+            body = render_post_card(post, root)
+        else:
+            body = fragments.get_or_render("card", card_key(post, root), lambda post=post: render_post_card(post, root))
+        cards.append(f'<article class="post-card" style="animation-delay: {delay:.2f}s">{body}</article>')
     return "\n".join(cards)
 
 
@@ -246,10 +340,70 @@ def generate_seo_tags(site_name: str, title: str, description: str, url: str) ->
     return "\n  ".join(tags)
 
 
+def paginate_posts(posts: list[Post], per_page: int, stable: bool = False) -> list[tuple[str, list[Post]]]:
+    per_page = max(1, per_page)
+    if not stable:
+        total_pages = max(1, math.ceil(len(posts) / per_page))
+        return [
+            ("index.html" if page == 1 else f"page-{page}.html", posts[(page - 1) * per_page : page * per_page])
+            for page in range(1, total_pages + 1)
+        ]
+    # Stable mode numbers archived pages from the oldest post, so page-N keeps the same
+    # slice as new posts arrive; the home page absorbs the remainder (per_page..2*per_page-1).
+    archived = max(0, len(posts) // per_page - 1)
+    head = len(posts) - archived * per_page
+    pages = [("index.html", posts[:head])]
+    for chunk in range(archived, 0, -1):
+        start = head + (archived - chunk) * per_page
+        pages.append((f"page-{chunk}.html", posts[start : start + per_page]))
+    return pages
+
+
+def pagination_label(filename: str, position: int, stable: bool) -> str:
+    if not stable:
+        return str(position)
+    if filename == "index.html":
+        return "Latest"
+    return filename[len("page-") : -len(".html")]
+
+
+def build_pagination(pages: list[tuple[str, str]], current: int, window: int = 0, root: str = ".") -> str:
+    total_pages = len(pages)
+    if total_pages <= 1:
+        return ""
+    items = []
+    if current > 0:
+        items.append(f'<a class="page-link" href="{root}/{pages[current - 1][0]}">Previous</a>')
+    else:
+        items.append('<span class="page-link is-disabled">Previous</span>')
+    if window > 0:
+        shown = {0, total_pages - 1}
+        shown.update(range(max(0, current - window), min(total_pages, current + window + 1)))
+    else:
+        shown = set(range(total_pages))
+    numbers = []
+    last = -1
+    for idx in sorted(shown):
+        if idx - last > 1:
+            numbers.append('<span class="page-ellipsis">&hellip;</span>')
+        url, label = pages[idx]
+        if idx == current:
+            numbers.append(f'<span class="page-number is-active">{label}</span>')
+        else:
+            numbers.append(f'<a class="page-number" href="{root}/{url}">{label}</a>')
+        last = idx
+    items.append(f'<div class="page-numbers">{"".join(numbers)}</div>')
+    if current < total_pages - 1:
+        items.append(f'<a class="page-link" href="{root}/{pages[current + 1][0]}">Next</a>')
+    else:
+        items.append('<span class="page-link is-disabled">Next</span>')
+    return f'<nav class="pagination">{"".join(items)}</nav>'
+
+
 def build_index(
     base_template: str,
     output_dir: Path,
-    posts: list[dict],
+    posts: list[Post],
     category_map: dict,
     args: object,
     analytics_html: str,
@@ -257,64 +411,60 @@ def build_index(
     widget_html: str,
     theme_toggle: str,
     theme_default: str,
-) -> int:
-    def page_url(page: int) -> str:
-        if page == 1:
-            return "index.html"
-        return f"page-{page}.html"
-
-    def build_pagination(page: int, total_pages: int) -> str:
-        if total_pages <= 1:
-            return ""
-        items = []
-        prev_url = page_url(page - 1) if page > 1 else ""
-        next_url = page_url(page + 1) if page < total_pages else ""
-        if prev_url:
-            items.append(f'<a class="page-link" href="./{prev_url}">Previous</a>')
-        else:
-            items.append('<span class="page-link is-disabled">Previous</span>')
-        numbers = []
-        for num in range(1, total_pages + 1):
-            if num == page:
-                numbers.append(f'<span class="page-number is-active">{num}</span>')
-            else:
-                numbers.append(f'<a class="page-number" href="./{page_url(num)}">{num}</a>')
-        items.append(f'<div class="page-numbers">{"".join(numbers)}</div>')
-        if next_url:
-            items.append(f'<a class="page-link" href="./{next_url}">Next</a>')
-        else:
-            items.append('<span class="page-link is-disabled">Next</span>')
-        return f'<nav class="pagination">{"".join(items)}</nav>'
-
+    previous_pages: Optional[dict] = None,
+    force: bool = False,
+    fragments: Optional[FragmentCache] = None,
+) -> dict[str, str]:
     root = "."
     rss_link = build_rss_link(root, args)
-    sidebar = build_sidebar(category_map, root, about_html, widget_html=widget_html)
+    sidebar = build_sidebar(category_map, root, about_html, widget_html=widget_html, mode=sidebar_mode(args))
+    sidebar_hash = hash_text(sidebar)
     site_name = html.escape(args.site_name)
     site_description = html.escape(args.site_description)
     site_url = (getattr(args, "site_url", "") or "").strip()
     per_page = max(1, int(getattr(args, "posts_per_page", 8)))
-    total_pages = max(1, math.ceil(len(posts) / per_page))
+    stable = (getattr(args, "pagination_mode", "") or "").strip().lower() == "stable"
+    window = max(0, int(getattr(args, "pagination_window", 0) or 0))
+    year = str(build_time().year)
+    previous_pages = previous_pages or {}
+    pages = paginate_posts(posts, per_page, stable)
+    links = [
+        (filename, pagination_label(filename, position, stable))
+        for position, (filename, _) in enumerate(pages, start=1)
+    ]
 
-    for page in range(1, total_pages + 1):
-        start = (page - 1) * per_page
-        page_posts = posts[start : start + per_page]
+    page_state: dict[str, str] = {}
+    for idx, (filename, page_posts) in enumerate(pages):
+        pagination = build_pagination(links, idx, window)
+        page_title = f"{args.site_name} | Home"
+        if idx > 0:
+            page_title = f"{args.site_name} | Page {links[idx][1]}"
+        current_page_url = join_url(site_url, filename) if site_url else ""
+        signature = hash_text(
+            "\n".join(
+                [
+                    sidebar_hash,
+                    pagination,
+                    page_title,
+                    current_page_url,
+                    year,
+                    *(card_key(post, root) for post in page_posts),
+                ]
+            )
+        )
+        page_state[filename] = signature
+        if not force and previous_pages.get(filename) == signature and (output_dir / filename).exists():
+            continue
         content = (
             '<div class="section-head">'
             "<h2>Latest posts</h2>"
             "<p>Fresh notes generated from your Markdown folder.</p>"
             "</div>"
-            f'<div class="post-grid">{build_post_cards(page_posts, root)}</div>'
-            f"{build_pagination(page, total_pages)}"
+            f'<div class="post-grid">{build_post_cards(page_posts, root, fragments)}</div>'
+            f"{pagination}"
         )
-        page_title = f"{args.site_name} | Home"
-        current_page_url = ""
-        if site_url:
-            current_page_url = join_url(site_url, "index.html" if page == 1 else page_url(page))
-        if page > 1:
-            page_title = f"{args.site_name} | Page {page}"
-        
         seo_tags = generate_seo_tags(args.site_name, page_title, args.site_description, current_page_url)
-        
+
         html_doc = render_template(
             base_template,
             title=html.escape(page_title),
@@ -323,7 +473,7 @@ def build_index(
             sidebar=sidebar,
             site_name=site_name,
             site_description=site_description,
-            year=str(dt.datetime.now().year),
+            year=year,
             extra_head="",
             theme_toggle=theme_toggle,
             theme_default=theme_default,
@@ -331,16 +481,27 @@ def build_index(
             analytics=analytics_html,
             seo_tags=seo_tags,
         )
-        filename = "index.html" if page == 1 else page_url(page)
         write_text(output_dir / filename, html_doc)
 
-    return total_pages
+    for filename in previous_pages:
+        if filename in page_state or not filename.startswith("page-"):
+            continue
+        try:
+            (output_dir / Path(filename).name).unlink()
+        except FileNotFoundError:
+            pass
+    return page_state
+
+
+def post_is_stale(post: Post, stale_days: int, now: dt.datetime) -> bool:
+    updated_dt = post.updated_dt
+    return bool(stale_days > 0 and updated_dt and now - updated_dt > dt.timedelta(days=stale_days))
 
 
 def build_posts(
     base_template: str,
     output_dir: Path,
-    posts: list[dict],
+    posts: list[Post],
     category_map: dict,
     args: object,
     analytics_html: str,
@@ -350,34 +511,38 @@ def build_posts(
     theme_default: str,
     only_slugs=None,
     workers: int = 1,
+    now: Optional[dt.datetime] = None,
 ) -> None:
     root = ".."
+    now = now or build_time()
+    client_stale = str(getattr(args, "stale_mode", "build")).strip().lower() == "client"
     rss_link = build_rss_link(root, args)
     site_name = html.escape(args.site_name)
     site_description = html.escape(args.site_description)
     site_url = (getattr(args, "site_url", "") or "").strip()
-    archive_map: dict[str, list[dict]] = {}
-    for post in posts:
-        for label in post.get("archives", []):
-            archive_map.setdefault(label, []).append(post)
+    archive_map = build_archive_map(posts)
+    series_window = max(0, int(getattr(args, "series_window", 0) or 0))
     if only_slugs is None:
         posts_to_render = posts
     else:
-        posts_to_render = [post for post in posts if post["slug"] in only_slugs]
+        posts_to_render = [post for post in posts if post.slug in only_slugs]
 
-    def render_post(post: dict) -> None:
+    def render_post(post: Post) -> None:
+        content_html, toc_html = post_body(post)
         sidebar = build_post_sidebar(
             category_map,
             root,
             about_html,
-            post.get("toc", ""),
+            toc_html,
             post,
             archive_map,
             widget_html,
+            series_window,
+            sidebar_mode(args),
         )
-        title = html.escape(post["title"])
-        word_count = post.get("words", 0)
-        updated_value = post.get("updated", "")
+        title = html.escape(post.title)
+        word_count = post.words
+        updated_value = post.updated
         show_updated = parse_bool(getattr(args, "show_updated", True))
         updated_html = (
             f'<span class="post-updated">Updated {updated_value}</span>' if show_updated and updated_value else ""
@@ -386,46 +551,57 @@ def build_posts(
         stale_days = max(0, int(getattr(args, "stale_days", 0) or 0))
         stale_html = ""
         if stale_notice and stale_days > 0:
-            updated_dt = post.get("updated_dt")
-            if updated_dt and dt.datetime.now() - updated_dt > dt.timedelta(days=stale_days):
+            updated_dt = post.updated_dt
+            if client_stale and updated_dt:
+                stale_html = (
+                    f'<div class="stale-warning" data-stale-updated="{updated_dt.replace(microsecond=0).isoformat()}" '
+                    f'data-stale-days="{stale_days}" hidden>{html.escape(stale_notice)}</div>'
+                )
+            elif post_is_stale(post, stale_days, now):
                 stale_html = f'<div class="stale-warning">{html.escape(stale_notice)}</div>'
         category_links = " ".join(
             f'<a class="chip" href="{root}/categories/{slugify(cat)}.html">{html.escape(cat)}</a>'
-            for cat in post["categories"]
+            for cat in post.categories
         )
         content = (
             '<article class="post">'
             '<div class="post-meta"><div class="post-meta-left">'
-            f'<span class="post-date">{post["date"]}</span>'
+            f'<span class="post-date">{post.date}</span>'
             f"{updated_html}"
             f'<span class="post-words">{word_count} words</span>'
             "</div>"
             f'<div class="post-tags">{category_links}</div></div>'
             f'<h1 class="post-title">{title}</h1>'
             f"{stale_html}"
-            f'<div class="post-body">{post["content"]}</div>'
+            f'<div class="post-body">{content_html}</div>'
             f'<div class="post-footer"><a href="{root}/index.html">Back to home</a></div>'
             "</article>"
         )
-        post_url = join_url(site_url, f"posts/{post['slug']}.html") if site_url else ""
-        seo_tags = generate_seo_tags(args.site_name, post["title"], post["summary"], post_url)
+        extra_head = (
+            f'<script src="{root}/js/sidebar-tabs.js" defer></script>\n'
+            f'  <script src="{root}/js/series.js" defer></script>'
+        )
+        if client_stale and stale_html:
+            extra_head += f'\n  <script src="{root}/js/stale-notice.js" defer></script>'
+        post_url = join_url(site_url, f"posts/{post.slug}.html") if site_url else ""
+        seo_tags = generate_seo_tags(args.site_name, post.title, post.summary, post_url)
         html_doc = render_template(
             base_template,
-            title=html.escape(f"{post['title']} | {args.site_name}"),
+            title=html.escape(f"{post.title} | {args.site_name}"),
             root=root,
             content=content,
             sidebar=sidebar,
             site_name=site_name,
             site_description=site_description,
-            year=str(dt.datetime.now().year),
-            extra_head=f'<script src="{root}/js/sidebar-tabs.js" defer></script>',
+            year=str(now.year),
+            extra_head=extra_head,
             theme_toggle=theme_toggle,
             theme_default=theme_default,
             rss_link=rss_link,
             analytics=analytics_html,
             seo_tags=seo_tags,
         )
-        write_text(output_dir / "posts" / f"{post['slug']}.html", html_doc)
+        write_text(output_dir / "posts" / f"{post.slug}.html", html_doc)
 
     workers = max(1, int(workers or 1))
     if workers <= 1 or len(posts_to_render) <= 1:
@@ -437,6 +613,17 @@ def build_posts(
             list(executor.map(render_post, posts_to_render))
 
 
+def category_pages(
+    category: str, posts: list[Post], per_page: int, stable: bool = False
+) -> list[tuple[str, list[Post]]]:
+    slug = slugify(category)
+    pages = []
+    for filename, page_posts in paginate_posts(posts, per_page, stable):
+        path = f"categories/{slug}.html" if filename == "index.html" else f"categories/{slug}/{filename}"
+        pages.append((path, page_posts))
+    return pages
+
+
 def build_categories(
     base_template: str,
     output_dir: Path,
@@ -447,47 +634,103 @@ def build_categories(
     widget_html: str,
     theme_toggle: str,
     theme_default: str,
-) -> None:
-    root = ".."
-    rss_link = build_rss_link(root, args)
-    sidebar = build_sidebar(category_map, root, about_html, widget_html=widget_html)
+    previous_pages: Optional[dict] = None,
+    force: bool = False,
+    fragments: Optional[FragmentCache] = None,
+) -> dict[str, str]:
+    rss_link = build_rss_link("..", args)
+    sidebar = build_sidebar(category_map, "..", about_html, widget_html=widget_html, mode=sidebar_mode(args))
+    nested_rss_link = build_rss_link("../..", args)
+    nested_sidebar = build_sidebar(category_map, "../..", about_html, widget_html=widget_html, mode=sidebar_mode(args))
+    sidebar_hash = hash_text(sidebar + nested_sidebar)
     site_name = html.escape(args.site_name)
     site_description = html.escape(args.site_description)
     site_url = (getattr(args, "site_url", "") or "").strip()
+    per_page = max(1, int(getattr(args, "posts_per_page", 8)))
+    stable = (getattr(args, "pagination_mode", "") or "").strip().lower() == "stable"
+    window = max(0, int(getattr(args, "pagination_window", 0) or 0))
+    year = str(build_time().year)
+    previous_pages = previous_pages or {}
+    page_state: dict[str, str] = {}
     for category, posts in sorted(category_map.items(), key=lambda x: x[0].lower()):
-        content = (
-            '<div class="section-head">'
-            f"<h2>{html.escape(category)}</h2>"
-            "<p>Posts grouped in this category.</p>"
-            "</div>"
-            f'<div class="post-grid">{build_post_cards(posts, root)}</div>'
-        )
-        page_title = f"{category} | {args.site_name}"
-        category_url = join_url(site_url, f"categories/{slugify(category)}.html") if site_url else ""
-        seo_tags = generate_seo_tags(args.site_name, page_title, args.site_description, category_url)
-        html_doc = render_template(
-            base_template,
-            title=html.escape(page_title),
-            root=root,
-            content=content,
-            sidebar=sidebar,
-            site_name=site_name,
-            site_description=site_description,
-            year=str(dt.datetime.now().year),
-            extra_head="",
-            theme_toggle=theme_toggle,
-            theme_default=theme_default,
-            rss_link=rss_link,
-            analytics=analytics_html,
-            seo_tags=seo_tags,
-        )
-        write_text(output_dir / "categories" / f"{slugify(category)}.html", html_doc)
+        pages = category_pages(category, posts, per_page, stable)
+        links = [
+            (path, pagination_label(Path(path).name if idx else "index.html", idx + 1, stable))
+            for idx, (path, _) in enumerate(pages)
+        ]
+        for idx, (path, page_posts) in enumerate(pages):
+            root = ".." if idx == 0 else "../.."
+            pagination = build_pagination(links, idx, window, root)
+            page_title = f"{category} | {args.site_name}"
+            if idx > 0:
+                page_title = f"{category} | Page {links[idx][1]} | {args.site_name}"
+            category_url = join_url(site_url, path) if site_url else ""
+            signature = hash_text(
+                "\n".join(
+                    [
+                        sidebar_hash,
+                        pagination,
+                        page_title,
+                        category_url,
+                        year,
+                        *(card_key(post, root) for post in page_posts),
+                    ]
+                )
+            )
+            page_state[path] = signature
+            if not force and previous_pages.get(path) == signature and (output_dir / path).exists():
+                continue
+            content = (
+                '<div class="section-head">'
+                f"<h2>{html.escape(category)}</h2>"
+                "<p>Posts grouped in this category.</p>"
+                "</div>"
+                f'<div class="post-grid">{build_post_cards(page_posts, root, fragments)}</div>'
+                f"{pagination}"
+            )
+            seo_tags = generate_seo_tags(args.site_name, page_title, args.site_description, category_url)
+            html_doc = render_template(
+                base_template,
+                title=html.escape(page_title),
+                root=root,
+                content=content,
+                sidebar=sidebar if idx == 0 else nested_sidebar,
+                site_name=site_name,
+                site_description=site_description,
+                year=year,
+                extra_head=build_category_feed_links(root, category, args),
+                theme_toggle=theme_toggle,
+                theme_default=theme_default,
+                rss_link=rss_link if idx == 0 else nested_rss_link,
+                analytics=analytics_html,
+                seo_tags=seo_tags,
+            )
+            write_text(output_dir / path, html_doc)
+
+    for path in previous_pages:
+        if path in page_state:
+            continue
+        rel = Path(path)
+        if rel.is_absolute() or ".." in rel.parts or rel.parts[:1] != ("categories",):
+            continue
+        target = output_dir / rel
+        try:
+            target.unlink()
+        except FileNotFoundError:
+            pass
+        parent = target.parent
+        if parent != output_dir / "categories":
+            try:
+                parent.rmdir()
+            except OSError:
+                pass
+    return page_state
 
 
 def build_search(
     base_template: str,
     output_dir: Path,
-    posts: list[dict],
+    posts: list[Post],
     category_map: dict,
     args: object,
     analytics_html: str,
@@ -498,7 +741,7 @@ def build_search(
 ) -> None:
     root = "."
     rss_link = build_rss_link(root, args)
-    sidebar = build_sidebar(category_map, root, about_html, widget_html=widget_html)
+    sidebar = build_sidebar(category_map, root, about_html, widget_html=widget_html, mode=sidebar_mode(args))
     site_name = html.escape(args.site_name)
     site_description = html.escape(args.site_description)
     site_url = (getattr(args, "site_url", "") or "").strip()
@@ -525,7 +768,7 @@ def build_search(
         sidebar=sidebar,
         site_name=site_name,
         site_description=site_description,
-        year=str(dt.datetime.now().year),
+        year=str(build_time().year),
         extra_head=extra_head,
         theme_toggle=theme_toggle,
         theme_default=theme_default,
@@ -536,16 +779,17 @@ def build_search(
     write_text(output_dir / "search.html", html_doc)
 
 
-def build_search_index(output_dir: Path, posts: list[dict]) -> None:
+def build_search_index(output_dir: Path, posts: list[Post]) -> None:
     index = []
     for post in posts:
         index.append(
             {
-                "title": post["title"],
-                "url": f"posts/{post['slug']}.html",
-                "summary": post["summary"],
-                "date": post["date"],
-                "categories": [{"name": cat, "slug": slugify(cat)} for cat in post["categories"]],
+                "title": post.title,
+                "url": f"posts/{post.slug}.html",
+                "summary": post.summary,
+                "terms": post.terms,
+                "date": post.date,
+                "categories": [{"name": cat, "slug": slugify(cat)} for cat in post.categories],
             }
         )
     write_text(output_dir / "search-index.json", json.dumps(index, indent=2, ensure_ascii=True))
@@ -566,22 +810,12 @@ def build_about(
     if not about_path.exists():
         return
     raw_text = about_path.read_text(encoding="utf-8")
-    meta, body = parse_front_matter(raw_text)
-    title, body = extract_title(meta, body)
-    body = normalize_list_spacing(body)
-    md = markdown.Markdown(
-        extensions=["fenced_code", "tables", "toc", "codehilite"],
-        extension_configs={
-            "toc": {"toc_depth": args.toc_depth},
-            "codehilite": {"guess_lang": False},
-        },
-    )
-    html_content = md.convert(body)
-    toc_html = md.toc
-    md.reset()
-    html_content = fix_relative_img_src(html_content, ".")
-    html_content = add_img_loading(html_content)
-    sidebar = build_sidebar(category_map, ".", about_html, toc_html, widget_html)
+    meta, title, body = prepare_post(raw_text)
+    engine = create_engine(getattr(args, "markdown_engine", ""), Path.cwd(), args.toc_depth, root=".")
+    rendered = engine.render(body, about_path.parent)
+    html_content = rendered["content"]
+    toc_html = rendered["toc"]
+    sidebar = build_sidebar(category_map, ".", about_html, toc_html, widget_html, mode=sidebar_mode(args))
     rss_link = build_rss_link(".", args)
     site_url = (getattr(args, "site_url", "") or "").strip()
     content = (
@@ -601,7 +835,7 @@ def build_about(
         sidebar=sidebar,
         site_name=html.escape(args.site_name),
         site_description=html.escape(args.site_description),
-        year=str(dt.datetime.now().year),
+        year=str(build_time().year),
         extra_head="",
         theme_toggle=theme_toggle,
         theme_default=theme_default,
@@ -612,10 +846,45 @@ def build_about(
     write_text(output_dir / "about.html", html_doc)
 
 
+def archive_year_groups(posts: list[Post]) -> dict[int, list[Post]]:
+    groups: dict[int, list[Post]] = {}
+    for post in sorted(posts, key=lambda p: p.date_dt, reverse=True):
+        groups.setdefault(post.date_dt.year, []).append(post)
+    return groups
+
+
+def archive_anchor(label: str) -> str:
+    return f"series-{slugify(label)}"
+
+
+def slug_collisions(names: Iterable[str]) -> list[tuple[str, list[str]]]:
+    # Names that share a slug would share a page and feed path, and the last one written would win.
+    groups: dict[str, list[str]] = {}
+    for name in sorted(set(names)):
+        groups.setdefault(slugify(name), []).append(name)
+    return [(slug, group) for slug, group in sorted(groups.items()) if len(group) > 1]
+
+
+def render_archive_group(title: str, items: list[Post], root: str, anchor: str = "") -> str:
+    rows = []
+    for item in items:
+        item_title = html.escape(item.title)
+        url = f'{root}/posts/{item.slug}.html'
+        rows.append(
+            f'<li><span class="archive-date">{item.date}</span>'
+            f'<a href="{url}">{item_title}</a></li>'
+        )
+    anchor_attr = f' id="{anchor}"' if anchor else ""
+    return (
+        f'<section class="archive-group"{anchor_attr}><h3>{html.escape(title)}</h3>'
+        f'<ul class="archive-list">{"".join(rows)}</ul></section>'
+    )
+
+
 def build_archive(
     base_template: str,
     output_dir: Path,
-    posts: list[dict],
+    posts: list[Post],
     category_map: dict,
     args: object,
     analytics_html: str,
@@ -623,60 +892,119 @@ def build_archive(
     widget_html: str,
     theme_toggle: str,
     theme_default: str,
-) -> None:
-    root = "."
-    rss_link = build_rss_link(root, args)
-    sidebar = build_sidebar(category_map, root, about_html, widget_html=widget_html)
+    previous_pages: Optional[dict] = None,
+    force: bool = False,
+) -> dict[str, str]:
+    rss_link = build_rss_link(".", args)
+    sidebar = build_sidebar(category_map, ".", about_html, widget_html=widget_html, mode=sidebar_mode(args))
+    nested_rss_link = build_rss_link("..", args)
+    nested_sidebar = build_sidebar(category_map, "..", about_html, widget_html=widget_html, mode=sidebar_mode(args))
+    sidebar_hash = hash_text(sidebar + nested_sidebar)
     site_url = (getattr(args, "site_url", "") or "").strip()
-    archive_groups: dict[str, list[dict]] = {}
-    date_groups: dict[str, list[dict]] = {}
-    year_counts: dict[int, int] = {}
-    for post in posts:
-        year_counts[post["date_dt"].year] = year_counts.get(post["date_dt"].year, 0) + 1
-        labels = post.get("archives") or []
-        for label in labels:
-            archive_groups.setdefault(label, []).append(post)
-        key = post["date_dt"].strftime("%Y-%m")
-        date_groups.setdefault(key, []).append(post)
+    year = str(build_time().year)
+    previous_pages = previous_pages or {}
+    page_state: dict[str, str] = {}
 
-    def render_group(title: str, items: list[dict]) -> str:
-        rows = []
-        for item in items:
-            item_title = html.escape(item["title"])
-            url = f'{root}/posts/{item["slug"]}.html'
-            rows.append(
-                f'<li><span class="archive-date">{item["date"]}</span>'
-                f'<a href="{url}">{item_title}</a></li>'
+    def unchanged(path: str, signature: str) -> bool:
+        page_state[path] = signature
+        return not force and previous_pages.get(path) == signature and (output_dir / path).exists()
+
+    def render_page(path: str, root: str, page_title: str, content: str, extra_head: str) -> None:
+        page_url = join_url(site_url, path) if site_url else ""
+        seo_tags = generate_seo_tags(args.site_name, page_title, args.site_description, page_url)
+        html_doc = render_template(
+            base_template,
+            title=html.escape(page_title),
+            root=root,
+            content=content,
+            sidebar=sidebar if root == "." else nested_sidebar,
+            site_name=html.escape(args.site_name),
+            site_description=html.escape(args.site_description),
+            year=year,
+            extra_head=extra_head,
+            theme_toggle=theme_toggle,
+            theme_default=theme_default,
+            rss_link=rss_link if root == "." else nested_rss_link,
+            analytics=analytics_html,
+            seo_tags=seo_tags,
+        )
+        write_text(output_dir / path, html_doc)
+
+    year_groups = archive_year_groups(posts)
+    years = sorted(year_groups, reverse=True)
+    for idx, group_year in enumerate(years):
+        items = year_groups[group_year]
+        path = f"archive/{group_year}.html"
+        month_groups: dict[str, list[Post]] = {}
+        for post in items:
+            month_groups.setdefault(post.date_dt.strftime("%Y-%m"), []).append(post)
+        nav = ['<nav class="pagination">']
+        if idx + 1 < len(years):
+            nav.append(f'<a class="page-link" href="./{years[idx + 1]}.html">{years[idx + 1]}</a>')
+        else:
+            nav.append('<span class="page-link is-disabled">Older</span>')
+        nav.append('<a class="page-link" href="../archive.html">All years</a>')
+        if idx > 0:
+            nav.append(f'<a class="page-link" href="./{years[idx - 1]}.html">{years[idx - 1]}</a>')
+        else:
+            nav.append('<span class="page-link is-disabled">Newer</span>')
+        nav.append("</nav>")
+        nav_html = "".join(nav)
+        signature = hash_text(
+            "\n".join(
+                [sidebar_hash, nav_html, year, *(f"{p.slug}\0{p.title}\0{p.date}" for p in items)]
             )
-        return (
-            f'<section class="archive-group"><h3>{html.escape(title)}</h3>'
-            f'<ul class="archive-list">{"".join(rows)}</ul></section>'
         )
+        if unchanged(path, signature):
+            continue
+        content = (
+            '<div class="section-head">'
+            f"<h2>Archive {group_year}</h2>"
+            f"<p>{len(items)} posts published in {group_year}.</p>"
+            "</div>"
+            f'{"".join(render_archive_group(key, group, "..") for key, group in month_groups.items())}'
+            f"{nav_html}"
+        )
+        render_page(path, "..", f"Archive {group_year} | {args.site_name}", content, "")
+
+    for label, series in build_archive_map(posts).items():
+        series_json = json.dumps(
+            {"label": label, "posts": [[post.slug, post.title, post.date] for post in series]},
+            ensure_ascii=True,
+            separators=(",", ":"),
+        )
+        path = f"archive/series/{slugify(label)}.json"
+        if not unchanged(path, hash_text(series_json)):
+            write_text(output_dir / path, series_json)
+
+    archive_index = [[post.slug, post.title, post.date] for year_key in years for post in year_groups[year_key]]
+    archive_json = json.dumps({"posts": archive_index}, ensure_ascii=True, separators=(",", ":"))
+    if not unchanged("archive.json", hash_text(archive_json)):
+        write_text(output_dir / "archive.json", archive_json)
 
+    archive_groups: dict[str, list[Post]] = {}
+    for post in posts:
+        for label in post.archives:
+            archive_groups.setdefault(label, []).append(post)
     archive_sections: list[str] = []
     for label, items in sorted(
         archive_groups.items(),
-        key=lambda x: max((p["date_dt"] for p in x[1]), default=dt.datetime.min),
+        key=lambda x: max((p.date_dt for p in x[1]), default=dt.datetime.min),
         reverse=True,
     ):
-        items.sort(key=lambda p: p["date_dt"], reverse=True)
-        archive_sections.append(render_group(label, items))
+        items.sort(key=lambda p: p.date_dt, reverse=True)
+        archive_sections.append(render_archive_group(label, items, ".", anchor=archive_anchor(label)))
 
     if not archive_sections:
         archive_sections.append('<p class="archive-empty">No archive groups yet.</p>')
 
-    time_sections: list[str] = []
-    for key, items in sorted(date_groups.items(), key=lambda x: x[0], reverse=True):
-        items.sort(key=lambda p: p["date_dt"], reverse=True)
-        time_sections.append(render_group(key, items))
-
     year_rows = []
-    for year, count in sorted(year_counts.items(), key=lambda x: x[0], reverse=True):
+    for year_key in years:
         year_rows.append(
-            f'<li><span class="archive-year">{year}</span>'
-            f'<span class="archive-count">{count}</span></li>'
+            f'<li><a class="archive-year" href="./archive/{year_key}.html">{year_key}</a>'
+            f'<span class="archive-count">{len(year_groups[year_key])}</span></li>'
         )
-    total_words = sum(post.get("words", 0) for post in posts)
+    total_words = sum(post.words for post in posts)
     stats_html = (
         '<div class="archive-stats">'
         f'<div class="archive-total">Total {len(posts)} posts</div>'
@@ -694,13 +1022,15 @@ def build_archive(
         '<button class="archive-toggle" type="button" data-view="time">By date</button>'
         "</div>"
     )
+    # The date view is filled from archive.json on first use; the year links are the no-JS fallback.
+    year_links = "".join(f'<li><a href="./archive/{year_key}.html">{year_key}</a></li>' for year_key in years)
     views = (
         '<div class="archive-views">'
         f'<section class="archive-view archive-view--archive is-active" data-view="archive">'
         f'{"".join(archive_sections)}'
         "</section>"
-        f'<section class="archive-view archive-view--time" data-view="time">'
-        f'{"".join(time_sections)}'
+        f'<section class="archive-view archive-view--time" data-view="time" data-src="./archive.json">'
+        f'<ul class="archive-list">{year_links}</ul>'
         "</section>"
         "</div>"
     )
@@ -713,59 +1043,113 @@ def build_archive(
         f"{controls}"
         f"{views}"
     )
-    page_title = f"Archive | {args.site_name}"
-    archive_url = join_url(site_url, "archive.html") if site_url else ""
-    seo_tags = generate_seo_tags(args.site_name, page_title, args.site_description, archive_url)
-    html_doc = render_template(
-        base_template,
-        title=html.escape(page_title),
-        root=root,
-        content=content,
-        sidebar=sidebar,
-        site_name=html.escape(args.site_name),
-        site_description=html.escape(args.site_description),
-        year=str(dt.datetime.now().year),
-        extra_head=f'<script src="{root}/js/archive.js" defer></script>',
-        theme_toggle=theme_toggle,
-        theme_default=theme_default,
-        rss_link=rss_link,
-        analytics=analytics_html,
-        seo_tags=seo_tags,
+    if not unchanged("archive.html", hash_text("\n".join([sidebar_hash, year, content]))):
+        render_page(
+            "archive.html",
+            ".",
+            f"Archive | {args.site_name}",
+            content,
+            '<script src="./js/archive.js" defer></script>',
+        )
+
+    for path in previous_pages:
+        if path in page_state:
+            continue
+        rel = Path(path)
+        if rel.is_absolute() or ".." in rel.parts or rel.parts[:1] != ("archive",):
+            continue
+        try:
+            (output_dir / rel).unlink()
+        except FileNotFoundError:
+            pass
+    return page_state
+
+
+def rss_item(post: Post, site_url: str, full_content: bool) -> str:
+    link = join_url(site_url, f"posts/{post.slug}.html")
+    content_html = wrap_cdata(post_body(post)[0]) if full_content else ""
+    content_block = f"<content:encoded>{content_html}</content:encoded>" if full_content else ""
+    return "\n".join(
+        [
+            "<item>",
+            f"<title>{html.escape(post.title)}</title>",
+            f"<link>{link}</link>",
+            f"<guid>{link}</guid>",
+            f"<pubDate>{rfc822_date(post.date_dt)}</pubDate>",
+            f"<description>{html.escape(post.summary)}</description>",
+            content_block,
+            "</item>",
+        ]
     )
-    write_text(output_dir / "archive.html", html_doc)
+
+
+def atom_entry(post: Post, site_url: str, full_content: bool) -> str:
+    link = join_url(site_url, f"posts/{post.slug}.html")
+    content_html = wrap_cdata(post_body(post)[0]) if full_content else ""
+    content_block = f'<content type="html">{content_html}</content>' if full_content else ""
+    return "\n".join(
+        [
+            "<entry>",
+            f"<title>{html.escape(post.title)}</title>",
+            f"<link href=\"{link}\" />",
+            f"<id>{link}</id>",
+            f"<updated>{iso_date(post.date_dt)}</updated>",
+            f"<summary>{html.escape(post.summary)}</summary>",
+            content_block,
+            "</entry>",
+        ]
+    )
+
+
+def feed_entry_key(kind: str, post: Post, site_url: str, full_content: bool) -> str:
+    return fragment_key(
+        kind,
+        post.hash,
+        post.links,
+        post.slug,
+        post.date_dt.isoformat(),
+        site_url,
+        int(full_content),
+    )
+
+
+def feed_entries(
+    fragments: Optional[FragmentCache],
+    kind: str,
+    posts: list[Post],
+    site_url: str,
+    full_content: bool,
+) -> list[str]:
+    render = rss_item if kind == "rss" else atom_entry
+    if fragments is None:
+        return [render(post, site_url, full_content) for post in posts]
+    entries = []
+    for post in posts:
+        key = feed_entry_key(kind, post, site_url, full_content)
+        entries.append(
+            fragments.get_or_render(kind, key, lambda post=post: render(post, site_url, full_content))
+        )
+    return entries
 
 
 def build_rss(
     output_dir: Path,
-    posts: list[dict],
+    posts: list[Post],
     site_url: str,
     args: object,
     feed_limit: int,
     full_content: bool = False,
+    *,
+    fragments: Optional[FragmentCache] = None,
+    feed_path: str = "rss.xml",
+    feed_title: str = "",
+    feed_link: str = "",
 ) -> None:
     if not site_url:
         return
     site_url = site_url.rstrip("/")
-    items = []
-    for post in posts[:feed_limit]:
-        link = join_url(site_url, f"posts/{post['slug']}.html")
-        content_html = wrap_cdata(post["content"]) if full_content else ""
-        content_block = f"<content:encoded>{content_html}</content:encoded>" if full_content else ""
-        items.append(
-            "\n".join(
-                [
-                    "<item>",
-                    f"<title>{html.escape(post['title'])}</title>",
-                    f"<link>{link}</link>",
-                    f"<guid>{link}</guid>",
-                    f"<pubDate>{rfc822_date(post['date_dt'])}</pubDate>",
-                    f"<description>{html.escape(post['summary'])}</description>",
-                    content_block,
-                    "</item>",
-                ]
-            )
-        )
-    last_build = rfc822_date(posts[0]["date_dt"]) if posts else rfc822_date(dt.datetime.utcnow())
+    items = feed_entries(fragments, "rss", posts[:feed_limit], site_url, full_content)
+    last_build = rfc822_date(posts[0].date_dt) if posts else rfc822_date(build_time())
     rss_attrs = (
         'version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"'
         if full_content
@@ -776,8 +1160,8 @@ def build_rss(
             '<?xml version="1.0" encoding="UTF-8"?>',
             f"<rss {rss_attrs}>",
             "<channel>",
-            f"<title>{html.escape(args.site_name)}</title>",
-            f"<link>{site_url}/</link>",
+            f"<title>{html.escape(feed_title or args.site_name)}</title>",
+            f"<link>{feed_link or site_url + '/'}</link>",
             f"<description>{html.escape(args.site_description)}</description>",
             f"<lastBuildDate>{last_build}</lastBuildDate>",
             "\n".join(items),
@@ -785,121 +1169,276 @@ def build_rss(
             "</rss>",
         ]
     )
-    write_text(output_dir / "rss.xml", rss)
+    write_text(output_dir / feed_path, rss)
 
 
 def build_atom(
     output_dir: Path,
-    posts: list[dict],
+    posts: list[Post],
     site_url: str,
     args: object,
     feed_limit: int,
     full_content: bool = False,
+    *,
+    fragments: Optional[FragmentCache] = None,
+    feed_path: str = "atom.xml",
+    feed_title: str = "",
+    feed_link: str = "",
 ) -> None:
     if not site_url:
         return
     site_url = site_url.rstrip("/")
-    updated = iso_date(posts[0]["date_dt"]) if posts else iso_date(dt.datetime.utcnow())
-    entries = []
-    for post in posts[:feed_limit]:
-        link = join_url(site_url, f"posts/{post['slug']}.html")
-        content_html = wrap_cdata(post["content"]) if full_content else ""
-        content_block = f'<content type="html">{content_html}</content>' if full_content else ""
-        entries.append(
-            "\n".join(
-                [
-                    "<entry>",
-                    f"<title>{html.escape(post['title'])}</title>",
-                    f"<link href=\"{link}\" />",
-                    f"<id>{link}</id>",
-                    f"<updated>{iso_date(post['date_dt'])}</updated>",
-                    f"<summary>{html.escape(post['summary'])}</summary>",
-                    content_block,
-                    "</entry>",
-                ]
-            )
-        )
+    updated = iso_date(posts[0].date_dt) if posts else iso_date(build_time())
+    entries = feed_entries(fragments, "atom", posts[:feed_limit], site_url, full_content)
     atom = "\n".join(
         [
             '<?xml version="1.0" encoding="UTF-8"?>',
             '<feed xmlns="http://www.w3.org/2005/Atom">',
-            f"<title>{html.escape(args.site_name)}</title>",
-            f"<id>{site_url}/</id>",
+            f"<title>{html.escape(feed_title or args.site_name)}</title>",
+            f"<id>{feed_link or site_url + '/'}</id>",
             f"<updated>{updated}</updated>",
-            f'<link href="{site_url}/atom.xml" rel="self" />',
-            f'<link href="{site_url}/" />',
+            f'<link href="{join_url(site_url, feed_path)}" rel="self" />',
+            f'<link href="{feed_link or site_url + "/"}" />',
             "\n".join(entries),
             "</feed>",
         ]
     )
-    write_text(output_dir / "atom.xml", atom)
+    write_text(output_dir / feed_path, atom)
 
 
-def build_sitemap(
+def build_feeds(
     output_dir: Path,
-    posts: list[dict],
+    posts: list[Post],
     category_map: dict,
     site_url: str,
-    total_pages: int,
+    args: object,
+    fragments: Optional[FragmentCache],
+    previous_feeds: dict,
+    force: bool = False,
+) -> dict[str, str]:
+    if not site_url:
+        return {}
+    site_url = site_url.rstrip("/")
+    feed_limit = int(getattr(args, "feed_limit", 20))
+    full_content = parse_bool(getattr(args, "feed_full_content", False))
+    enable_rss = parse_bool(getattr(args, "enable_rss", False))
+    enable_atom = parse_bool(getattr(args, "enable_atom", False))
+
+    # (path prefix, title, link, posts) for the site feed and every category/archive feed.
+    channels = [("", args.site_name, site_url + "/", posts)]
+    if parse_bool(getattr(args, "enable_category_feeds", False)):
+        for name, items in category_map.items():
+            slug = slugify(name)
+            channels.append(
+                (
+                    f"feeds/category/{slug}",
+                    f"{name} | {args.site_name}",
+                    join_url(site_url, f"categories/{slug}.html"),
+                    items,
+                )
+            )
+    if parse_bool(getattr(args, "enable_archive_feeds", False)):
+        for label, items in build_archive_map(posts).items():
+            channels.append(
+                (
+                    f"feeds/archive/{slugify(label)}",
+                    f"{label} | {args.site_name}",
+                    # Also the Atom feed id, so every series needs its own permanent URL.
+                    join_url(site_url, f"archive.html#{archive_anchor(label)}"),
+                    items,
+                )
+            )
+
+    feed_state: dict[str, str] = {}
+    for prefix, title, link, items in channels:
+        window = items[:feed_limit]
+        outputs = []
+        if enable_rss:
+            outputs.append(("rss", f"{prefix}.rss.xml" if prefix else "rss.xml", build_rss))
+        if enable_atom:
+            outputs.append(("atom", f"{prefix}.atom.xml" if prefix else "atom.xml", build_atom))
+        for kind, feed_path, builder in outputs:
+            keys = [feed_entry_key(kind, post, site_url, full_content) for post in window]
+            signature = hash_text(
+                "\n".join([kind, feed_path, title, link, args.site_description, *keys])
+            )
+            feed_state[feed_path] = signature
+            if not force and previous_feeds.get(feed_path) == signature and (output_dir / feed_path).exists():
+                continue
+            builder(
+                output_dir,
+                window,
+                site_url,
+                args,
+                feed_limit,
+                full_content=full_content,
+                fragments=fragments,
+                feed_path=feed_path,
+                feed_title="" if not prefix else title,
+                feed_link="" if not prefix else link,
+            )
+
+    for feed_path in previous_feeds:
+        if feed_path in feed_state:
+            continue
+        rel = Path(feed_path)
+        if rel.is_absolute() or ".." in rel.parts:
+            continue
+        try:
+            (output_dir / rel).unlink()
+        except FileNotFoundError:
+            pass
+    return feed_state
+
+
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+SITEMAP_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+SITEMAP_FOOTER = "</urlset>\n"
+
+
+def latest_update(posts: list[Post]) -> Optional[dt.datetime]:
+    return max((post.updated_dt or post.date_dt for post in posts), default=None)
+
+
+def iter_sitemap_urls(
+    posts: list[Post],
+    category_map: dict,
+    site_url: str,
+    index_pages: list[tuple[str, list[Post]]],
     *,
+    per_page: int = 8,
+    stable: bool = False,
     include_about: bool = True,
     include_rss: bool = True,
     include_atom: bool = True,
     include_404: bool = True,
-) -> None:
-    if not site_url:
-        return
-    site_url = site_url.rstrip("/")
-    urls = [(site_url + "/", None)]
+) -> Iterator[tuple[str, Optional[dt.datetime]]]:
+    latest = latest_update(posts)
+    yield site_url + "/", latest
     if include_about:
-        urls.append((join_url(site_url, "about.html"), None))
-    urls.append((join_url(site_url, "archive.html"), None))
-    urls.append((join_url(site_url, "search.html"), None))
+        yield join_url(site_url, "about.html"), None
+    yield join_url(site_url, "archive.html"), latest
+    yield join_url(site_url, "search.html"), latest
     if include_rss:
-        urls.append((join_url(site_url, "rss.xml"), None))
+        yield join_url(site_url, "rss.xml"), latest
     if include_atom:
-        urls.append((join_url(site_url, "atom.xml"), None))
+        yield join_url(site_url, "atom.xml"), latest
     if include_404:
-        urls.append((join_url(site_url, "404.html"), None))
-    if total_pages > 1:
-        for page in range(2, total_pages + 1):
-            urls.append((join_url(site_url, f"page-{page}.html"), None))
+        yield join_url(site_url, "404.html"), None
+    for filename, page_posts in index_pages[1:]:
+        yield join_url(site_url, filename), latest_update(page_posts)
     for post in posts:
-        urls.append((join_url(site_url, f"posts/{post['slug']}.html"), post["date_dt"]))
-    for category in category_map.keys():
-        urls.append((join_url(site_url, f"categories/{slugify(category)}.html"), None))
-    items = []
+        yield join_url(site_url, f"posts/{post.slug}.html"), post.updated_dt or post.date_dt
+    for group_year, items in archive_year_groups(posts).items():
+        yield join_url(site_url, f"archive/{group_year}.html"), latest_update(items)
+    for category, items in category_map.items():
+        for path, page_posts in category_pages(category, items, per_page, stable):
+            yield join_url(site_url, path), latest_update(page_posts)
+
+
+def sitemap_entry(url: str, lastmod: Optional[dt.datetime]) -> str:
+    if lastmod:
+        return f"<url>\n<loc>{html.escape(url)}</loc>\n<lastmod>{lastmod.date().isoformat()}</lastmod>\n</url>\n"
+    return f"<url>\n<loc>{html.escape(url)}</loc>\n</url>\n"
+
+
+def plan_sitemap_chunks(
+    urls: Iterable[tuple[str, Optional[dt.datetime]]], max_urls: int, max_bytes: int
+) -> list[dict]:
+    overhead = len(SITEMAP_HEADER.encode("utf-8")) + len(SITEMAP_FOOTER.encode("utf-8"))
+    chunks: list[dict] = []
+    current = None
     for url, lastmod in urls:
-        if lastmod:
-            items.append(
-                "\n".join(
-                    [
-                        "<url>",
-                        f"<loc>{url}</loc>",
-                        f"<lastmod>{lastmod.date().isoformat()}</lastmod>",
-                        "</url>",
-                    ]
-                )
-            )
-        else:
-            items.append(
-                "\n".join(
-                    [
-                        "<url>",
-                        f"<loc>{url}</loc>",
-                        "</url>",
-                    ]
-                )
-            )
-    sitemap = "\n".join(
+        size = len(sitemap_entry(url, lastmod).encode("utf-8"))
+        if current is None or current["count"] >= max_urls or current["bytes"] + size > max_bytes:
+            current = {"count": 0, "bytes": overhead, "digest": hashlib.sha256(), "lastmod": None}
+            chunks.append(current)
+        current["count"] += 1
+        current["bytes"] += size
+        current["digest"].update(f"{url}\0{lastmod.date().isoformat() if lastmod else ''}\n".encode("utf-8"))
+        if lastmod and (current["lastmod"] is None or lastmod > current["lastmod"]):
+            current["lastmod"] = lastmod
+    for chunk in chunks:
+        chunk["digest"] = chunk["digest"].hexdigest()
+    return chunks
+
+
+def build_sitemap(
+    output_dir: Path,
+    urls: Callable[[], Iterable[tuple[str, Optional[dt.datetime]]]],
+    site_url: str,
+    previous: dict,
+    *,
+    max_urls: int = SITEMAP_MAX_URLS,
+    max_bytes: int = SITEMAP_MAX_BYTES,
+    force: bool = False,
+) -> dict:
+    if not site_url:
+        return {}
+    site_url = site_url.rstrip("/")
+    max_urls = max(1, min(int(max_urls), SITEMAP_MAX_URLS))
+    max_bytes = max(1024, min(int(max_bytes), SITEMAP_MAX_BYTES))
+    chunks = plan_sitemap_chunks(urls(), max_urls, max_bytes)
+    previous_chunks = previous.get("chunks", []) if isinstance(previous, dict) else []
+    stale = set()
+    for number, chunk in enumerate(chunks, start=1):
+        prev_digest = previous_chunks[number - 1] if number <= len(previous_chunks) else ""
+        if force or prev_digest != chunk["digest"] or not (output_dir / f"sitemap-{number}.xml").exists():
+            stale.add(number)
+
+    if stale:
+        handle = None
+        number = 0
+        remaining = 0
+        for url, lastmod in urls():
+            if remaining == 0:
+                if handle is not None:
+                    handle.write(SITEMAP_FOOTER)
+                    handle.close()
+                    handle = None
+                number += 1
+                remaining = chunks[number - 1]["count"]
+                if number in stale:
+                    handle = open(output_dir / f"sitemap-{number}.xml", "w", encoding="utf-8", newline="\n")
+                    handle.write(SITEMAP_HEADER)
+            if handle is not None:
+                handle.write(sitemap_entry(url, lastmod))
+            remaining -= 1
+        if handle is not None:
+            handle.write(SITEMAP_FOOTER)
+            handle.close()
+
+    for number in range(len(chunks) + 1, len(previous_chunks) + 1):
+        try:
+            (output_dir / f"sitemap-{number}.xml").unlink()
+        except FileNotFoundError:
+            pass
+    try:
+        (output_dir / "sitemap.xml").unlink()
+    except FileNotFoundError:
+        pass
+
+    rows = []
+    for number, chunk in enumerate(chunks, start=1):
+        lastmod = chunk["lastmod"]
+        lastmod_tag = f"<lastmod>{lastmod.date().isoformat()}</lastmod>" if lastmod else ""
+        rows.append(f"<sitemap><loc>{join_url(site_url, f'sitemap-{number}.xml')}</loc>{lastmod_tag}</sitemap>")
+    index = "\n".join(
         [
             '<?xml version="1.0" encoding="UTF-8"?>',
-            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
-            "\n".join(items),
-            "</urlset>",
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+            *rows,
+            "</sitemapindex>",
         ]
     )
-    write_text(output_dir / "sitemap.xml", sitemap)
+    index_digest = hash_text(index)
+    if force or previous.get("index") != index_digest or not (output_dir / "sitemap_index.xml").exists():
+        write_text(output_dir / "sitemap_index.xml", index)
+    return {"chunks": [chunk["digest"] for chunk in chunks], "index": index_digest}
 
 
 def build_404(
@@ -915,7 +1454,7 @@ def build_404(
 ) -> None:
     root = "."
     rss_link = build_rss_link(root, args)
-    sidebar = build_sidebar(category_map, root, about_html, widget_html=widget_html)
+    sidebar = build_sidebar(category_map, root, about_html, widget_html=widget_html, mode=sidebar_mode(args))
     content = (
         '<div class="section-head">'
         "<h2>404</h2>"
@@ -934,7 +1473,7 @@ def build_404(
         sidebar=sidebar,
         site_name=html.escape(args.site_name),
         site_description=html.escape(args.site_description),
-        year=str(dt.datetime.now().year),
+        year=str(build_time().year),
         extra_head="",
         theme_toggle=theme_toggle,
         theme_default=theme_default,
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import re
+
+from markdown.extensions import Extension
+from markdown.postprocessors import Postprocessor
+
+from .content import count_words, search_terms
+
+TAG_RE = re.compile(r"<[^>]+>")
+IMG_SRC_RE = re.compile(r'(\s)src="([^"]+)"', re.IGNORECASE)
+IMG_LOADING_RE = re.compile(r"\sloading\s*=", re.IGNORECASE)
+SUMMARY_LENGTH = 200
+
+
+def rewrite_img(tag: str, root: str, loading: str) -> str:
+    def repl(match: re.Match) -> str:
+        src = match.group(2)
+        if src.startswith(("http://", "https://", "data:", "#", "/", "./", "../")):
+            return match.group(0)
+        return f'{match.group(1)}src="{root}/{src}"'
+
+    tag = IMG_SRC_RE.sub(repl, tag, count=1)
+    if loading and not IMG_LOADING_RE.search(tag):
+        if tag.endswith("/>"):
+            tag = f'{tag[:-2].rstrip()} loading="{loading}" />'
+        else:
+            tag = f'{tag[:-1].rstrip()} loading="{loading}">'
+    return tag
+
+
+def process_html(text: str, root: str, loading: str = "lazy") -> tuple[str, str]:
+    # One scan over the final HTML: rewrite <img> tags and collect the text between tags.
+    out = []
+    plain = []
+    pos = 0
+    for match in TAG_RE.finditer(text):
+        chunk = text[pos : match.start()]
+        out.append(chunk)
+        plain.append(chunk)
+        tag = match.group(0)
+        if tag[:4].lower() == "<img":
+            tag = rewrite_img(tag, root, loading)
+        out.append(tag)
+        pos = match.end()
+    out.append(text[pos:])
+    plain.append(text[pos:])
+    return "".join(out), "".join(plain)
+
+
+def text_stats(text: str) -> dict:
+    summary = text.strip().replace("\n", " ")
+    return {
+        "summary": summary[:SUMMARY_LENGTH] + ("..." if len(summary) > SUMMARY_LENGTH else ""),
+        "words": count_words(text),
+        "terms": search_terms(text),
+    }
+
+
+class PostHtmlPostprocessor(Postprocessor):
+    def __init__(self, md, extension: "PostHtmlExtension"):
+        super().__init__(md)
+        self.extension = extension
+
+    def run(self, text: str) -> str:
+        html_text, plain = process_html(text, self.extension.getConfig("root"), self.extension.getConfig("loading"))
+        self.extension.stats = text_stats(plain)
+        return html_text
+
+
+class PostHtmlExtension(Extension):
+    def __init__(self, **kwargs):
+        self.config = {
+            "root": ["..", "Relative path from the page to the site root."],
+            "loading": ["lazy", "Value for the loading attribute on images (empty to skip)."],
+        }
+        super().__init__(**kwargs)
+        self.reset()
+
+    def extendMarkdown(self, md):
+        md.registerExtension(self)
+        # Run last, after raw HTML and code blocks have been restored.
+        md.postprocessors.register(PostHtmlPostprocessor(md, self), "post_html", 0)
+
+    def reset(self) -> None:
+        self.stats = text_stats("")
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import datetime as dt
+import sys
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+
+@dataclass(slots=True, eq=False)
+class Post:
+    source: str
+    hash: str
+    slug: str
+    title: str
+    date: str
+    date_dt: dt.datetime
+    updated: str
+    updated_dt: dt.datetime
+    categories: tuple[str, ...]
+    archives: tuple[str, ...]
+    summary: str
+    words: int
+    terms: str
+    # Digest of the files the post embeds with code: links; empty when it links none.
+    links: str = ""
+    weight: int = 0
+    # Rendered body; None when the post carries load_body instead (catalog restores, low-memory builds).
+    content: Optional[str] = None
+    toc: str = ""
+    load_body: Optional[Callable[[], dict]] = None
+
+
+class NameTable:
+    # Posts with the same categories (or archive series) share one tuple of interned names.
+    def __init__(self) -> None:
+        self.names: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+    def get(self, values: Iterable[str]) -> tuple[str, ...]:
+        key = tuple(values)
+        names = self.names.get(key)
+        if names is None:
+            names = self.names[key] = tuple(sys.intern(value) for value in key)
+        return names
@@ -1,44 +1,14 @@
 from __future__ import annotations
 
+import os
 import re
 import shutil
+import threading
 from pathlib import Path
 
-IMG_SRC_RE = re.compile(r'<img([^>]*?)src="([^"]+)"', re.IGNORECASE)
-IMG_TAG_RE = re.compile("<img\b([^>]*?)>", re.IGNORECASE)
-TAG_RE = re.compile(r"<[^>]+>")
-
-
-def fix_relative_img_src(html_text: str, root: str) -> str:
-    def repl(match: re.Match) -> str:
-        attrs = match.group(1)
-        src = match.group(2)
-        if src.startswith(("http://", "https://", "data:", "#", "/", "./", "../")):
-            return match.group(0)
-        src = src.lstrip("/")
-        return f'<img{attrs}src="{root}/{src}"'
-
-    return IMG_SRC_RE.sub(repl, html_text)
-
+from .trace import span
 
-def add_img_loading(html_text: str, loading: str = "lazy") -> str:
-    def repl(match: re.Match) -> str:
-        attrs = match.group(1)
-        if re.search(r"\bloading\s*=", attrs, flags=re.IGNORECASE):
-            return match.group(0)
-        attrs_trim = attrs.rstrip()
-        self_closing = attrs_trim.endswith("/")
-        if self_closing:
-            attrs_trim = attrs_trim[:-1].rstrip()
-        if attrs_trim and not attrs_trim.endswith(" "):
-            attrs_trim += " "
-        elif not attrs_trim:
-            attrs_trim = " "
-        if self_closing:
-            return f"<img{attrs_trim}loading=\"{loading}\" />"
-        return f"<img{attrs_trim}loading=\"{loading}\">"
-
-    return IMG_TAG_RE.sub(repl, html_text)
+TAG_RE = re.compile(r"<[^>]+>")
 
 
 def strip_tags(html_text: str) -> str:
@@ -46,6 +16,11 @@ def strip_tags(html_text: str) -> str:
 
 
 def render_template(template: str, **context: str) -> str:
+    with span("template", "render"):
+        return fill_template(template, context)
+
+
+def fill_template(template: str, context: dict[str, str]) -> str:
     output = template
     late_keys = {"content", "sidebar"}
     for key, value in context.items():
@@ -66,8 +41,22 @@ def read_template(path: Path) -> str:
 
 
 def write_text(path: Path, text: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding="utf-8")
+    with span("write", "io", path=path):
+        overwrite_text(path, text)
+
+
+def overwrite_text(path: Path, text: str) -> None:
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            # Identical output keeps its mtime, so servers and deploy syncs see no change.
+            return
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    # Replace rather than rewrite in place, so a server or deploy sync never reads a half-written page.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
 
 def copy_static(static_dir: Path, output_dir: Path) -> None:
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import html
+import re
+from pathlib import Path
+from typing import Optional
+
+import markdown
+from markdown.extensions.codehilite import CodeHilite
+from markdown.extensions.toc import nest_toc_tokens, slugify as toc_slugify, unique
+from markdown.serializers import to_xhtml_string
+
+from .code_linker import RE_CODE_LINK, CodeLinkerExtension, build_code_link
+from .mermaid import MermaidExtension
+from .post_html import PostHtmlExtension, process_html, text_stats
+from .render import strip_tags
+from .trace import span
+
+CODE_LINK_RE = re.compile(RE_CODE_LINK)
+BLANK_LINE_RE = re.compile(r"(?<=\n) +\n")
+TAB_LENGTH = 4
+TOC_MARKER = "<p>[TOC]</p>\n"
+
+
+def parse_toc_depth(value: object) -> tuple[int, int]:
+    text = str(value or "6").strip()
+    try:
+        if "-" in text:
+            top, bottom = text.split("-", 1)
+            return int(top), int(bottom)
+        return 1, int(text)
+    except ValueError:
+        return 1, 6
+
+
+class PythonMarkdownEngine:
+    name = "python-markdown"
+
+    def __init__(self, project_root: Path, toc_depth: Optional[str] = None, root: Optional[str] = None):
+        self.project_root = project_root
+        self.toc_depth = toc_depth
+        self.root = root
+
+    def render(self, text: str, base_path: Path) -> dict:
+        extensions: list = ["fenced_code", "tables"]
+        configs: dict = {"codehilite": {"guess_lang": False}}
+        if self.toc_depth is not None:
+            extensions.append("toc")
+            configs["toc"] = {"toc_depth": self.toc_depth}
+        extensions += [
+            "codehilite",
+            MermaidExtension(),
+            CodeLinkerExtension(base_path=base_path, project_root=self.project_root),
+        ]
+        post_html = PostHtmlExtension(root=self.root) if self.root is not None else None
+        if post_html is not None:
+            extensions.append(post_html)
+        md = markdown.Markdown(extensions=extensions, extension_configs=configs)
+        with span("markdown", "markdown", engine=self.name):
+            content = md.convert(text)
+        result = {"content": content, "toc": getattr(md, "toc", "")}
+        result.update(post_html.stats if post_html is not None else text_stats(""))
+        return result
+
+
+class MarkdownItEngine:
+    name = "markdown-it"
+
+    def __init__(self, project_root: Path, toc_depth: Optional[str] = None, root: Optional[str] = None):
+        from markdown_it import MarkdownIt
+
+        self.project_root = project_root
+        self.toc_depth = toc_depth
+        self.root = root
+        self.md = MarkdownIt("commonmark", {"html": True, "xhtmlOut": True}).enable("table")
+        self.md.inline.ruler.before("link", "code_link", self.code_link_rule)
+        # Bound methods go straight into the rule table; add_render_rule would rebind them to the renderer.
+        self.md.renderer.rules["code_link"] = self.render_code_link
+        self.md.renderer.rules["fence"] = self.render_fence
+        if toc_depth is not None:
+            self.md.core.ruler.push("heading_ids", self.heading_ids)
+
+    def render(self, text: str, base_path: Path) -> dict:
+        # State lives in env so one parser instance can be shared by the build's worker threads.
+        env: dict = {"base_path": base_path, "toc": []}
+        # Normalize the source the way Python-Markdown does, so code blocks keep the same whitespace.
+        text = BLANK_LINE_RE.sub("\n", text.expandtabs(TAB_LENGTH))
+        with span("markdown", "markdown", engine=self.name):
+            content = self.md.render(text, env)
+        result = {"content": content, "toc": self.build_toc(env["toc"]) if self.toc_depth is not None else ""}
+        if result["toc"]:
+            content = content.replace(TOC_MARKER, result["toc"])
+        if self.root is None:
+            result.update(text_stats(""))
+            return result
+        result["content"], plain = process_html(content, self.root)
+        result.update(text_stats(plain))
+        return result
+
+    def code_link_rule(self, state, silent: bool) -> bool:
+        if state.src[state.pos] != "[":
+            return False
+        match = CODE_LINK_RE.match(state.src, state.pos)
+        if match is None:
+            return False
+        if not silent:
+            token = state.push("code_link", "", 0)
+            token.meta = {
+                "path": match.group("path").strip(),
+                "line": int(match.group("line")),
+                "text": match.group("text"),
+            }
+        state.pos = match.end()
+        return True
+
+    def render_code_link(self, tokens, idx, options, env) -> str:
+        meta = tokens[idx].meta
+        el = build_code_link(meta["path"], meta["line"], meta["text"], env["base_path"], self.project_root)
+        return el if isinstance(el, str) else to_xhtml_string(el)
+
+    def render_fence(self, tokens, idx, options, env) -> str:
+        token = tokens[idx]
+        lang = token.info.strip().split()[0] if token.info.strip() else ""
+        if lang == "mermaid":
+            return f'<pre class="mermaid">\n{token.content}</pre>\n'
+        return CodeHilite(token.content, lang=lang or None, guess_lang=False).hilite() + "\n"
+
+    def heading_ids(self, state) -> None:
+        top, bottom = parse_toc_depth(self.toc_depth)
+        used_ids: set[str] = set()
+        tokens = state.tokens
+        for idx, token in enumerate(tokens):
+            if token.type != "heading_open":
+                continue
+            inline = tokens[idx + 1]
+            name = strip_tags(self.md.renderer.renderInline(inline.children or [], self.md.options, state.env))
+            heading_id = unique(toc_slugify(html.unescape(name), "-"), used_ids)
+            token.attrSet("id", heading_id)
+            level = int(token.tag[1])
+            if top <= level <= bottom:
+                state.env["toc"].append({"level": level, "id": heading_id, "name": name})
+
+    def build_toc(self, items: list[dict]) -> str:
+        def build_list(nodes: list[dict]) -> str:
+            rows = []
+            for node in nodes:
+                children = build_list(node["children"]) if node["children"] else ""
+                rows.append(f'<li><a href="#{html.escape(node["id"])}">{node["name"]}</a>{children}</li>\n')
+            return f"<ul>\n{''.join(rows)}</ul>\n"
+
+        return f'<div class="toc">\n{build_list(nest_toc_tokens(items))}</div>\n'
+
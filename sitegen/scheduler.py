@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable
+
+from .trace import span
+
+
+class TaskGraph:
+    def __init__(self) -> None:
+        self.tasks: dict[str, dict] = {}
+        self.producers: dict[str, str] = {}
+        self.timings: dict[str, tuple[float, float]] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], object],
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+    ) -> None:
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        outputs = tuple(outputs)
+        for output in outputs:
+            if output in self.producers:
+                raise ValueError(f"{output} is written by both {self.producers[output]} and {name}")
+        for output in outputs:
+            self.producers[output] = name
+        self.tasks[name] = {"func": func, "inputs": tuple(inputs), "outputs": outputs}
+
+    def dependencies(self, name: str) -> set[str]:
+        # Inputs nobody produces (posts, category_map, ...) are ready before the graph runs.
+        return {self.producers[item] for item in self.tasks[name]["inputs"] if item in self.producers} - {name}
+
+    def order(self) -> list[str]:
+        remaining = {name: self.dependencies(name) for name in self.tasks}
+        ordered: list[str] = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps - set(ordered)]
+            if not ready:
+                raise ValueError(f"Cycle between tasks: {', '.join(sorted(remaining))}")
+            for name in ready:
+                ordered.append(name)
+                del remaining[name]
+        return ordered
+
+    def call(self, name: str) -> object:
+        start = time.perf_counter()
+        try:
+            with span(name, "task"):
+                return self.tasks[name]["func"]()
+        finally:
+            self.timings[name] = (start, time.perf_counter())
+
+    def run(self, workers: int = 1) -> dict[str, object]:
+        ordered = self.order()
+        results: dict[str, object] = {}
+        if workers <= 1 or len(ordered) <= 1:
+            for name in ordered:
+                results[name] = self.call(name)
+            return results
+        pending = {name: self.dependencies(name) for name in ordered}
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+
+            def submit_ready() -> None:
+                for name in [name for name, deps in pending.items() if deps <= results.keys()]:
+                    del pending[name]
+                    running[executor.submit(self.call, name)] = name
+
+            submit_ready()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    # A failing task raises here; the executor still waits for tasks already running.
+                    results[name] = future.result()
+                submit_ready()
+        return results
+
+    def durations(self) -> dict[str, float]:
+        return {name: round((end - start) * 1000, 1) for name, (start, end) in self.timings.items()}
+
+    def critical_path(self) -> tuple[list[str], float]:
+        # Longest chain of dependent tasks by measured duration: the floor for the graph's wall time.
+        durations = self.durations()
+        best: dict[str, tuple[float, list[str]]] = {}
+        for name in self.order():
+            chains = [best[dep] for dep in self.dependencies(name)]
+            total, path = max(chains, default=(0.0, []))
+            best[name] = (total + durations.get(name, 0.0), [*path, name])
+        total, path = max(best.values(), default=(0.0, []))
+        return path, round(total, 1)
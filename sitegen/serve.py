@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import mimetypes
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+KEEPALIVE_SECONDS = 15
+RELOAD_SCRIPT = """(function () {
+  if (!window.EventSource) {
+    return;
+  }
+  var source = new EventSource("/__reload");
+  source.addEventListener("reload", function () {
+    window.location.reload();
+  });
+})();
+"""
+RELOAD_TAG = b'<script src="/__livereload.js"></script>\n'
+TEXT_TYPES = {"application/javascript", "application/json", "application/xml", "image/svg+xml"}
+
+
+class PreviewServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], root: Path) -> None:
+        super().__init__(address, PreviewHandler)
+        self.root = root.resolve()
+        self.stats: dict = {}
+        self.version = 0
+        self.closing = False
+        self.changed = threading.Condition()
+
+    def publish(self, stats: dict) -> None:
+        with self.changed:
+            self.stats = stats
+            if stats.get("built"):
+                self.version += 1
+            self.changed.notify_all()
+
+    def close(self) -> None:
+        with self.changed:
+            self.closing = True
+            self.changed.notify_all()
+        self.shutdown()
+        self.server_close()
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: PreviewServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.handle_request(head=True)
+
+    def do_GET(self) -> None:
+        self.handle_request(head=False)
+
+    def handle_request(self, head: bool) -> None:
+        path = unquote(urlsplit(self.path).path)
+        if path == "/__reload":
+            self.stream_reload()
+        elif path == "/__stats":
+            self.send_bytes(json.dumps(self.server.stats, indent=2).encode("utf-8"), "application/json", head)
+        elif path == "/__livereload.js":
+            self.send_bytes(RELOAD_SCRIPT.encode("utf-8"), "application/javascript", head)
+        else:
+            self.send_file(path, head)
+
+    def resolve(self, path: str) -> Optional[Path]:
+        root = self.server.root
+        target = (root / path.lstrip("/")).resolve()
+        if not target.is_relative_to(root):
+            return None
+        if target.is_dir():
+            target = target / "index.html"
+        elif not target.exists() and target.with_name(f"{target.name}.html").is_file():
+            # GitHub Pages serves /posts/foo for posts/foo.html.
+            target = target.with_name(f"{target.name}.html")
+        return target if target.is_file() else None
+
+    def send_file(self, path: str, head: bool) -> None:
+        target = self.resolve(path)
+        status = HTTPStatus.OK
+        if target is None:
+            status = HTTPStatus.NOT_FOUND
+            target = self.server.root / "404.html"
+            if not target.is_file():
+                self.send_error(status)
+                return
+        content_type = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in TEXT_TYPES:
+            content_type += "; charset=utf-8"
+        is_html = target.suffix == ".html"
+        sidecar = target.with_name(f"{target.name}.gz")
+        use_gzip = (
+            not is_html
+            and "gzip" in self.headers.get("Accept-Encoding", "")
+            and sidecar.is_file()
+        )
+        source = sidecar if use_gzip else target
+        stat = source.stat()
+        # Unchanged outputs are never rewritten, so mtime and size identify the content.
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-gz" if use_gzip else ""}{"-live" if is_html else ""}"'
+        if status == HTTPStatus.OK and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        data = source.read_bytes()
+        if is_html:
+            # HTML gets the reload client, so it is always sent uncompressed.
+            index = data.rfind(b"</body>")
+            data = data[:index] + RELOAD_TAG + data[index:] if index >= 0 else data + RELOAD_TAG
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")
+        if status == HTTPStatus.OK:
+            self.send_header("ETag", etag)
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        if use_gzip or sidecar.is_file():
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def send_bytes(self, data: bytes, content_type: str, head: bool) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def stream_reload(self) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        # The stream has no length; it ends when either side closes the connection.
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        server = self.server
+        with server.changed:
+            seen = server.version
+        try:
+            while True:
+                with server.changed:
+                    server.changed.wait_for(lambda: server.closing or server.version != seen, KEEPALIVE_SECONDS)
+                    closing, version = server.closing, server.version
+                if closing:
+                    return
+                if version != seen:
+                    seen = version
+                    self.wfile.write(f"event: reload\ndata: {version}\n\n".encode("ascii"))
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from .cache import hash_text
+from .render import write_text
+
+SHARD_VERSION = 1
+SHARD_RE = re.compile(r"^shard-(\d+)-of-(\d+)\.json$")
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid shard {value!r}, expected I/N (e.g. 2/4).")
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"Invalid shard {value!r}, I must be between 1 and N.")
+    return index, total
+
+
+def shard_of(key: str, total: int) -> int:
+    # Keyed by the lock key, so a post stays in its shard however the rest of the tree changes.
+    return int(hash_text(key)[:8], 16) % total + 1
+
+
+def shard_path(directory: Path, index: int, total: int) -> Path:
+    return directory / f"shard-{index}-of-{total}.json"
+
+
+def write_shard(directory: Path, shard: tuple[int, int], render_key: str, posts: dict[str, dict]) -> Path:
+    path = shard_path(directory, *shard)
+    data = {"version": SHARD_VERSION, "shard": list(shard), "render_key": render_key, "posts": posts}
+    write_text(path, json.dumps(data, ensure_ascii=False))
+    return path
+
+
+def load_shards(directory: Path, render_key: str) -> dict[str, dict]:
+    paths = sorted(path for path in directory.glob("shard-*-of-*.json") if SHARD_RE.match(path.name))
+    if not paths:
+        print(f"No shard fragments found in {directory}; run build --shard I/N first.", file=sys.stderr)
+        sys.exit(1)
+    totals = {int(SHARD_RE.match(path.name).group(2)) for path in paths}
+    if len(totals) != 1:
+        print(f"Shard fragments in {directory} come from different splits: {sorted(totals)}.", file=sys.stderr)
+        sys.exit(1)
+    total = totals.pop()
+    missing = sorted(set(range(1, total + 1)) - {int(SHARD_RE.match(path.name).group(1)) for path in paths})
+    if missing:
+        print(f"Missing shard fragments: {', '.join(f'{index}/{total}' for index in missing)}.", file=sys.stderr)
+        sys.exit(1)
+    posts: dict[str, dict] = {}
+    for path in paths:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"Cannot read shard fragment {path}: {exc}", file=sys.stderr)
+            sys.exit(1)
+        if data.get("version") != SHARD_VERSION or data.get("render_key") != render_key:
+            # Bodies rendered by another generator, config or Markdown setup would not match a local build.
+            print(f"Shard fragment {path} was rendered with different settings; rebuild the shards.", file=sys.stderr)
+            sys.exit(1)
+        posts.update(data.get("posts", {}))
+    return posts
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+NULL_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.events: list[dict] = []
+        self.threads: dict[int, str] = {}
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        name: str,
+        cat: str,
+        start_ns: int,
+        end_ns: int,
+        args: Optional[dict] = None,
+        cpu_ns: Optional[tuple[int, int]] = None,
+    ) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start_ns - self.origin) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if cpu_ns is not None:
+            # Thread CPU time: wall time alone overstates work when worker threads share the GIL.
+            event["tts"] = cpu_ns[0] / 1000
+            event["tdur"] = (cpu_ns[1] - cpu_ns[0]) / 1000
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        with self.lock:
+            self.events.append(event)
+            self.threads.setdefault(thread.ident, thread.name)
+
+    def export(self) -> dict:
+        metadata = [{"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": "sitegen"}}]
+        metadata.extend(
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in sorted(self.threads.items())
+        )
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.export()), encoding="utf-8")
+
+    def slowest_posts(self, top: int) -> list[tuple[str, float, float]]:
+        with self.lock:
+            events = list(self.events)
+        # Highlight spans per thread, sorted by start, with running CPU totals for range sums.
+        starts: dict[int, list[float]] = {}
+        totals: dict[int, list[float]] = {}
+        for event in sorted((event for event in events if event["name"] == "highlight"), key=lambda event: event["ts"]):
+            starts.setdefault(event["tid"], []).append(event["ts"])
+            running = totals.setdefault(event["tid"], [0.0])
+            running.append(running[-1] + event["tdur"])
+        rows = []
+        for post in events:
+            if post["name"] != "post":
+                continue
+            # Highlighting is attributed to the post span that encloses it on the same thread.
+            highlight_us = 0.0
+            if post["tid"] in starts:
+                tid_starts = starts[post["tid"]]
+                first = bisect.bisect_left(tid_starts, post["ts"])
+                last = bisect.bisect_right(tid_starts, post["ts"] + post["dur"])
+                highlight_us = totals[post["tid"]][last] - totals[post["tid"]][first]
+            rows.append((post.get("args", {}).get("rel", "?"), post["tdur"] / 1000, highlight_us / 1000))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows[:top]
+
+
+class Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start", "cpu_start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter_ns()
+        self.cpu_start = time.thread_time_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        cpu_end = time.thread_time_ns()
+        self.tracer.record(
+            self.name, self.cat, self.start, time.perf_counter_ns(), self.args, (self.cpu_start, cpu_end)
+        )
+
+
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, cat: str = "build", **args: object):
+    # Disabled tracing costs one global lookup and returns a shared no-op context manager.
+    if _tracer is None:
+        return NULL_SPAN
+    return Span(_tracer, name, cat, args)
+
+
+def record(name: str, cat: str, start_ns: int, end_ns: int, **args: object) -> None:
+    if _tracer is not None:
+        _tracer.record(name, cat, start_ns, end_ns, args)
+
+
+def enable() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+        install_hooks()
+    return _tracer
+
+
+def install_hooks() -> None:
+    # Pygments highlighting runs inside Python-Markdown's codehilite; wrap it only while tracing.
+    from markdown.extensions.codehilite import CodeHilite
+
+    original = CodeHilite.hilite
+    if getattr(original, "traced", False):
+        return
+
+    @functools.wraps(original)
+    def hilite(self, *args, **kwargs):
+        with span("highlight", "markdown", lang=self.lang or ""):
+            return original(self, *args, **kwargs)
+
+    hilite.traced = True
+    CodeHilite.hilite = hilite
+
+
+def print_summary(tracer: Tracer, top: int) -> None:
+    rows = tracer.slowest_posts(top)
+    if not rows:
+        return
+    print("Slowest posts (CPU ms for parse + render, of which highlighting):")
+    for rel, total_ms, highlight_ms in rows:
+        print(f"  {total_ms:8.1f} ms  {highlight_ms:7.1f} ms  {rel}")
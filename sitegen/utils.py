@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import datetime as dt
+import os
 import shutil
 import sys
 from pathlib import Path
+from typing import Optional
 
 
 def parse_bool(value: object) -> bool:
@@ -39,6 +41,37 @@ def join_url(base: str, path: str) -> str:
     return f"{base}/{path}"
 
 
+def source_date_epoch() -> Optional[int]:
+    value = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Ignoring invalid SOURCE_DATE_EPOCH: {value!r}", file=sys.stderr)
+        return None
+
+
+def build_time() -> dt.datetime:
+    epoch = source_date_epoch()
+    if epoch is None:
+        return dt.datetime.now()
+    # Use UTC so the same epoch gives the same timestamps on every machine.
+    return dt.datetime.fromtimestamp(epoch, dt.timezone.utc).replace(tzinfo=None)
+
+
+def timestamp_datetime(value: float) -> dt.datetime:
+    epoch = source_date_epoch()
+    if epoch is None:
+        return dt.datetime.fromtimestamp(value)
+    # Checkouts stamp files with the checkout time; clamp them like other reproducible-build tools.
+    return dt.datetime.fromtimestamp(min(value, epoch), dt.timezone.utc).replace(tzinfo=None)
+
+
+def file_mtime(path: Path) -> dt.datetime:
+    return timestamp_datetime(path.stat().st_mtime)
+
+
 def rfc822_date(value: dt.datetime) -> str:
     value = value.replace(tzinfo=dt.timezone.utc)
     return value.strftime("%a, %d %b %Y %H:%M:%S %z")
@@ -50,14 +83,19 @@ def iso_date(value: dt.datetime) -> str:
 
 
 def write_nojekyll(output_dir: Path) -> None:
-    output_dir.joinpath(".nojekyll").write_text("", encoding="utf-8")
+    path = output_dir / ".nojekyll"
+    if not path.exists():
+        path.write_text("", encoding="utf-8")
 
 
-def write_robots_txt(output_dir: Path, site_url: str) -> None:
+def write_robots_txt(output_dir: Path, site_url: str, sitemap: str = "sitemap_index.xml") -> None:
     lines = ["User-agent: *", "Allow: /"]
-    if site_url:
-        lines.append(f"Sitemap: {join_url(site_url, 'sitemap.xml')}")
-    output_dir.joinpath("robots.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    if site_url and sitemap:
+        lines.append(f"Sitemap: {join_url(site_url, sitemap)}")
+    path = output_dir / "robots.txt"
+    text = "\n".join(lines) + "\n"
+    if not path.exists() or path.read_text(encoding="utf-8") != text:
+        path.write_text(text, encoding="utf-8")
 
 
 def clean_output_dir(output_dir: Path, project_root: Path) -> None:
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+POLL_INTERVAL = 0.05
+NATIVE_POLL_INTERVAL = 1.0
+DEBOUNCE = 0.03
+SKIP_DIRS = {".git", "__pycache__", ".sitegen-cache", "node_modules"}
+
+
+def snapshot(paths: Iterable[Path], ignore: Iterable[Path] = ()) -> dict[Path, tuple[int, int]]:
+    ignored = {path.resolve() for path in ignore}
+    state: dict[Path, tuple[int, int]] = {}
+
+    def add(path: Path) -> None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+
+    for root in paths:
+        if root.is_file():
+            add(root)
+            continue
+        for parent, dirs, names in os.walk(root):
+            parent_path = Path(parent)
+            dirs[:] = [
+                name
+                for name in dirs
+                if name not in SKIP_DIRS and (parent_path / name).resolve() not in ignored
+            ]
+            for name in names:
+                path = parent_path / name
+                if path.resolve() not in ignored:
+                    add(path)
+    return state
+
+
+def changed_paths(before: dict[Path, tuple[int, int]], after: dict[Path, tuple[int, int]]) -> set[Path]:
+    changed = {path for path, stamp in after.items() if before.get(path) != stamp}
+    changed.update(path for path in before if path not in after)
+    return changed
+
+
+class Watcher:
+    def __init__(self, paths: list[Path], ignore: Iterable[Path] = ()) -> None:
+        self.paths = [path for path in paths if path.exists()]
+        self.ignore = list(ignore)
+        self.state = snapshot(self.paths, self.ignore)
+        self.event = threading.Event()
+        self.observer = self.start_native()
+
+    def start_native(self) -> Optional[object]:
+        # watchdog (inotify/FSEvents/ReadDirectoryChangesW) only wakes the loop; snapshots still decide what changed.
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+        event = self.event
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, _event) -> None:
+                event.set()
+
+        observer = Observer()
+        handler = Handler()
+        for path in self.paths:
+            if path.is_dir():
+                observer.schedule(handler, str(path), recursive=True)
+            else:
+                observer.schedule(handler, str(path.parent), recursive=False)
+        try:
+            observer.start()
+        except OSError:
+            return None
+        return observer
+
+    @property
+    def backend(self) -> str:
+        return "native" if self.observer is not None else "polling"
+
+    def wait(self) -> set[Path]:
+        interval = NATIVE_POLL_INTERVAL if self.observer is not None else POLL_INTERVAL
+        while True:
+            self.event.wait(interval)
+            self.event.clear()
+            current = snapshot(self.paths, self.ignore)
+            changed = changed_paths(self.state, current)
+            if not changed:
+                continue
+            # Editors often save in several steps (truncate, write, rename); wait until the tree is quiet.
+            while True:
+                time.sleep(DEBOUNCE)
+                settled = snapshot(self.paths, self.ignore)
+                if settled == current:
+                    break
+                changed |= changed_paths(current, settled)
+                current = settled
+            self.event.clear()
+            self.state = current
+            return changed
+
+    def close(self) -> None:
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
@@ -5,10 +5,55 @@
     return;
   }
   views.classList.add("is-js");
+  const root = document.body.dataset.root || ".";
+
+  const escapeHtml = (text) =>
+    String(text)
+      .replace(/&/g, "&amp;")
+      .replace(/</g, "&lt;")
+      .replace(/>/g, "&gt;")
+      .replace(/"/g, "&quot;")
+      .replace(/'/g, "&#039;");
+
+  const renderMonths = (section, posts) => {
+    const groups = new Map();
+    posts.forEach(([slug, title, date]) => {
+      const month = String(date).slice(0, 7);
+      if (!groups.has(month)) {
+        groups.set(month, []);
+      }
+      groups.get(month).push(
+        `<li><span class="archive-date">${escapeHtml(date)}</span>` +
+          `<a href="${root}/posts/${encodeURIComponent(slug)}.html">${escapeHtml(title)}</a></li>`
+      );
+    });
+    section.innerHTML = Array.from(groups, ([month, rows]) =>
+      `<section class="archive-group"><h3>${escapeHtml(month)}</h3>` +
+        `<ul class="archive-list">${rows.join("")}</ul></section>`
+    ).join("");
+  };
+
+  const hydrate = (section) => {
+    const src = section.dataset.src;
+    if (!src || section.dataset.loaded) {
+      return;
+    }
+    section.dataset.loaded = "true";
+    fetch(src)
+      .then((response) => response.json())
+      .then((data) => renderMonths(section, data.posts || []))
+      .catch(() => {
+        delete section.dataset.loaded;
+      });
+  };
 
   const setView = (view) => {
     views.querySelectorAll(".archive-view").forEach((section) => {
-      section.classList.toggle("is-active", section.dataset.view === view);
+      const active = section.dataset.view === view;
+      section.classList.toggle("is-active", active);
+      if (active) {
+        hydrate(section);
+      }
     });
     buttons.forEach((button) => {
       button.classList.toggle("is-active", button.dataset.view === view);
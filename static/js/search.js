@@ -19,6 +19,7 @@ function matches(post, tokens) {
   const haystack = [
     post.title || "",
     post.summary || "",
+    post.terms || "",
     post.date || "",
     (post.categories || []).map((cat) => cat.name).join(" "),
   ]
@@ -0,0 +1,43 @@
+(() => {
+  const root = document.body.dataset.root || ".";
+  const current = decodeURIComponent(window.location.pathname.split("/").pop() || "");
+
+  const escapeHtml = (text) =>
+    String(text)
+      .replace(/&/g, "&amp;")
+      .replace(/</g, "&lt;")
+      .replace(/>/g, "&gt;")
+      .replace(/"/g, "&quot;")
+      .replace(/'/g, "&#039;");
+
+  document.querySelectorAll(".sidebar-series-more").forEach((button) => {
+    button.addEventListener("click", () => {
+      const group = button.closest("[data-series]");
+      const list = group && group.querySelector(".sidebar-archive-list");
+      if (!list) {
+        return;
+      }
+      button.disabled = true;
+      fetch(button.dataset.seriesSrc)
+        .then((response) => response.json())
+        .then((data) => {
+          const posts = data.posts || [];
+          list.innerHTML = posts
+            .map(([slug, title, date]) => {
+              const file = `${slug}.html`;
+              const dateHtml = `<span class="archive-date">${escapeHtml(date)}</span>`;
+              if (file === current) {
+                return `<li class="is-current"><span>${escapeHtml(title)}</span>${dateHtml}</li>`;
+              }
+              const url = `${root}/posts/${encodeURIComponent(slug)}.html`;
+              return `<li><a href="${url}">${escapeHtml(title)}</a>${dateHtml}</li>`;
+            })
+            .join("");
+          button.remove();
+        })
+        .catch(() => {
+          button.disabled = false;
+        });
+    });
+  });
+})();
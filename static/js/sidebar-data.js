@@ -0,0 +1,63 @@
+(() => {
+  const lists = document.querySelectorAll("[data-sidebar-src]");
+  if (!lists.length) {
+    return;
+  }
+  const root = document.body.dataset.root || ".";
+
+  const escapeHtml = (text) =>
+    String(text)
+      .replace(/&/g, "&amp;")
+      .replace(/</g, "&lt;")
+      .replace(/>/g, "&gt;")
+      .replace(/"/g, "&quot;")
+      .replace(/'/g, "&#039;");
+
+  const setCount = (item, count) => {
+    let badge = item.querySelector(".count");
+    if (!badge) {
+      badge = document.createElement("span");
+      badge.className = "count";
+      item.appendChild(badge);
+    }
+    badge.textContent = String(Number(count));
+  };
+
+  // sidebar.json keeps a stable URL; revalidate it so new counts show up without a page rebuild.
+  fetch(lists[0].dataset.sidebarSrc, { cache: "no-cache" })
+    .then((response) => response.json())
+    .then((data) => {
+      const categories = data.categories || [];
+      if (!categories.length) {
+        return;
+      }
+      const counts = new Map(categories.map(([, slug, count]) => [slug, count]));
+      lists.forEach((list) => {
+        // The page already lists the category names; fill in the counts and catch up with
+        // categories added or removed since the page was written.
+        const seen = new Set();
+        list.querySelectorAll("li").forEach((item) => {
+          const slug = item.dataset.slug;
+          if (!slug || !counts.has(slug)) {
+            item.remove();
+            return;
+          }
+          seen.add(slug);
+          setCount(item, counts.get(slug));
+        });
+        categories.forEach(([name, slug, count]) => {
+          if (seen.has(slug)) {
+            return;
+          }
+          list.insertAdjacentHTML(
+            "beforeend",
+            `<li data-slug="${escapeHtml(slug)}">` +
+              `<a href="${root}/categories/${encodeURIComponent(slug)}.html">${escapeHtml(name)}</a>` +
+              `<span class="count">${Number(count)}</span></li>`
+          );
+        });
+        list.dataset.sidebarVersion = data.version || "";
+      });
+    })
+    .catch(() => {});
+})();
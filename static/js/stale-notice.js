@@ -0,0 +1,13 @@
+(() => {
+  const dayMs = 24 * 60 * 60 * 1000;
+  document.querySelectorAll("[data-stale-updated]").forEach((notice) => {
+    const updated = new Date(notice.dataset.staleUpdated);
+    const days = Number(notice.dataset.staleDays) || 0;
+    if (Number.isNaN(updated.getTime()) || days <= 0) {
+      return;
+    }
+    if (Date.now() - updated.getTime() > days * dayMs) {
+      notice.hidden = false;
+    }
+  });
+})();
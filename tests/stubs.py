@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+class StubServer:
+    # Records every request and answers with respond(method, path, body) -> (status, body).
+    def __init__(self, respond: Callable[[str, str, bytes], tuple[int, bytes]]) -> None:
+        self.requests: list[tuple[str, str, dict, bytes]] = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def handle_any(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with stub.lock:
+                    stub.requests.append((self.command, self.path, dict(self.headers), body))
+                status, payload = respond(self.command, self.path, body)
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = handle_any
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def json_bodies(self, method: Optional[str] = None) -> list[dict]:
+        with self.lock:
+            return [json.loads(body) for command, _, _, body in self.requests if method in (None, command)]
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import socket
+import tempfile
+import unittest
+from pathlib import Path
+
+from sitegen.artifacts import HttpStore, LocalStore, open_store
+from sitegen.cache import FragmentCache
+from tests.stubs import StubServer
+
+ADDRESS = "ab" * 32
+
+
+class HttpStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.status: int = 0
+        self.stub = StubServer(self.respond)
+        self.addCleanup(self.stub.close)
+        self.stderr = io.StringIO()
+        redirect = contextlib.redirect_stderr(self.stderr)
+        redirect.__enter__()
+        self.addCleanup(redirect.__exit__, None, None, None)
+
+    def respond(self, method: str, path: str, body: bytes) -> tuple[int, bytes]:
+        if self.status:
+            return self.status, b""
+        address = path.rsplit("/", 1)[1]
+        if method == "PUT":
+            self.objects[address] = body
+            return 201, b""
+        if address in self.objects:
+            return 200, self.objects[address]
+        return 404, b""
+
+    def store(self, **options) -> HttpStore:
+        return HttpStore(f"{self.stub.url}/blog", token="secret", **options)
+
+    def test_hit(self) -> None:
+        self.objects[ADDRESS] = b'{"content": "<p>x</p>"}'
+        store = self.store()
+        self.assertEqual(store.get(ADDRESS), b'{"content": "<p>x</p>"}')
+        method, path, headers, _ = self.stub.requests[0]
+        self.assertEqual((method, path), ("GET", f"/blog/{ADDRESS}"))
+        self.assertEqual(headers["Authorization"], "Bearer secret")
+        self.assertEqual(store.stats, {"hits": 1, "misses": 0, "uploads": 0})
+
+    def test_miss_keeps_the_store_enabled(self) -> None:
+        store = self.store()
+        self.assertIsNone(store.get(ADDRESS))
+        self.assertTrue(store.enabled)
+        store.put(ADDRESS, b"rendered")
+        self.assertEqual(store.get(ADDRESS), b"rendered")
+        self.assertEqual(store.stats, {"hits": 1, "misses": 1, "uploads": 1})
+        self.assertEqual(self.stderr.getvalue(), "")
+
+    def test_unauthorized_disables_the_store(self) -> None:
+        self.status = 401
+        store = self.store()
+        self.assertIsNone(store.get(ADDRESS))
+        self.assertFalse(store.enabled)
+        # Later calls do not reach the server and are not counted.
+        store.get(ADDRESS)
+        store.put(ADDRESS, b"rendered")
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(store.stats, {"hits": 0, "misses": 0, "uploads": 0})
+        self.assertEqual(self.stderr.getvalue().count("HTTP 401"), 1)
+
+    def test_unreachable_server_disables_the_store(self) -> None:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        store = HttpStore(f"http://127.0.0.1:{port}", timeout=2)
+        for _ in range(3):
+            self.assertIsNone(store.get(ADDRESS))
+        self.assertFalse(store.enabled)
+        self.assertEqual(self.stderr.getvalue().count("continuing without it"), 1)
+
+    def test_read_only_store_does_not_upload(self) -> None:
+        store = self.store(push=False)
+        store.put(ADDRESS, b"rendered")
+        self.assertEqual(self.stub.requests, [])
+
+    def test_fragment_cache_keeps_remote_hits_locally(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = FragmentCache(None, "n" * 64, resident=False, remote=self.store())
+            writer.put("render", "post", "<p>shared</p>")
+            reader = FragmentCache(Path(tmp), "n" * 64, resident=False, remote=self.store())
+            self.assertEqual(reader.get("render", "post"), "<p>shared</p>")
+            self.stub.requests.clear()
+            # The second read is served from cache_dir.
+            self.assertEqual(reader.get("render", "post"), "<p>shared</p>")
+            self.assertEqual(self.stub.requests, [])
+
+
+class OpenStoreTest(unittest.TestCase):
+    def test_location_selects_the_backend(self) -> None:
+        self.assertIsNone(open_store(""))
+        self.assertIsInstance(open_store("https://cache.example.com/blog"), HttpStore)
+        local = open_store("/srv/blog-cache", push=False)
+        self.assertIsInstance(local, LocalStore)
+        self.assertFalse(local.push)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DATE_EPOCH = "1767225600"
+
+POSTS = {
+    "notes/hello.md": """---
+title: Hello
+date: 2025-03-01
+time: 08:30
+updated: 2025-06-01
+categories: [Notes, Tools]
+archive: Getting Started
+---
+
+# Hello
+
+First post with `inline code` and a [code link](code:/code_snippets/demo.py#L2).
+
+## Setup
+
+```python
+def greet(name):
+    return f"hello {name}"
+```
+""",
+    "notes/second.md": """---
+title: Second steps
+date: 2025-04-02
+categories: [Notes]
+archive: Getting Started
+summary: The second post in the series.
+---
+
+## Diagram
+
+```mermaid
+graph TD
+    A --> B
+```
+
+| name | value |
+| --- | --- |
+| a | 1 |
+""",
+    "kernel/页表.md": """---
+title: 页表笔记
+date: 2025-05-03
+categories: [Kernel, 操作系统]
+archive: 内核笔记
+---
+
+内核在切换到用户态之前会为每个进程建立页表。
+
+```c
+static int map(struct page *p) { return 0; }
+```
+""",
+    "undated.md": """---
+title: Undated
+categories: [Notes]
+---
+
+A post without date or updated, so both come from the build and file times.
+""",
+    "draft.md": """---
+title: Draft
+date: 2025-07-01
+draft: true
+---
+
+Not published.
+""",
+}
+
+CONFIG = """site_name = "Fixture Blog"
+site_url = "https://fixture.example.com"
+posts_per_page = 2
+clean = false
+enable_indexnow = false
+enable_category_feeds = true
+enable_archive_feeds = true
+change_detection = "content"
+"""
+
+
+def make_site(root: Path) -> None:
+    shutil.copytree(REPO_ROOT / "templates", root / "templates")
+    shutil.copytree(REPO_ROOT / "static", root / "static")
+    for name, text in POSTS.items():
+        path = root / "posts" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    (root / "pages").mkdir()
+    (root / "pages" / "about.md").write_text("# About\n\nFixture site.\n", encoding="utf-8")
+    (root / "code_snippets").mkdir()
+    (root / "code_snippets" / "demo.py").write_text("import sys\nprint(sys.argv)\n", encoding="utf-8")
+    (root / "site.toml").write_text(CONFIG, encoding="utf-8")
+    # Fixed file times, so mtime-derived dates are the same wherever the fixture is created.
+    epoch = int(SOURCE_DATE_EPOCH) - 86400
+    for path in root.rglob("*"):
+        os.utime(path, (epoch, epoch))
+
+
+def build(
+    site: Path, work: Path, *options: str, hash_seed: str = "0", build_args: tuple[str, ...] = ()
+) -> subprocess.CompletedProcess:
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    env.update({"SOURCE_DATE_EPOCH": SOURCE_DATE_EPOCH, "PYTHONHASHSEED": hash_seed})
+    command = [
+        sys.executable,
+        *options,
+        str(REPO_ROOT / "build.py"),
+        "--output",
+        str(work / "dist"),
+        "--lock-file",
+        str(work / "build.lock.json"),
+        "--cache-dir",
+        str(work / "cache"),
+        *build_args,
+    ]
+    result = subprocess.run(command, cwd=site, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise AssertionError(f"build failed:\n{result.stdout}\n{result.stderr}")
+    return result
+
+
+def tree_digest(root: Path) -> dict[str, str]:
+    return {
+        path.relative_to(root).as_posix(): hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class BuildTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.root = Path(cls.tmp.name)
+        cls.site = cls.root / "site"
+        make_site(cls.site)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tmp.cleanup()
+
+    def test_builds_are_reproducible(self) -> None:
+        # Separate outputs, locks and caches, and different hash seeds so set ordering cannot leak into the output.
+        build(self.site, self.root / "a", hash_seed="1")
+        build(self.site, self.root / "b", hash_seed="2")
+        first = tree_digest(self.root / "a" / "dist")
+        second = tree_digest(self.root / "b" / "dist")
+        self.assertIn("posts/hello.html", first)
+        self.assertNotIn("posts/draft.html", first)
+        self.assertEqual(sorted(first), sorted(second))
+        self.assertEqual([name for name in first if first[name] != second[name]], [])
+
+    def assert_incremental_matches_clean(self, site: Path, work: Path, name: str, build_args: tuple[str, ...]) -> None:
+        build(site, work, build_args=build_args)
+        clean = self.root / name
+        build(site, clean, build_args=build_args)
+        incremental = tree_digest(work / "dist")
+        expected = tree_digest(clean / "dist")
+        self.assertEqual(sorted(incremental), sorted(expected))
+        self.assertEqual([path for path in expected if incremental[path] != expected[path]], [])
+
+    def test_include_sidebar_follows_added_and_removed_categories(self) -> None:
+        site = self.root / "include-site"
+        make_site(site)
+        work = self.root / "include"
+        options = ("--sidebar-mode", "include")
+        build(site, work, build_args=options)
+
+        # Every page lists the category names, so a new category must reach pages whose post did not change.
+        new_post = site / "posts" / "zeta.md"
+        new_post.write_text("---\ntitle: Zeta\ndate: 2025-08-01\ncategories: [Zeta]\n---\n\nNew category.\n", encoding="utf-8")
+        self.assert_incremental_matches_clean(site, work, "include-added", options)
+        self.assertIn('data-slug="zeta"', (work / "dist" / "posts" / "hello.html").read_text(encoding="utf-8"))
+
+        new_post.unlink()
+        self.assert_incremental_matches_clean(site, work, "include-removed", options)
+        self.assertNotIn('data-slug="zeta"', (work / "dist" / "posts" / "hello.html").read_text(encoding="utf-8"))
+
+    def test_editing_a_linked_snippet_rebuilds_the_post(self) -> None:
+        site = self.root / "snippet-site"
+        make_site(site)
+        work = self.root / "snippet"
+        build(site, work)
+
+        # hello.md embeds code_snippets/demo.py through a code: link; the post itself is unchanged.
+        (site / "code_snippets" / "demo.py").write_text("import os\nprint(os.getcwd())\n", encoding="utf-8")
+        result = build(site, work)
+        self.assertNotIn("No changes detected.", result.stdout)
+        self.assert_incremental_matches_clean(site, work, "snippet-clean", ())
+        page = (work / "dist" / "posts" / "hello.html").read_text(encoding="utf-8")
+        self.assertIn("getcwd", page)
+        self.assertIn("getcwd", (work / "dist" / "rss.xml").read_text(encoding="utf-8"))
+
+    def test_archive_feeds_have_their_own_ids(self) -> None:
+        work = self.root / "feeds"
+        build(self.site, work)
+        feeds = sorted((work / "dist" / "feeds" / "archive").glob("*.atom.xml"))
+        self.assertEqual(len(feeds), 2)
+        ids = [re.search(r"<id>([^<]+)</id>", feed.read_text(encoding="utf-8")).group(1) for feed in feeds]
+        self.assertEqual(len(set(ids)), 2)
+        # Each id points at the series' section of the archive page.
+        archive = (work / "dist" / "archive.html").read_text(encoding="utf-8")
+        for feed_id in ids:
+            self.assertIn(f'id="{feed_id.split("#", 1)[1]}"', archive)
+
+    def test_categories_sharing_a_slug_are_rejected(self) -> None:
+        site = self.root / "collision-site"
+        make_site(site)
+        (site / "posts" / "langs.md").write_text(
+            "---\ntitle: Languages\ndate: 2025-08-01\ncategories: [C/C++, C C]\n---\n\nBoth.\n", encoding="utf-8"
+        )
+        with self.assertRaises(AssertionError) as caught:
+            build(site, self.root / "collision")
+        self.assertIn("Categories 'C C', 'C/C++' share the slug 'c-c'", str(caught.exception))
+
+    def test_noop_build_imports_only_stdlib(self) -> None:
+        work = self.root / "noop"
+        build(self.site, work)
+        result = build(self.site, work, "-X", "importtime")
+        self.assertIn("No changes detected.", result.stdout)
+        modules = [
+            line.rsplit("|", 1)[1].strip().split(".")[0]
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:") and not line.rstrip().endswith("imported package")
+        ]
+        # Interpreter startup (site hooks, .pth files) is not ours; start counting at the first sitegen import.
+        imported = set(modules[modules.index("sitegen") :])
+        # Markdown, Pygments and PyYAML are only needed once something is rendered.
+        self.assertEqual(sorted(imported - set(sys.stdlib_module_names) - {"sitegen"}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from sitegen.cache import NAMESPACES_DIR, FragmentCache
+
+DAY = 86400
+
+
+class FragmentCachePruneTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def age(self, cache: FragmentCache, kind: str, key: str, days: float) -> Path:
+        path = cache.local.path(cache.address(kind, key))
+        stamp = time.time() - days * DAY
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def test_prune_only_touches_its_own_namespaces(self) -> None:
+        # Anything else sharing cache_dir is left alone, even directories that look like namespaces.
+        (self.cache_dir / "pip").mkdir()
+        (self.cache_dir / "pip" / "wheel").write_text("keep", encoding="utf-8")
+        (self.cache_dir / "0123456789abcdef").mkdir()
+        old = FragmentCache(self.cache_dir, "a" * 64)
+        old.put("card", "post", "<div>old</div>")
+        current = FragmentCache(self.cache_dir, "b" * 64)
+        current.put("card", "post", "<div>new</div>")
+
+        current.prune(30 * DAY)
+        self.assertEqual(sorted(path.name for path in (self.cache_dir / NAMESPACES_DIR).iterdir()), ["b" * 16])
+        self.assertTrue((self.cache_dir / "pip" / "wheel").exists())
+        self.assertTrue((self.cache_dir / "0123456789abcdef").exists())
+        self.assertEqual(FragmentCache(self.cache_dir, "b" * 64).get("card", "post"), "<div>new</div>")
+
+    def test_prune_drops_entries_unused_for_max_age(self) -> None:
+        cache = FragmentCache(self.cache_dir, "c" * 64, resident=False)
+        for key in ("stale", "read", "fresh"):
+            cache.put("render", key, key)
+        stale = self.age(cache, "render", "stale", 40)
+        read = self.age(cache, "render", "read", 40)
+        self.age(cache, "render", "fresh", 10)
+
+        # A hit counts as a use.
+        self.assertEqual(cache.get("render", "read"), "read")
+        self.assertEqual(cache.prune(30 * DAY), 1)
+        self.assertFalse(stale.exists())
+        self.assertTrue(read.exists())
+        self.assertIsNone(cache.get("render", "stale"))
+        self.assertEqual(cache.get("render", "fresh"), "fresh")
+
+    def test_zero_max_age_keeps_entries(self) -> None:
+        cache = FragmentCache(self.cache_dir, "d" * 64)
+        cache.put("render", "old", "old")
+        self.age(cache, "render", "old", 400)
+        self.assertEqual(cache.prune(0), 0)
+        self.assertEqual(cache.get("render", "old"), "old")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import tempfile
+import time
+import unittest
+import warnings
+from pathlib import Path
+
+from sitegen.indexnow import (
+    INDEXNOW_BACKOFF_BASE,
+    INDEXNOW_BATCH_LIMIT,
+    enqueue_urls,
+    flush_queue,
+    load_queue,
+    notify_indexnow,
+)
+from tests.stubs import StubServer
+
+SITE_URL = "https://blog.example.com"
+KEY = "0123456789abcdef"
+
+
+def post_urls(count: int, start: int = 0) -> list[str]:
+    return [f"{SITE_URL}/posts/p{index}.html" for index in range(start, start + count)]
+
+
+class IndexNowQueueTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = Path(self.tmp.name) / "indexnow-queue.json"
+        self.status = {"/indexnow": 200}
+        self.stub = StubServer(lambda method, path, body: (self.status.get(path, 200), b""))
+        self.endpoint = f"{self.stub.url}/indexnow"
+
+    def tearDown(self) -> None:
+        self.stub.close()
+        self.tmp.cleanup()
+
+    def flush(self, now: float) -> dict[str, int]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return flush_queue(self.queue, SITE_URL, KEY, now=now)
+
+    def pending(self) -> dict:
+        return load_queue(self.queue)["endpoints"].get(self.endpoint, {})
+
+    def test_batches_split_at_url_limit(self) -> None:
+        urls = post_urls(INDEXNOW_BATCH_LIMIT + 1)
+        enqueue_urls(self.queue, [self.endpoint], urls, now=1000)
+        summary = self.flush(now=1000)
+        batches = self.stub.json_bodies("POST")
+        self.assertEqual(sorted(len(batch["urlList"]) for batch in batches), [1, INDEXNOW_BATCH_LIMIT])
+        self.assertEqual(sorted(url for batch in batches for url in batch["urlList"]), sorted(urls))
+        self.assertEqual(batches[0]["key"], KEY)
+        self.assertEqual(batches[0]["host"], "blog.example.com")
+        self.assertEqual(summary["sent"], len(urls))
+        self.assertEqual(self.pending(), {})
+
+    def test_throttled_and_server_errors_stay_queued_with_backoff(self) -> None:
+        throttled = f"{self.stub.url}/throttled"
+        self.status.update({"/indexnow": 503, "/throttled": 429})
+        urls = post_urls(3)
+        enqueue_urls(self.queue, [self.endpoint, throttled], urls, now=1000)
+        summary = self.flush(now=1000)
+        self.assertEqual(summary["retry"], 6)
+        queue = load_queue(self.queue)["endpoints"]
+        for endpoint in (self.endpoint, throttled):
+            self.assertEqual(sorted(queue[endpoint]), sorted(urls))
+            for info in queue[endpoint].values():
+                self.assertEqual(info["attempts"], 1)
+                self.assertEqual(info["next_attempt"], 1000 + INDEXNOW_BACKOFF_BASE)
+
+        # Nothing is due until the backoff has passed.
+        sent_before = len(self.stub.requests)
+        self.assertEqual(self.flush(now=1000 + INDEXNOW_BACKOFF_BASE - 1), {"sent": 0, "retry": 0, "dropped": 0})
+        self.assertEqual(len(self.stub.requests), sent_before)
+
+        # A second failure doubles the delay.
+        self.flush(now=1000 + INDEXNOW_BACKOFF_BASE)
+        info = self.pending()[urls[0]]
+        self.assertEqual(info["attempts"], 2)
+        self.assertEqual(info["next_attempt"], 1000 + 3 * INDEXNOW_BACKOFF_BASE)
+
+        self.status.update({"/indexnow": 200, "/throttled": 202})
+        summary = self.flush(now=1000 + 3 * INDEXNOW_BACKOFF_BASE)
+        self.assertEqual(summary["sent"], 6)
+        self.assertEqual(load_queue(self.queue)["endpoints"], {})
+
+    def test_rejected_batches_are_dropped(self) -> None:
+        self.status["/indexnow"] = 403
+        enqueue_urls(self.queue, [self.endpoint], post_urls(2), now=1000)
+        self.assertEqual(self.flush(now=1000)["dropped"], 2)
+        self.assertEqual(self.pending(), {})
+
+    def test_queue_deduplicates_across_runs(self) -> None:
+        self.status["/indexnow"] = 500
+        first = post_urls(3)
+        self.assertEqual(enqueue_urls(self.queue, [self.endpoint], first, now=1000), 3)
+        self.flush(now=1000)
+
+        # The next build re-reports two of the same URLs plus a new one.
+        second = post_urls(3, start=1)
+        self.assertEqual(enqueue_urls(self.queue, [self.endpoint], second, now=2000), 1)
+        pending = self.pending()
+        self.assertEqual(sorted(pending), sorted(post_urls(4)))
+        # Already-queued URLs keep their retry state instead of being reset.
+        self.assertEqual(pending[first[1]]["attempts"], 1)
+        self.assertEqual(pending[second[-1]]["attempts"], 0)
+
+        self.status["/indexnow"] = 200
+        self.stub.requests.clear()
+        self.flush(now=10**9)
+        sent = [url for batch in self.stub.json_bodies("POST") for url in batch["urlList"]]
+        self.assertEqual(sorted(sent), sorted(post_urls(4)))
+
+
+class IndexNowAsyncTest(unittest.TestCase):
+    def test_async_mode_returns_before_submission(self) -> None:
+        def slow(method: str, path: str, body: bytes) -> tuple[int, bytes]:
+            time.sleep(1)
+            return 200, b""
+
+        stub = StubServer(slow)
+        self.addCleanup(stub.close)
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = Path(tmp) / "indexnow-queue.json"
+            urls = post_urls(2)
+            start = time.monotonic()
+            # The flush process is detached on purpose, so its Popen handle is dropped while it still runs.
+            with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                warnings.simplefilter("ignore", ResourceWarning)
+                notify_indexnow(SITE_URL, KEY, urls, queue, endpoints=[f"{stub.url}/indexnow"], async_mode=True)
+            self.assertLess(time.monotonic() - start, 1)
+            self.assertEqual(len(load_queue(queue)["endpoints"][f"{stub.url}/indexnow"]), 2)
+
+            # The detached process submits the queue and empties it.
+            deadline = time.monotonic() + 20
+            while load_queue(queue)["endpoints"] and time.monotonic() < deadline:
+                time.sleep(0.1)
+            self.assertEqual(load_queue(queue)["endpoints"], {})
+            self.assertEqual(stub.json_bodies("POST")[0]["urlList"], sorted(urls))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from sitegen.trace import Tracer
+
+
+def event(name: str, tid: int, ts: float, dur: float, rel: str = "") -> dict:
+    item = {"name": name, "cat": "build", "ph": "X", "ts": ts, "dur": dur, "tid": tid, "tdur": dur * 0.9}
+    if rel:
+        item["args"] = {"rel": rel}
+    return item
+
+
+class SlowestPostsTest(unittest.TestCase):
+    def test_highlights_are_attributed_to_the_enclosing_post_on_the_same_thread(self) -> None:
+        tracer = Tracer()
+        tracer.events = [
+            event("post", 1, 0, 100, "a.md"),
+            event("highlight", 1, 10, 20),
+            event("highlight", 1, 50, 10),
+            # Same time range, other thread: belongs to b.md only.
+            event("post", 2, 0, 60, "b.md"),
+            event("highlight", 2, 5, 40),
+            # After a.md ended on thread 1.
+            event("highlight", 1, 150, 30),
+            event("post", 1, 200, 10, "c.md"),
+        ]
+        rows = {rel: highlight for rel, _, highlight in tracer.slowest_posts(10)}
+        self.assertAlmostEqual(rows["a.md"], 0.027)
+        self.assertAlmostEqual(rows["b.md"], 0.036)
+        self.assertEqual(rows["c.md"], 0)
+        self.assertEqual([rel for rel, _, _ in tracer.slowest_posts(2)], ["a.md", "b.md"])
+
+    def test_matches_a_pairwise_scan(self) -> None:
+        rng = random.Random(7)
+        tracer = Tracer()
+        clock = {tid: 0.0 for tid in range(4)}
+        for index in range(300):
+            tid = rng.randrange(4)
+            start = clock[tid]
+            post = event("post", tid, start, 0, f"p{index}.md")
+            tracer.events.append(post)
+            cursor = start
+            for _ in range(rng.randrange(5)):
+                duration = rng.uniform(1, 50)
+                tracer.events.append(event("highlight", tid, cursor + 1, duration))
+                cursor += duration + 2
+            post["dur"] = cursor - start + 1
+            post["tdur"] = post["dur"] * 0.9
+            clock[tid] = cursor + 5
+        rng.shuffle(tracer.events)
+
+        expected = {}
+        for post in (item for item in tracer.events if item["name"] == "post"):
+            end = post["ts"] + post["dur"]
+            expected[post["args"]["rel"]] = sum(
+                item["tdur"]
+                for item in tracer.events
+                if item["name"] == "highlight" and item["tid"] == post["tid"] and post["ts"] <= item["ts"] <= end
+            ) / 1000
+        for rel, _, highlight in tracer.slowest_posts(1000):
+            self.assertAlmostEqual(highlight, expected[rel])
+
+
+if __name__ == "__main__":
+    unittest.main()